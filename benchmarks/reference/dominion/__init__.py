@@ -0,0 +1,13 @@
+"""
+Reference Dominion implementation used by the grading benchmark.
+
+This is the starter code with every bug fixed and every new card
+implemented; scripts/benchmark.py derives starter and partially fixed
+checkouts from it by injecting the bugs back and removing cards.
+"""
+from dominion.card import Card
+from dominion.game import DominionGame, Phase
+from dominion.player import Player
+from dominion.supply import Supply
+
+__all__ = ["Card", "DominionGame", "Phase", "Player", "Supply"]
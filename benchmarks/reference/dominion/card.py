@@ -0,0 +1,423 @@
+"""
+Card types. Every subclass of Card that sets a name is registered and
+can be created by name with Card.create().
+"""
+
+
+class Card:
+    name = None
+    cost = 0
+
+    _registry = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get("name"):
+            Card._registry[cls.name] = cls
+
+    @classmethod
+    def registered(cls):
+        return list(Card._registry.values())
+
+    @classmethod
+    def exists_with_name(cls, name):
+        return name in Card._registry
+
+    @classmethod
+    def get_type_with_name(cls, name):
+        try:
+            return Card._registry[name]
+        except KeyError:
+            raise ValueError(f"No card named {name}")
+
+    @classmethod
+    def create(cls, name):
+        return cls.get_type_with_name(name)()
+
+    def __eq__(self, other):
+        return isinstance(other, Card) and self.name == other.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        return self.name
+
+
+def other_players(game, player):
+    return [p for p in game.players if p is not player]
+
+
+def gain(game, player, card_name):
+    """Move a card from the supply to the player's discard pile, if any are left"""
+    if game.supply.remaining(card_name) <= 0:
+        return None
+    card = game.supply.draw(card_name)
+    player.discard_pile.add(card)
+    return card
+
+
+# Treasures
+
+class TreasureCard(Card):
+    value = 0
+
+
+class Copper(TreasureCard):
+    name = "Copper"
+    cost = 0
+    value = 1
+
+
+class Silver(TreasureCard):
+    name = "Silver"
+    cost = 3
+    value = 2
+
+
+class Gold(TreasureCard):
+    name = "Gold"
+    cost = 6
+    value = 3
+
+
+# Victory points
+
+class ScoringCard(Card):
+    points = 0
+
+    def score(self, player):
+        return self.points
+
+
+class VictoryCard(ScoringCard):
+    pass
+
+
+class Estate(VictoryCard):
+    name = "Estate"
+    cost = 2
+    points = 1
+
+
+class Duchy(VictoryCard):
+    name = "Duchy"
+    cost = 5
+    points = 3
+
+
+class Province(VictoryCard):
+    name = "Province"
+    cost = 8
+    points = 6
+
+
+class CurseCard(ScoringCard):
+    name = "Curse"
+    cost = 0
+    points = -1
+
+
+class Gardens(VictoryCard):
+    name = "Gardens"
+    cost = 4
+
+    def score(self, player):
+        return len(player.all_cards()) // 10
+
+
+# Actions
+
+class ActionCard(Card):
+    def play(self, controller):
+        raise NotImplementedError
+
+
+class CellarCard(ActionCard):
+    name = "Cellar"
+    cost = 2
+
+    def play(self, controller):
+        player = controller.current_player
+        player.actions += 1
+        discarded = controller.pick_cards_from_hand(player)
+        for card in discarded:
+            player.discard(card)
+        player.draw_into_hand(len(discarded))
+
+
+class ChapelCard(ActionCard):
+    name = "Chapel"
+    cost = 2
+
+    def play(self, controller):
+        player = controller.current_player
+        for card in controller.pick_cards_from_hand(player, maximum=4):
+            player.remove_from_hand(card)
+            controller.trash(card)
+
+
+class MoatCard(ActionCard):
+    name = "Moat"
+    cost = 2
+
+    def play(self, controller):
+        controller.current_player.draw_into_hand(2)
+
+
+class ChancellorCard(ActionCard):
+    name = "Chancellor"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.coins += 2
+        if controller.ask_yes_no("Put your deck into your discard pile?"):
+            player.discard_pile.cards.extend(player.deck.cards)
+            player.deck.cards = []
+
+
+class HarbingerCard(ActionCard):
+    name = "Harbinger"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.draw_into_hand(1)
+        player.actions += 1
+        for card in controller.pick_cards_from_list(player.discard_pile.cards, maximum=1):
+            player.discard_pile.cards.remove(card)
+            player.deck.cards.insert(0, card)
+
+
+class MerchantCard(ActionCard):
+    name = "Merchant"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.draw_into_hand(1)
+        player.actions += 1
+        if any(isinstance(card, Silver) for card in player.hand):
+            player.coins += 1
+
+
+class VassalCard(ActionCard):
+    name = "Vassal"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.coins += 2
+        if not player.deck.cards:
+            player.reshuffle()
+        if player.deck.cards:
+            card = player.deck.draw()
+            player.discard_pile.add(card)
+            if isinstance(card, ActionCard) and controller.ask_yes_no(f"Play {card}?"):
+                player.discard_pile.cards.remove(card)
+                player.played.append(card)
+                card.play(controller)
+
+
+class VillageCard(ActionCard):
+    name = "Village"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.draw_into_hand(1)
+        player.actions += 2
+
+
+class WoodcutterCard(ActionCard):
+    name = "Woodcutter"
+    cost = 3
+
+    def play(self, controller):
+        player = controller.current_player
+        player.buys += 1
+        player.coins += 2
+
+
+class WorkshopCard(ActionCard):
+    name = "Workshop"
+    cost = 3
+
+    def play(self, controller):
+        card_name = controller.pick_card_from_supply(maximum_cost=4)
+        if card_name is not None:
+            gain(controller.game, controller.current_player, card_name)
+
+
+class BureaucratCard(ActionCard):
+    name = "Bureaucrat"
+    cost = 4
+
+    def play(self, controller):
+        game = controller.game
+        player = controller.current_player
+        if game.supply.remaining("Silver") > 0:
+            player.deck.add(game.supply.draw("Silver"))
+        for other in other_players(game, player):
+            victory_cards = [card for card in other.hand if isinstance(card, VictoryCard)]
+            if not victory_cards:
+                continue
+            card = controller.pick_card_from_list(victory_cards) or victory_cards[0]
+            other.remove_from_hand(card)
+            other.deck.add(card)
+
+
+class FeastCard(ActionCard):
+    name = "Feast"
+    cost = 4
+
+    def play(self, controller):
+        player = controller.current_player
+        if any(card is self for card in player.played):
+            player.played = [card for card in player.played if card is not self]
+            controller.trash(self)
+        card_name = controller.pick_card_from_supply(maximum_cost=5)
+        if card_name is not None:
+            gain(controller.game, player, card_name)
+
+
+class MilitiaCard(ActionCard):
+    name = "Militia"
+    cost = 4
+
+    def play(self, controller):
+        game = controller.game
+        player = controller.current_player
+        player.coins += 2
+        for other in other_players(game, player):
+            excess = len(other.hand) - 3
+            if excess <= 0:
+                continue
+            picked = controller.pick_cards_from_hand(other, minimum=excess, maximum=excess)
+            if len(picked) != excess:
+                picked = other.hand[:excess]
+            for card in list(picked):
+                other.discard(card)
+
+
+class MoneylenderCard(ActionCard):
+    name = "Moneylender"
+    cost = 4
+
+    def play(self, controller):
+        player = controller.current_player
+        for card in player.hand:
+            if isinstance(card, Copper):
+                player.remove_from_hand(card)
+                controller.trash(card)
+                player.coins += 3
+                return
+
+
+class RemodelCard(ActionCard):
+    name = "Remodel"
+    cost = 4
+
+    def play(self, controller):
+        player = controller.current_player
+        picked = controller.pick_cards_from_hand(player, minimum=1, maximum=1)
+        if not picked:
+            return
+        card = picked[0]
+        player.remove_from_hand(card)
+        controller.trash(card)
+        card_name = controller.pick_card_from_supply(maximum_cost=card.cost + 2)
+        if card_name is not None:
+            gain(controller.game, player, card_name)
+
+
+class SmithyCard(ActionCard):
+    name = "Smithy"
+    cost = 4
+
+    def play(self, controller):
+        controller.current_player.draw_into_hand(3)
+
+
+class SpyCard(ActionCard):
+    name = "Spy"
+    cost = 4
+
+    def play(self, controller):
+        game = controller.game
+        player = controller.current_player
+        player.draw_into_hand(1)
+        player.actions += 1
+        for target in game.players:
+            if not target.deck.cards:
+                target.reshuffle()
+            if not target.deck.cards:
+                continue
+            top = target.deck.cards[0]
+            if controller.ask_yes_no(f"Discard {target.name}'s {top}?"):
+                target.discard_pile.add(target.deck.draw())
+
+
+class LibraryCard(ActionCard):
+    name = "Library"
+    cost = 5
+
+    def play(self, controller):
+        player = controller.current_player
+        while len(player.hand) < 7:
+            if not player.draw_into_hand(1):
+                break
+
+
+class MarketCard(ActionCard):
+    name = "Market"
+    cost = 5
+
+    def play(self, controller):
+        player = controller.current_player
+        player.draw_into_hand(1)
+        player.actions += 1
+        player.buys += 1
+        player.coins += 1
+
+
+class MineCard(ActionCard):
+    name = "Mine"
+    cost = 5
+
+    def play(self, controller):
+        player = controller.current_player
+        treasures = [card for card in player.hand if isinstance(card, TreasureCard)]
+        picked = controller.pick_cards_from_list(treasures, minimum=0, maximum=1)
+        if not picked:
+            return
+        card = picked[0]
+        player.remove_from_hand(card)
+        controller.trash(card)
+        card_name = controller.pick_card_from_supply(maximum_cost=card.cost + 3)
+        if card_name is not None and issubclass(Card.get_type_with_name(card_name), TreasureCard):
+            if controller.game.supply.remaining(card_name) > 0:
+                player.hand.append(controller.game.supply.draw(card_name))
+
+
+class Laboratory(ActionCard):
+    name = "Laboratory"
+    cost = 5
+
+    def play(self, controller):
+        player = controller.current_player
+        player.draw_into_hand(2)
+        player.actions += 1
+
+
+class Witch(ActionCard):
+    name = "Witch"
+    cost = 5
+
+    def play(self, controller):
+        game = controller.game
+        player = controller.current_player
+        player.draw_into_hand(2)
+        for other in other_players(game, player):
+            gain(game, other, "Curse")
@@ -0,0 +1,104 @@
+"""
+Controllers make the decisions cards ask for: which cards to pick,
+whether to use an optional effect, what to gain.
+"""
+from abc import ABC, abstractmethod
+
+from dominion.card import ActionCard
+
+
+class Controller(ABC):
+    @property
+    @abstractmethod
+    def current_player(self):
+        ...
+
+    @abstractmethod
+    def trash(self, card):
+        ...
+
+    @abstractmethod
+    def ask_yes_no(self, prompt):
+        ...
+
+    @abstractmethod
+    def pick_card_from_supply(self, maximum_cost=None):
+        """Name of a supply card costing at most maximum_cost, or None"""
+
+    @abstractmethod
+    def pick_action(self, cards):
+        """One of the action cards, or None to stop playing actions"""
+
+    @abstractmethod
+    def pick_cards_from_list(self, cards, minimum=0, maximum=None):
+        ...
+
+    @abstractmethod
+    def pick_cards_from_hand(self, player, minimum=0, maximum=None):
+        ...
+
+    def pick_card_from_list(self, cards):
+        picked = self.pick_cards_from_list(cards, minimum=1, maximum=1)
+        return picked[0] if picked else None
+
+
+class Cli:
+    """Terminal input and output for CliController"""
+
+    def bold(self, text):
+        return f"\033[1m{text}\033[0m"
+
+    def ask(self, prompt):
+        return input(prompt)
+
+
+class CliController(Controller):
+    def __init__(self, cli, game):
+        self.cli = cli
+        self.game = game
+
+    @property
+    def current_player(self):
+        return self.game.current_player
+
+    def trash(self, card):
+        self.game.trash.append(card)
+
+    def ask_yes_no(self, prompt):
+        return self.cli.ask(f"{prompt} [y/n] ").strip().lower().startswith("y")
+
+    def pick_card_from_supply(self, maximum_cost=None):
+        names = self.game.supply.available(maximum_cost)
+        picked = self.pick_cards_from_list(names, minimum=0, maximum=1)
+        return picked[0] if picked else None
+
+    def pick_action(self, cards):
+        actions = [card for card in cards if isinstance(card, ActionCard)]
+        picked = self.pick_cards_from_list(actions, minimum=0, maximum=1)
+        return picked[0] if picked else None
+
+    def pick_cards_from_hand(self, player, minimum=0, maximum=None):
+        return self.pick_cards_from_list(player.hand, minimum, maximum)
+
+    def pick_cards_from_list(self, cards, minimum=0, maximum=None):
+        if maximum is not None and minimum == maximum:
+            prompt = f"Pick exactly {minimum} cards"
+        elif maximum is not None and minimum > 0:
+            prompt = f"Pick between {minimum} and {maximum} cards"
+        elif maximum is not None:
+            prompt = f"Pick at most {maximum} cards"
+        elif minimum > 0:
+            prompt = f"Pick at least {minimum} cards"
+        else:
+            prompt = "Pick any number of cards"
+        print(self.cli.bold(prompt))
+        for i, card in enumerate(cards):
+            print(f"  {i}: {card}")
+
+        answer = self.cli.ask("Card numbers, separated by commas: ").strip()
+        indexes = [int(part) for part in answer.split(",") if part.strip()] if answer else []
+        if len(set(indexes)) != len(indexes):
+            raise ValueError("Each card can only be picked once")
+        if len(indexes) < minimum or (maximum is not None and len(indexes) > maximum):
+            raise ValueError(prompt)
+        return [cards[i] for i in indexes]
@@ -0,0 +1,128 @@
+"""
+Game setup and turn structure.
+"""
+from enum import Enum
+
+from dominion.card import ActionCard, Card, TreasureCard, VictoryCard
+from dominion.player import Player
+from dominion.supply import Supply
+
+BASE_CARD_COUNTS = {
+    "Copper": 60,
+    "Silver": 40,
+    "Gold": 30,
+    "Estate": 24,
+    "Duchy": 12,
+    "Province": 12,
+}
+
+KINGDOM_PILE_SIZE = 10
+
+
+class Phase(Enum):
+    ACTION = "action"
+    BUY = "buy"
+    CLEANUP = "cleanup"
+
+
+class DominionGame:
+    def __init__(self, players, supply):
+        self.players = players
+        self.supply = supply
+        self.trash = []
+        self.controller = None
+        self.current_player_index = 0
+        self.phase = Phase.ACTION
+
+    @classmethod
+    def create(cls, player_names, kingdom_card_names):
+        counts = dict(BASE_CARD_COUNTS)
+        counts["Curse"] = 10 * max(1, len(player_names) - 1)
+        victory_pile_size = 8 if len(player_names) <= 2 else 12
+        for card_name in kingdom_card_names:
+            if issubclass(Card.get_type_with_name(card_name), VictoryCard):
+                counts[card_name] = victory_pile_size
+            else:
+                counts[card_name] = KINGDOM_PILE_SIZE
+        supply = Supply(counts)
+
+        players = []
+        for name in player_names:
+            player = Player(name)
+            for _ in range(7):
+                player.deck.add(supply.draw("Copper"))
+            for _ in range(3):
+                player.deck.add(Card.create("Estate"))
+            player.deck.shuffle()
+            player.draw_into_hand(Player.HAND_SIZE)
+            players.append(player)
+        return cls(players, supply)
+
+    @property
+    def current_player(self):
+        return self.players[self.current_player_index]
+
+    def action(self, player, card):
+        """Play an action card from the player's hand"""
+        assert self.phase == Phase.ACTION, "Action cards can only be played in the action phase"
+        assert isinstance(card, ActionCard), f"{card} is not an action card"
+        assert player.actions > 0, f"{player.name} has no actions left"
+        player.remove_from_hand(card)
+        player.played.append(card)
+        player.actions -= 1
+        card.play(self.controller)
+
+    def buy(self, player, card_name):
+        assert self.phase == Phase.BUY, "Cards can only be bought in the buy phase"
+        card_type = Card.get_type_with_name(card_name)
+        assert player.buys > 0, f"{player.name} has no buys left"
+        assert player.coins >= card_type.cost, f"{card_name} costs {card_type.cost}"
+        player.discard_pile.add(self.supply.draw(card_name))
+        player.buys -= 1
+        player.coins -= card_type.cost
+
+    def check_for_end_of_phase(self):
+        player = self.current_player
+        if self.phase == Phase.ACTION:
+            if player.actions == 0 or not any(isinstance(card, ActionCard) for card in player.hand):
+                self.phase = Phase.BUY
+                # Play every treasure in hand
+                for card in [card for card in player.hand if isinstance(card, TreasureCard)]:
+                    player.remove_from_hand(card)
+                    player.played.append(card)
+                    player.coins += card.value
+        elif self.phase == Phase.BUY:
+            if player.buys == 0:
+                self.phase = Phase.CLEANUP
+        if self.phase == Phase.CLEANUP:
+            self.end_turn()
+
+    def end_turn(self):
+        self.current_player.cleanup()
+        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        self.phase = Phase.ACTION
+
+    def is_over(self):
+        return self.supply.remaining("Province") == 0 or len(self.supply.empty_piles()) >= 3
+
+    def play_turn(self):
+        """Play the current player's turn, asking the controller for every decision"""
+        player = self.current_player
+        while self.phase == Phase.ACTION:
+            actions = [card for card in player.hand if isinstance(card, ActionCard)]
+            card = self.controller.pick_action(actions) if actions and player.actions else None
+            if card is None:
+                player.actions = 0
+            else:
+                self.action(player, card)
+            self.check_for_end_of_phase()
+        while self.phase == Phase.BUY:
+            card_name = self.controller.pick_card_from_supply(maximum_cost=player.coins)
+            if card_name is None:
+                player.buys = 0
+            else:
+                self.buy(player, card_name)
+            self.check_for_end_of_phase()
+
+    def scores(self):
+        return {player.name: player.score() for player in self.players}
@@ -0,0 +1,91 @@
+"""
+A player's cards: deck, hand, discard pile and cards played this turn.
+"""
+import random
+
+from dominion.card import ScoringCard
+
+
+class CardPile:
+    """An ordered pile of cards; the front of the list is drawn first"""
+
+    def __init__(self, cards=None):
+        self.cards = list(cards or [])
+
+    def __len__(self):
+        return len(self.cards)
+
+    def add(self, card):
+        self.cards.append(card)
+
+    def draw(self):
+        return self.cards.pop(0)
+
+    def shuffle(self):
+        random.shuffle(self.cards)
+
+
+class Player:
+    HAND_SIZE = 5
+
+    def __init__(self, name):
+        self.name = name
+        self.deck = CardPile()
+        self.discard_pile = CardPile()
+        self.hand = []
+        self.played = []
+        self.actions = 1
+        self.buys = 1
+        self.coins = 0
+
+    def __repr__(self):
+        return f"Player({self.name!r})"
+
+    def all_cards(self):
+        return self.hand + self.deck.cards + self.discard_pile.cards + self.played
+
+    def score(self):
+        return sum(card.score(self) for card in self.all_cards() if isinstance(card, ScoringCard))
+
+    def reshuffle(self):
+        """Shuffle the discard pile to form a new deck"""
+        self.deck.cards.extend(self.discard_pile.cards)
+        self.discard_pile.cards = []
+        self.deck.shuffle()
+
+    def draw_into_hand(self, n):
+        """Draw up to n cards, reshuffling once the deck runs out; returns the cards drawn"""
+        drawn = []
+        for _ in range(n):
+            if not self.deck.cards:
+                if not self.discard_pile.cards:
+                    break
+                self.reshuffle()
+            card = self.deck.draw()
+            self.hand.append(card)
+            drawn.append(card)
+        return drawn
+
+    def remove_from_hand(self, card):
+        """Take this exact card (not just one with the same name) out of the hand"""
+        for i, held in enumerate(self.hand):
+            if held is card:
+                return self.hand.pop(i)
+        raise ValueError(f"Cannot discard {card}: it is not in {self.name}'s hand")
+
+    def discard(self, card):
+        if card is None:
+            raise ValueError("Cannot discard nothing")
+        self.remove_from_hand(card)
+        self.discard_pile.add(card)
+
+    def cleanup(self):
+        """Discard the hand and played cards and draw a new hand"""
+        self.discard_pile.cards.extend(self.hand)
+        self.discard_pile.cards.extend(self.played)
+        self.hand = []
+        self.played = []
+        self.actions = 1
+        self.buys = 1
+        self.coins = 0
+        self.draw_into_hand(self.HAND_SIZE)
@@ -0,0 +1,36 @@
+"""
+The supply: piles of cards players can gain.
+"""
+from dominion.card import Card
+
+
+class Supply:
+    def __init__(self, card_name_to_count):
+        self._card_name_to_remaining = dict(card_name_to_count)
+
+    def card_names(self):
+        return list(self._card_name_to_remaining)
+
+    def remaining(self, card_name):
+        return self._card_name_to_remaining.get(card_name, 0)
+
+    def draw(self, card_name):
+        """Take one card from a pile"""
+        if self.remaining(card_name) <= 0:
+            raise ValueError(f"No more {card_name} cards in supply")
+        self._card_name_to_remaining[card_name] -= 1
+        return Card.create(card_name)
+
+    def available(self, maximum_cost=None):
+        """Names of the non-empty piles whose cards cost at most maximum_cost"""
+        names = []
+        for card_name, remaining in self._card_name_to_remaining.items():
+            if remaining <= 0:
+                continue
+            if maximum_cost is not None and Card.get_type_with_name(card_name).cost > maximum_cost:
+                continue
+            names.append(card_name)
+        return names
+
+    def empty_piles(self):
+        return [name for name, remaining in self._card_name_to_remaining.items() if remaining <= 0]
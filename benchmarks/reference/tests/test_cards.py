@@ -0,0 +1,195 @@
+import pytest
+
+from dominion.card import Card, CurseCard
+from dominion.controller import Controller
+from dominion.game import DominionGame
+
+KINGDOM = ["Market", "Smithy", "Village", "Cellar", "Workshop",
+           "Militia", "Remodel", "Mine", "Moat", "Bureaucrat"]
+
+
+class ScriptedController(Controller):
+    """Answers every question with the next scripted answer (or a default)"""
+
+    def __init__(self, game, answers=()):
+        self.game = game
+        self.answers = list(answers)
+
+    def _next(self, default):
+        return self.answers.pop(0) if self.answers else default
+
+    @property
+    def current_player(self):
+        return self.game.current_player
+
+    def trash(self, card):
+        self.game.trash.append(card)
+
+    def ask_yes_no(self, prompt):
+        return self._next(False)
+
+    def pick_card_from_supply(self, maximum_cost=None):
+        return self._next(None)
+
+    def pick_action(self, cards):
+        return self._next(None)
+
+    def pick_cards_from_list(self, cards, minimum=0, maximum=None):
+        return [cards[i] for i in self._next([])]
+
+    def pick_cards_from_hand(self, player, minimum=0, maximum=None):
+        return self.pick_cards_from_list(player.hand, minimum, maximum)
+
+
+def play(card_name, answers=(), hand=None, kingdom=KINGDOM, players=2):
+    game = DominionGame.create(player_names=["Alice", "Bob", "Carol"][:players],
+                               kingdom_card_names=kingdom)
+    game.controller = ScriptedController(game, answers)
+    player = game.current_player
+    if hand is not None:
+        player.discard_pile.cards.extend(player.hand)
+        player.hand = [Card.create(name) for name in hand]
+    card = Card.create(card_name)
+    player.hand.append(card)
+    game.action(player, card)
+    return game, player
+
+
+def test_village():
+    game, player = play("Village", hand=["Copper"])
+    assert len(player.hand) == 2
+    assert player.actions == 2
+
+
+def test_smithy():
+    game, player = play("Smithy", hand=[])
+    assert len(player.hand) == 3
+
+
+def test_market():
+    game, player = play("Market", hand=[])
+    assert (len(player.hand), player.actions, player.buys, player.coins) == (1, 1, 2, 1)
+
+
+def test_moat():
+    game, player = play("Moat", hand=[])
+    assert len(player.hand) == 2
+
+
+def test_woodcutter():
+    game, player = play("Woodcutter")
+    assert (player.buys, player.coins) == (2, 2)
+
+
+def test_cellar_discards_and_draws():
+    game, player = play("Cellar", answers=[[0, 1]], hand=["Estate", "Estate", "Copper"])
+    assert player.actions == 1
+    assert len(player.hand) == 3
+    assert [card.name for card in player.discard_pile.cards].count("Estate") >= 2
+
+
+def test_chapel_trashes():
+    game, player = play("Chapel", answers=[[0, 1]], hand=["Estate", "Copper", "Gold"])
+    assert [card.name for card in game.trash] == ["Estate", "Copper"]
+    assert [card.name for card in player.hand] == ["Gold"]
+
+
+def test_chancellor():
+    game, player = play("Chancellor", answers=[True])
+    assert player.coins == 2
+    assert player.deck.cards == []
+
+
+def test_harbinger():
+    game, player = play("Harbinger", answers=[[0]], hand=[])
+    assert player.actions == 1
+    assert len(player.hand) == 1
+
+
+def test_merchant():
+    game, player = play("Merchant", hand=["Silver"])
+    assert player.actions == 1
+    assert player.coins == 1
+
+
+def test_vassal():
+    game, player = play("Vassal", answers=[True])
+    assert player.coins == 2
+    assert len(player.discard_pile) + len(player.played) >= 2
+
+
+def test_workshop_gains_card():
+    game, player = play("Workshop", answers=["Silver"])
+    assert player.discard_pile.cards[-1].name == "Silver"
+
+
+def test_feast_trashes_itself():
+    game, player = play("Feast", answers=["Duchy"], kingdom=KINGDOM[:-1] + ["Feast"])
+    assert game.trash[0].name == "Feast"
+    assert player.discard_pile.cards[-1].name == "Duchy"
+
+
+def test_bureaucrat():
+    game, player = play("Bureaucrat")
+    assert player.deck.cards[-1].name == "Silver"
+    assert game.supply.remaining("Silver") == 39
+
+
+def test_militia_makes_others_discard():
+    game, player = play("Militia")
+    assert len(game.players[1].hand) == 3
+    assert player.coins == 2
+
+
+def test_moneylender():
+    game, player = play("Moneylender", hand=["Copper", "Estate"])
+    assert player.coins == 3
+    assert game.trash[0].name == "Copper"
+
+
+def test_remodel():
+    game, player = play("Remodel", answers=[[0], "Silver"], hand=["Estate"])
+    assert game.trash[0].name == "Estate"
+    assert player.discard_pile.cards[-1].name == "Silver"
+
+
+def test_mine():
+    game, player = play("Mine", answers=[[0], "Silver"], hand=["Copper"])
+    assert [card.name for card in player.hand] == ["Silver"]
+
+
+def test_spy():
+    game, player = play("Spy", answers=[True, True], hand=[])
+    assert player.actions == 1
+
+
+def test_library():
+    game, player = play("Library", hand=["Copper"])
+    assert len(player.hand) == 7
+
+
+def test_laboratory():
+    game, player = play("Laboratory", hand=[], kingdom=KINGDOM[:-1] + ["Laboratory"])
+    assert len(player.hand) == 2
+    assert player.actions == 1
+
+
+def test_witch_curses_others():
+    game, player = play("Witch", hand=[], kingdom=KINGDOM[:-1] + ["Witch"], players=3)
+    assert len(player.hand) == 2
+    for other in game.players[1:]:
+        assert isinstance(other.discard_pile.cards[-1], CurseCard)
+
+
+def test_gardens_scores_per_ten_cards():
+    player = DominionGame.create(["Alice"], KINGDOM[:-1] + ["Gardens"]).players[0]
+    assert Card.create("Gardens").score(player) == 1
+
+
+def test_card_registry():
+    assert Card.exists_with_name("Smithy")
+    with pytest.raises(ValueError):
+        Card.get_type_with_name("Nope")
+    assert repr(Card.create("Gold")) == "Gold"
+    assert Card.create("Gold") == Card.create("Gold")
+    assert len({Card.create("Gold"), Card.create("Gold")}) == 1
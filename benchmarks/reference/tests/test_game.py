@@ -0,0 +1,81 @@
+from unittest.mock import Mock
+
+import pytest
+
+from dominion.card import Card
+from dominion.controller import CliController
+from dominion.game import DominionGame, Phase
+
+KINGDOM = ["Market", "Smithy", "Village", "Cellar", "Workshop",
+           "Militia", "Remodel", "Mine", "Moat", "Gardens"]
+
+
+def cli(*answers):
+    mock = Mock()
+    mock.bold.side_effect = lambda text: text
+    mock.ask.side_effect = list(answers)
+    return mock
+
+
+def test_create_sets_up_supply_and_decks():
+    game = DominionGame.create(["Alice", "Bob"], KINGDOM)
+    assert game.supply.remaining("Copper") == 46
+    assert game.supply.remaining("Estate") == 24
+    assert game.supply.remaining("Gardens") == 8
+    assert game.supply.remaining("Curse") == 10
+    for player in game.players:
+        assert len(player.hand) == 5
+        assert len(player.all_cards()) == 10
+
+
+def test_action_requires_action_card():
+    game = DominionGame.create(["Alice"], KINGDOM)
+    estate = Card.create("Estate")
+    game.current_player.hand.append(estate)
+    with pytest.raises(AssertionError):
+        game.action(game.current_player, estate)
+
+
+def test_buy_phase_plays_treasures():
+    game = DominionGame.create(["Alice"], KINGDOM)
+    player = game.current_player
+    player.hand = [Card.create("Gold"), Card.create("Estate")]
+    game.check_for_end_of_phase()
+    assert game.phase == Phase.BUY
+    assert player.coins == 3
+    game.buy(player, "Silver")
+    assert player.discard_pile.cards[-1].name == "Silver"
+    game.check_for_end_of_phase()
+    assert game.phase == Phase.ACTION
+    assert len(player.hand) == 5
+
+
+def test_play_turn_with_cli_controller():
+    game = DominionGame.create(["Alice", "Bob"], KINGDOM)
+    game.controller = CliController(cli=cli("0", ""), game=game)
+    player = game.current_player
+    player.hand = [Card.create("Village"), Card.create("Copper")]
+    player.deck.cards = [Card.create("Copper") for _ in range(10)]
+    game.play_turn()
+    assert game.current_player is game.players[1]
+    assert game.scores() == {"Alice": 0, "Bob": 3}
+    assert not game.is_over()
+
+
+def test_cli_controller_prompts():
+    game = DominionGame.create(["Alice"], KINGDOM)
+    controller = CliController(cli=cli("y", "1", "0,1", "0,0"), game=game)
+    assert controller.current_player is game.players[0]
+    assert controller.ask_yes_no("Sure?")
+    assert controller.pick_card_from_supply(maximum_cost=0) == "Curse"
+    assert len(controller.pick_cards_from_hand(game.players[0], minimum=2, maximum=2)) == 2
+    with pytest.raises(ValueError):
+        controller.pick_cards_from_list(["a", "b"], minimum=1)
+    controller.trash(Card.create("Copper"))
+    assert len(game.trash) == 1
+
+
+def test_game_over_when_provinces_run_out():
+    game = DominionGame.create(["Alice"], KINGDOM)
+    game.supply._card_name_to_remaining["Province"] = 0
+    assert game.is_over()
@@ -0,0 +1,84 @@
+import pytest
+
+from dominion.card import Card
+from dominion.player import CardPile, Player
+
+
+def make_player(deck=(), discard=(), hand=()):
+    player = Player("Alice")
+    player.deck.cards = [Card.create(name) for name in deck]
+    player.discard_pile.cards = [Card.create(name) for name in discard]
+    player.hand = [Card.create(name) for name in hand]
+    return player
+
+
+def test_card_pile_draws_from_the_front():
+    pile = CardPile([Card.create("Copper"), Card.create("Gold")])
+    assert len(pile) == 2
+    assert pile.draw().name == "Copper"
+    pile.add(Card.create("Silver"))
+    assert [card.name for card in pile.cards] == ["Gold", "Silver"]
+
+
+def test_shuffle_keeps_cards():
+    pile = CardPile([Card.create("Copper") for _ in range(10)])
+    pile.shuffle()
+    assert len(pile) == 10
+
+
+def test_new_player_has_no_cards():
+    player = Player("Alice")
+    assert player.all_cards() == []
+    assert (player.actions, player.buys, player.coins) == (1, 1, 0)
+    assert repr(player) == "Player('Alice')"
+
+
+def test_draw_into_hand():
+    player = make_player(deck=["Copper", "Silver", "Gold"])
+    drawn = player.draw_into_hand(2)
+    assert [card.name for card in drawn] == ["Copper", "Silver"]
+    assert len(player.deck) == 1
+
+
+def test_draw_reshuffles_discard_pile():
+    player = make_player(deck=["Copper"], discard=["Estate", "Estate"])
+    assert len(player.draw_into_hand(3)) == 3
+    assert player.discard_pile.cards == []
+
+
+def test_draw_stops_when_out_of_cards():
+    player = make_player(deck=["Copper"])
+    assert len(player.draw_into_hand(4)) == 1
+
+
+def test_discard_moves_card_to_discard_pile():
+    player = make_player(hand=["Copper", "Estate"])
+    copper = player.hand[0]
+    player.discard(copper)
+    assert player.discard_pile.cards == [copper]
+    assert [card.name for card in player.hand] == ["Estate"]
+
+
+def test_discard_requires_card_in_hand():
+    player = make_player(hand=["Copper"])
+    with pytest.raises(ValueError):
+        player.discard(Card.create("Copper"))
+    with pytest.raises(ValueError):
+        player.discard(None)
+
+
+def test_score_counts_scoring_cards_everywhere():
+    player = make_player(deck=["Estate", "Copper"], discard=["Duchy"], hand=["Province", "Curse"])
+    player.played = [Card.create("Estate")]
+    assert player.score() == 1 + 3 + 6 - 1 + 1
+
+
+def test_cleanup_draws_a_new_hand():
+    player = make_player(deck=["Copper"] * 7, hand=["Estate"])
+    player.played = [Card.create("Silver")]
+    player.actions, player.buys, player.coins = 0, 0, 5
+    player.cleanup()
+    assert len(player.hand) == 5
+    assert player.played == []
+    assert len(player.discard_pile) == 2
+    assert (player.actions, player.buys, player.coins) == (1, 1, 0)
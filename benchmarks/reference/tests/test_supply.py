@@ -0,0 +1,35 @@
+import pytest
+
+from dominion.supply import Supply
+
+
+def test_remaining():
+    supply = Supply({"Copper": 2, "Estate": 0})
+    assert supply.remaining("Copper") == 2
+    assert supply.remaining("Estate") == 0
+    assert supply.remaining("Gold") == 0
+    assert supply.card_names() == ["Copper", "Estate"]
+
+
+def test_draw_takes_a_card():
+    supply = Supply({"Silver": 1})
+    card = supply.draw("Silver")
+    assert card.name == "Silver"
+    assert supply.remaining("Silver") == 0
+
+
+def test_draw_from_empty_pile_fails():
+    supply = Supply({"Silver": 0})
+    with pytest.raises(ValueError, match="No more Silver"):
+        supply.draw("Silver")
+
+
+def test_available_filters_by_cost_and_emptiness():
+    supply = Supply({"Copper": 1, "Silver": 1, "Gold": 1, "Estate": 0})
+    assert supply.available() == ["Copper", "Silver", "Gold"]
+    assert supply.available(maximum_cost=3) == ["Copper", "Silver"]
+
+
+def test_empty_piles():
+    supply = Supply({"Copper": 0, "Silver": 1})
+    assert supply.empty_piles() == ["Copper"]
@@ -2,16 +2,45 @@
 let dashboardData = null;
 let chartInstances = {};
 
-async function loadDashboardData() {
+// Team histories from teams/<team>.json, fetched only for the points chart
+const teamHistories = {};
+let pointsChartVisible = false;
+
+// Revision of the data on screen, from version.json
+let loadedVersion = null;
+
+async function loadDashboardData(version) {
     try {
-        // Add timestamp to prevent caching
-        const response = await fetch(`data.json?t=${Date.now()}`);
+        // Each revision has its own URL, so the browser cache can keep it
+        const query = version ? `v=${version.revision}-${version.hash}` : `t=${Date.now()}`;
+        const response = await fetch(`summary.json?${query}`);
         dashboardData = await response.json();
         updateDashboard();
     } catch (error) {
         console.error('Failed to load dashboard data:', error);
         document.getElementById('lastUpdate').textContent = 'Failed to load data';
+        return false;
     }
+    return true;
+}
+
+// Only version.json is polled; it is revalidated with the server (a
+// 304 when unchanged) and the summary is fetched only when it moves
+async function checkForUpdates() {
+    const response = await fetch('version.json', { cache: 'no-cache' });
+    if (!response.ok) {
+        // Data published before version.json existed
+        return loadDashboardData();
+    }
+    const version = await response.json();
+    if (loadedVersion && version.revision === loadedVersion.revision && version.hash === loadedVersion.hash) {
+        return false;
+    }
+    if (await loadDashboardData(version)) {
+        loadedVersion = version;
+        return true;
+    }
+    return false;
 }
 
 function updateDashboard() {
@@ -21,34 +50,23 @@ function updateDashboard() {
     const lastUpdate = dashboardData.lastUpdate ? 
         new Date(dashboardData.lastUpdate).toLocaleString() : 
         'Never';
-    document.getElementById('lastUpdate').textContent = lastUpdate;
+    setText(document.getElementById('lastUpdate'), lastUpdate);
     
-    // Calculate statistics
-    const teams = Object.entries(dashboardData.teams || {});
-    const totalTeams = teams.length;
-    const totalPoints = teams.reduce((sum, [_, team]) => sum + team.totalPoints, 0);
-    const allMilestones = new Set();
-    teams.forEach(([_, team]) => {
-        team.completedMilestones.forEach(m => allMilestones.add(m));
-    });
+    // Statistics and rankings come precomputed from update_dashboard.py
+    const totals = dashboardData.totals || {};
+    const leaderboard = dashboardData.leaderboard || [];
     
     // Update stats
-    document.getElementById('totalTeams').textContent = totalTeams;
-    document.getElementById('totalMilestones').textContent = allMilestones.size;
-    document.getElementById('totalPoints').textContent = totalPoints;
+    setText(document.getElementById('totalTeams'), totals.teams || 0);
+    setText(document.getElementById('totalMilestones'), totals.milestonesCompleted || 0);
+    setText(document.getElementById('totalPoints'), totals.points || 0);
     
-    // Find most popular milestone
-    const milestoneCounts = {};
-    Object.values(dashboardData.milestoneStats || {}).forEach(milestone => {
-        milestoneCounts[milestone.name] = milestone.completedBy?.length || 0;
-    });
-    const popularMilestone = Object.entries(milestoneCounts)
-        .sort(([,a], [,b]) => b - a)[0];
-    document.getElementById('popularMilestone').textContent = 
-        popularMilestone ? `${popularMilestone[0]} (${popularMilestone[1]} teams)` : 'None yet';
+    const popularMilestone = totals.popularMilestone;
+    setText(document.getElementById('popularMilestone'),
+        popularMilestone ? `${popularMilestone.name} (${popularMilestone.teams} teams)` : 'None yet');
     
     // Update leaderboard
-    updateLeaderboard(teams);
+    updateLeaderboard(leaderboard);
     
     // Update activity feed
     updateActivityFeed();
@@ -60,106 +78,152 @@ function updateDashboard() {
     updateCustomMilestones();
     
     // Update charts
-    updateCharts(teams);
+    updateCharts(leaderboard);
 }
 
-function updateLeaderboard(teams) {
-    const tbody = document.getElementById('rankingsBody');
-    tbody.innerHTML = '';
+// Keyed rendering: each item keeps the element it was first rendered
+// into, elements are only touched when their item changed, and a refresh
+// that changes nothing does no DOM work
+function reconcile(container, items, keyOf, create, update) {
+    const existing = new Map();
+    Array.from(container.children).forEach(child => {
+        if (child.dataset.key === undefined) {
+            child.remove(); // Placeholder such as "No activity yet"
+        } else {
+            existing.set(child.dataset.key, child);
+        }
+    });
     
-    // Sort teams by points
-    teams.sort(([,a], [,b]) => b.totalPoints - a.totalPoints);
+    let previous = null;
+    items.forEach(item => {
+        const key = String(keyOf(item));
+        let node = existing.get(key);
+        if (node) {
+            existing.delete(key);
+        } else {
+            node = create(item);
+            node.dataset.key = key;
+        }
+        const signature = JSON.stringify(item);
+        if (node.renderedSignature !== signature) {
+            update(node, item);
+            node.renderedSignature = signature;
+        }
+        // Move into place only if it isn't already there
+        const expected = previous ? previous.nextSibling : container.firstChild;
+        if (node !== expected) {
+            container.insertBefore(node, expected);
+        }
+        previous = node;
+    });
+    existing.forEach(node => node.remove());
+}
+
+function showPlaceholder(container, className, text) {
+    if (container.children.length === 1 && container.firstElementChild.className === className) return;
+    container.replaceChildren();
+    const p = document.createElement('p');
+    p.className = className;
+    p.textContent = text;
+    container.appendChild(p);
+}
+
+function setText(element, text) {
+    text = String(text);
+    if (element.textContent !== text) element.textContent = text;
+}
+
+function updateLeaderboard(leaderboard) {
+    const tbody = document.getElementById('rankingsBody');
     
-    teams.forEach(([teamName, teamData], index) => {
-        const row = tbody.insertRow();
-        
+    reconcile(tbody, leaderboard, teamData => teamData.team, () => {
+        const row = document.createElement('tr');
+        for (let i = 0; i < 7; i++) row.insertCell(i);
+        row.cells[2].className = 'points';
+        return row;
+    }, (row, teamData) => {
         // Add rank class for top 3
-        if (index === 0) row.className = 'gold';
-        else if (index === 1) row.className = 'silver';
-        else if (index === 2) row.className = 'bronze';
-        
-        // Rank
-        row.insertCell(0).textContent = index + 1;
-        
-        // Team name
-        row.insertCell(1).textContent = teamName;
-        
-        // Points
-        const pointsCell = row.insertCell(2);
-        pointsCell.textContent = teamData.totalPoints;
-        pointsCell.className = 'points';
+        row.className = ['gold', 'silver', 'bronze'][teamData.rank - 1] || '';
         
-        // Milestones completed
-        row.insertCell(3).textContent = teamData.completedMilestones.length;
+        // Rank, team name, points and milestones completed
+        setText(row.cells[0], teamData.rank);
+        setText(row.cells[1], teamData.team);
+        setText(row.cells[2], teamData.totalPoints);
+        setText(row.cells[3], teamData.milestones);
         
-        // Custom achievements column (NEW)
-        const customCell = row.insertCell(4);
-        const customCount = teamData.customMilestones ? teamData.customMilestones.length : 0;
-        if (customCount > 0) {
-            customCell.innerHTML = `⭐ ${customCount}`;
-            customCell.title = "Custom achievements";
-        } else {
-            customCell.textContent = '-';
-        }
+        // Custom achievements
+        const customCell = row.cells[4];
+        const customCount = teamData.customMilestones || 0;
+        setText(customCell, customCount > 0 ? `⭐ ${customCount}` : '-');
+        customCell.title = customCount > 0 ? 'Custom achievements' : '';
         
-        // Last activity (now column 5)
-        const lastActivity = teamData.lastSubmission ? 
-            new Date(teamData.lastSubmission).toLocaleString() : 
-            'No activity';
-        row.insertCell(5).textContent = lastActivity;
+        // Last activity
+        setText(row.cells[5], teamData.lastSubmission ?
+            new Date(teamData.lastSubmission).toLocaleString() :
+            'No activity');
         
-        // Trend (now column 6)
-        const trendCell = row.insertCell(6);
-        if (teamData.submissions && teamData.submissions.length > 1) {
-            const recent = teamData.submissions.slice(-2);
-            const pointsGained = recent[1].points - recent[0].points;
+        // Trend
+        const trendCell = row.cells[6];
+        trendCell.replaceChildren();
+        const pointsGained = teamData.pointsDelta;
+        if (pointsGained === null || pointsGained === undefined || pointsGained >= 0) {
+            const span = document.createElement('span');
             if (pointsGained > 0) {
-                trendCell.innerHTML = `<span class="trend-up">↑ +${pointsGained}</span>`;
-            } else if (pointsGained === 0) {
-                trendCell.innerHTML = '<span class="trend-same">→</span>';
+                span.className = 'trend-up';
+                span.textContent = `↑ +${pointsGained}`;
+            } else {
+                span.className = 'trend-same';
+                span.textContent = pointsGained === 0 ? '→' : '-';
             }
-        } else {
-            trendCell.innerHTML = '<span class="trend-same">-</span>';
+            trendCell.appendChild(span);
         }
+        const places = Math.abs(teamData.rankDelta || 0);
+        trendCell.title = places ?
+            `${teamData.rankDelta > 0 ? 'Up' : 'Down'} ${places} place${places === 1 ? '' : 's'}` :
+            '';
     });
 }
 
 function updateActivityFeed() {
     const feed = document.getElementById('activityFeed');
-    feed.innerHTML = '';
     
     const timeline = dashboardData.timeline || [];
     const recentEvents = timeline.slice(0, 10);
     
     if (recentEvents.length === 0) {
-        feed.innerHTML = '<p class="no-activity">No activity yet</p>';
+        showPlaceholder(feed, 'no-activity', 'No activity yet');
         return;
     }
     
-    recentEvents.forEach(event => {
+    // Identical events (same team, time and text) are told apart by occurrence
+    const occurrences = {};
+    const keyed = recentEvents.map(event => {
+        const base = `${event.timestamp}|${event.team}|${event.event}`;
+        occurrences[base] = (occurrences[base] || 0) + 1;
+        return { key: `${base}|${occurrences[base]}`, event };
+    });
+    
+    reconcile(feed, keyed, item => item.key, () => {
         const div = document.createElement('div');
         div.className = 'activity-item';
-        // Add special class for custom achievements (UPDATED)
-        if (event.type === 'custom') {
-            div.classList.add('custom-achievement');
-        }
-        
-        const time = new Date(event.timestamp).toLocaleTimeString();
+        ['activity-time', 'activity-team', 'activity-event'].forEach(className => {
+            const span = document.createElement('span');
+            span.className = className;
+            div.appendChild(span);
+        });
+        return div;
+    }, (div, { event }) => {
+        // Add special class for custom achievements
+        div.classList.toggle('custom-achievement', event.type === 'custom');
         const points = event.points ? `(+${event.points} pts)` : '';
-        
-        div.innerHTML = `
-            <span class="activity-time">${time}</span>
-            <span class="activity-team">${event.team}</span>
-            <span class="activity-event">${event.event} ${points}</span>
-        `;
-        
-        feed.appendChild(div);
+        setText(div.children[0], new Date(event.timestamp).toLocaleTimeString());
+        setText(div.children[1], event.team);
+        setText(div.children[2], `${event.event} ${points}`);
     });
 }
 
 function updateMilestoneGrid() {
     const grid = document.getElementById('milestoneGrid');
-    grid.innerHTML = '';
     
     const milestones = dashboardData.milestoneStats || {};
     
@@ -177,187 +241,231 @@ function updateMilestoneGrid() {
     };
     
     // Merge with actual data
-    Object.entries(allPossibleMilestones).forEach(([id, defaultData]) => {
-        const milestone = milestones[id] || { 
-            ...defaultData, 
-            completedBy: [] 
-        };
-        
+    const items = Object.entries(allPossibleMilestones).map(([id, defaultData]) => ({
+        id,
+        name: milestones[id]?.name || defaultData.name,
+        points: milestones[id]?.points || defaultData.points,
+        completedBy: milestones[id]?.completedBy || []
+    }));
+    
+    reconcile(grid, items, milestone => milestone.id, () => {
         const div = document.createElement('div');
         div.className = 'milestone-item';
-        if (milestone.completedBy.length > 0) {
-            div.classList.add('completed');
-        }
-        
-        div.innerHTML = `
-            <h4>${milestone.name}</h4>
-            <p class="milestone-points">${milestone.points || defaultData.points} points</p>
-            <p class="milestone-teams">
-                ${milestone.completedBy.length > 0 ? 
-                    `Completed by: ${milestone.completedBy.join(', ')}` : 
-                    'Not yet completed'}
-            </p>
-        `;
-        
-        grid.appendChild(div);
+        div.appendChild(document.createElement('h4'));
+        ['milestone-points', 'milestone-teams'].forEach(className => {
+            const p = document.createElement('p');
+            p.className = className;
+            div.appendChild(p);
+        });
+        return div;
+    }, (div, milestone) => {
+        div.classList.toggle('completed', milestone.completedBy.length > 0);
+        setText(div.children[0], milestone.name);
+        setText(div.children[1], `${milestone.points} points`);
+        setText(div.children[2], milestone.completedBy.length > 0 ?
+            `Completed by: ${milestone.completedBy.join(', ')}` :
+            'Not yet completed');
     });
 }
 
-// NEW FUNCTION: Update custom milestones section
+// Update custom milestones section
 function updateCustomMilestones() {
     const container = document.getElementById('customMilestonesContainer');
     if (!container) return; // Skip if element doesn't exist
     
-    container.innerHTML = '';
+    // Already the most recent ones, newest first
+    const recentCustom = dashboardData.customMilestones || [];
     
-    const customMilestones = dashboardData.customMilestones || {};
-    const customArray = Object.values(customMilestones);
-    
-    if (customArray.length === 0) {
-        container.innerHTML = '<p class="no-custom">No custom achievements yet. Be creative!</p>';
+    if (recentCustom.length === 0) {
+        showPlaceholder(container, 'no-custom', 'No custom achievements yet. Be creative!');
         return;
     }
     
-    // Sort by timestamp (newest first)
-    customArray.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
-    
-    // Show recent custom achievements
-    const recentCustom = customArray.slice(0, 10);
-    
-    recentCustom.forEach(custom => {
+    reconcile(container, recentCustom, custom => `${custom.team}|${custom.id}`, () => {
         const div = document.createElement('div');
         div.className = 'custom-milestone-item';
-        
-        const time = new Date(custom.timestamp).toLocaleDateString();
-        
-        div.innerHTML = `
-            <div class="custom-header">
-                <span class="custom-team">⭐ ${custom.team}</span>
-                <span class="custom-date">${time}</span>
-            </div>
-            <h4>${custom.name}</h4>
-            <p class="custom-description">${custom.description}</p>
-        `;
-        
-        container.appendChild(div);
+        const header = document.createElement('div');
+        header.className = 'custom-header';
+        ['custom-team', 'custom-date'].forEach(className => {
+            const span = document.createElement('span');
+            span.className = className;
+            header.appendChild(span);
+        });
+        const description = document.createElement('p');
+        description.className = 'custom-description';
+        div.append(header, document.createElement('h4'), description);
+        return div;
+    }, (div, custom) => {
+        const [header, name, description] = div.children;
+        setText(header.children[0], `⭐ ${custom.team}`);
+        setText(header.children[1], new Date(custom.timestamp).toLocaleDateString());
+        setText(name, custom.name);
+        setText(description, custom.description);
     });
 }
 
-function updateCharts(teams) {
-    // Points over time chart
-    const pointsCanvas = document.getElementById('pointsChart');
-    const pointsContainer = pointsCanvas.parentElement;
-    
-    // Destroy existing chart if it exists
-    if (chartInstances.points) {
-        chartInstances.points.destroy();
-        chartInstances.points = null;
+async function loadTeamHistories(leaderboard) {
+    // A team's shard only changes when it submits, so its submission count identifies the version
+    const stale = leaderboard.filter(teamData =>
+        teamHistories[teamData.team]?.submissionCount !== teamData.submissionCount);
+    await Promise.all(stale.map(async teamData => {
+        const teamName = teamData.team;
+        try {
+            const response = await fetch(`${teamData.history}?n=${teamData.submissionCount}`);
+            const history = await response.json();
+            teamHistories[teamName] = {
+                submissionCount: teamData.submissionCount,
+                submissions: history.submissions
+            };
+        } catch (error) {
+            console.error(`Failed to load history for ${teamName}:`, error);
+        }
+    }));
+}
+
+function updateCharts(leaderboard) {
+    updateCompletionChart(leaderboard);
+    // The points chart needs every team's history, so wait until it is on screen
+    if (pointsChartVisible) {
+        updatePointsChart(leaderboard);
     }
+}
+
+function sameValues(a, b) {
+    return a.length === b.length && a.every((value, i) => value === b[i]);
+}
+
+async function updatePointsChart(leaderboard) {
+    await loadTeamHistories(leaderboard);
     
-    // Reset canvas size to prevent growth
-    pointsCanvas.style.height = '300px';
-    pointsCanvas.style.width = '100%';
-    
-    const pointsCtx = pointsCanvas.getContext('2d');
-    
-    // Prepare data for points over time
-    const datasets = teams.map(([teamName, teamData]) => {
-        const submissions = teamData.submissions || [];
-        const data = submissions.map((s, index) => ({
-            x: index,
-            y: s.points
-        }));
+    // Points over time chart, created once and patched afterwards
+    if (!chartInstances.points) {
+        const pointsCanvas = document.getElementById('pointsChart');
         
-        return {
-            label: teamName,
-            data: data,
-            borderColor: getTeamColor(teamName),
-            backgroundColor: getTeamColor(teamName) + '33',
-            tension: 0.1
-        };
-    });
-    
-    chartInstances.points = new Chart(pointsCtx, {
-        type: 'line',
-        data: { datasets },
-        options: {
-            responsive: true,
-            maintainAspectRatio: true,
-            aspectRatio: 2.5,
-            plugins: {
-                title: {
-                    display: false
-                },
-                legend: {
-                    position: 'bottom'
-                }
-            },
-            scales: {
-                x: {
+        // Reset canvas size to prevent growth
+        pointsCanvas.style.height = '300px';
+        pointsCanvas.style.width = '100%';
+        
+        chartInstances.points = new Chart(pointsCanvas.getContext('2d'), {
+            type: 'line',
+            data: { datasets: [] },
+            options: {
+                responsive: true,
+                maintainAspectRatio: true,
+                aspectRatio: 2.5,
+                plugins: {
                     title: {
-                        display: true,
-                        text: 'Submission Number'
+                        display: false
+                    },
+                    legend: {
+                        position: 'bottom'
                     }
                 },
-                y: {
-                    title: {
-                        display: true,
-                        text: 'Total Points'
+                scales: {
+                    x: {
+                        title: {
+                            display: true,
+                            text: 'Submission Number'
+                        }
                     },
-                    beginAtZero: true
+                    y: {
+                        title: {
+                            display: true,
+                            text: 'Total Points'
+                        },
+                        beginAtZero: true
+                    }
                 }
             }
+        });
+    }
+    const chart = chartInstances.points;
+    
+    // One dataset per team, keyed by label; only changed ones are touched
+    const existing = new Map(chart.data.datasets.map(dataset => [dataset.label, dataset]));
+    let changed = existing.size !== leaderboard.length;
+    const datasets = leaderboard.map(({ team: teamName }, index) => {
+        const points = (teamHistories[teamName]?.submissions || []).map(s => s.points);
+        let dataset = existing.get(teamName);
+        if (!dataset) {
+            dataset = {
+                label: teamName,
+                data: [],
+                borderColor: getTeamColor(teamName),
+                backgroundColor: getTeamColor(teamName) + '33',
+                tension: 0.1
+            };
         }
+        if (!sameValues(dataset.data.map(point => point.y), points)) {
+            // Submissions are only ever appended, so extend the array in place
+            const unchangedPrefix = dataset.data.length <= points.length &&
+                dataset.data.every((point, i) => point.y === points[i]);
+            if (!unchangedPrefix) dataset.data.length = 0;
+            for (let i = dataset.data.length; i < points.length; i++) {
+                dataset.data.push({ x: i, y: points[i] });
+            }
+            changed = true;
+        }
+        if (chart.data.datasets[index] !== dataset) changed = true;
+        return dataset;
     });
-    
-    // Milestone completion chart
-    const completionCanvas = document.getElementById('completionChart');
-    const completionContainer = completionCanvas.parentElement;
-    
-    // Destroy existing chart if it exists
-    if (chartInstances.completion) {
-        chartInstances.completion.destroy();
-        chartInstances.completion = null;
+    if (changed) {
+        chart.data.datasets = datasets;
+        chart.update();
     }
+}
+
+function updateCompletionChart(leaderboard) {
+    const teamNames = leaderboard.map(teamData => teamData.team);
+    const completedCounts = leaderboard.map(teamData => teamData.milestones);
     
-    // Reset canvas size to prevent growth
-    completionCanvas.style.height = '300px';
-    completionCanvas.style.width = '100%';
-    
-    const completionCtx = completionCanvas.getContext('2d');
-    
-    const teamNames = teams.map(([name]) => name);
-    const completedCounts = teams.map(([_, data]) => data.completedMilestones.length);
-    
-    chartInstances.completion = new Chart(completionCtx, {
-        type: 'bar',
-        data: {
-            labels: teamNames,
-            datasets: [{
-                label: 'Milestones Completed',
-                data: completedCounts,
-                backgroundColor: teamNames.map(name => getTeamColor(name))
-            }]
-        },
-        options: {
-            responsive: true,
-            maintainAspectRatio: true,
-            aspectRatio: 2.5,
-            plugins: {
-                legend: {
-                    display: false
-                }
+    // Milestone completion chart, created once and patched afterwards
+    if (!chartInstances.completion) {
+        const completionCanvas = document.getElementById('completionChart');
+        
+        // Reset canvas size to prevent growth
+        completionCanvas.style.height = '300px';
+        completionCanvas.style.width = '100%';
+        
+        chartInstances.completion = new Chart(completionCanvas.getContext('2d'), {
+            type: 'bar',
+            data: {
+                labels: [],
+                datasets: [{
+                    label: 'Milestones Completed',
+                    data: [],
+                    backgroundColor: []
+                }]
             },
-            scales: {
-                y: {
-                    beginAtZero: true,
-                    ticks: {
-                        stepSize: 1
+            options: {
+                responsive: true,
+                maintainAspectRatio: true,
+                aspectRatio: 2.5,
+                plugins: {
+                    legend: {
+                        display: false
+                    }
+                },
+                scales: {
+                    y: {
+                        beginAtZero: true,
+                        ticks: {
+                            stepSize: 1
+                        }
                     }
                 }
             }
-        }
-    });
+        });
+    }
+    const chart = chartInstances.completion;
+    const dataset = chart.data.datasets[0];
+    
+    if (sameValues(chart.data.labels, teamNames) && sameValues(dataset.data, completedCounts)) return;
+    // Mutate the existing arrays so Chart.js animates from the old values
+    chart.data.labels.splice(0, chart.data.labels.length, ...teamNames);
+    dataset.data.splice(0, dataset.data.length, ...completedCounts);
+    dataset.backgroundColor = teamNames.map(name => getTeamColor(name));
+    chart.update();
 }
 
 function getTeamColor(teamName) {
@@ -376,31 +484,192 @@ function getTeamColor(teamName) {
     return colors[teamName.toLowerCase()] || '#95A5A6';
 }
 
-// Auto-refresh every 30 seconds
-let refreshInterval;
+// Auto-refresh: poll quickly while results are coming in and back off
+// exponentially (up to 2 minutes) while nothing changes
+const MIN_REFRESH_DELAY = 5000;
+const MAX_REFRESH_DELAY = 120000;
+let refreshDelay = MIN_REFRESH_DELAY;
+let refreshTimer;
+
+async function refresh() {
+    let changed = false;
+    try {
+        changed = await checkForUpdates();
+    } catch (error) {
+        console.error('Failed to check for updates:', error);
+    }
+    refreshDelay = changed ? MIN_REFRESH_DELAY : Math.min(refreshDelay * 2, MAX_REFRESH_DELAY);
+    scheduleRefresh();
+}
+
+function scheduleRefresh() {
+    stopAutoRefresh();
+    // A check that was in flight when the page was hidden (or the live
+    // feed connected) doesn't restart polling
+    if (document.hidden || liveFeedConnected) return;
+    refreshTimer = setTimeout(refresh, refreshDelay);
+}
 
 function startAutoRefresh() {
-    refreshInterval = setInterval(loadDashboardData, 30000);
+    refreshDelay = MIN_REFRESH_DELAY;
+    stopAutoRefresh();
+    refresh();
 }
 
 function stopAutoRefresh() {
-    if (refreshInterval) {
-        clearInterval(refreshInterval);
+    if (refreshTimer) {
+        clearTimeout(refreshTimer);
+        refreshTimer = null;
+    }
+}
+
+// Live feed: served by scripts/dashboard_server.py, which pushes each
+// published result as it lands. Deltas are applied to dashboardData in
+// place; polling takes over whenever the feed isn't there (GitHub Pages,
+// or the server went away) and stops again once it reconnects.
+const MAX_TIMELINE = 20;
+const MAX_CUSTOM_MILESTONES = 10;
+let liveFeedConnected = false;
+let renderScheduled = false;
+
+function scheduleRender() {
+    // A burst of events is drawn once, on the next frame
+    if (renderScheduled) return;
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        updateDashboard();
+    });
+}
+
+function applySubmission(data) {
+    if (!dashboardData || !loadedVersion || data.revision !== loadedVersion.revision + 1) {
+        // Not loaded yet, or an update was missed: fetch the whole summary instead
+        checkForUpdates().catch(error => console.error('Failed to check for updates:', error));
+        return;
     }
+    const leaderboard = dashboardData.leaderboard || (dashboardData.leaderboard = []);
+    const index = leaderboard.findIndex(row => row.team === data.row.team);
+    if (index === -1) {
+        leaderboard.push(data.row);
+    } else {
+        leaderboard[index] = data.row;
+    }
+    dashboardData.totals = data.totals;
+    dashboardData.lastUpdate = data.lastUpdate;
+
+    // Newest first; results can arrive slightly out of order
+    dashboardData.timeline = data.timeline.concat(dashboardData.timeline || [])
+        .sort((a, b) => (a.timestamp < b.timestamp) - (a.timestamp > b.timestamp))
+        .slice(0, MAX_TIMELINE);
+    const custom = dashboardData.customMilestones || [];
+    const replaced = new Set(data.customMilestones.map(entry => `${entry.team}|${entry.id}`));
+    dashboardData.customMilestones = data.customMilestones
+        .concat(custom.filter(entry => !replaced.has(`${entry.team}|${entry.id}`)))
+        .slice(0, MAX_CUSTOM_MILESTONES);
+
+    // Extend a loaded history rather than fetching the team's shard again
+    const history = teamHistories[data.row.team];
+    if (history && history.submissionCount === data.row.submissionCount - 1) {
+        history.submissions.push(data.submission);
+        history.submissionCount = data.row.submissionCount;
+    }
+
+    // The hash is unknown, so a later version.json check refetches the summary once
+    loadedVersion = { revision: data.revision, hash: null };
+    scheduleRender();
+}
+
+function applyMilestone(data) {
+    if (!dashboardData) return;
+    const stats = dashboardData.milestoneStats || (dashboardData.milestoneStats = {});
+    const milestone = stats[data.id] || (stats[data.id] = {
+        name: data.name,
+        points: data.points,
+        completedBy: [],
+        count: 0
+    });
+    if (!milestone.completedBy.includes(data.team)) {
+        milestone.completedBy.push(data.team);
+    }
+    milestone.count = data.count;
+    scheduleRender();
+}
+
+function applyRank(data) {
+    if (!dashboardData || !loadedVersion || data.revision !== loadedVersion.revision) return;
+    const leaderboard = dashboardData.leaderboard || [];
+    const ranks = new Map(data.moves.map(move => [move.team, move.rank]));
+    leaderboard.forEach(row => {
+        if (ranks.has(row.team)) {
+            row.rank = ranks.get(row.team);
+        }
+    });
+    leaderboard.sort((a, b) => a.rank - b.rank);
+    scheduleRender();
+}
+
+function connectLiveFeed() {
+    if (!('EventSource' in window)) return;
+    const source = new EventSource('events');
+    const handle = apply => event => {
+        try {
+            apply(JSON.parse(event.data));
+        } catch (error) {
+            console.error(`Failed to apply ${event.type} update:`, error);
+        }
+    };
+    source.addEventListener('hello', () => {
+        liveFeedConnected = true;
+        stopAutoRefresh();
+        // Catch up on anything published before (or while) connecting
+        checkForUpdates().catch(error => console.error('Failed to check for updates:', error));
+    });
+    source.addEventListener('submission', handle(applySubmission));
+    source.addEventListener('milestone', handle(applyMilestone));
+    source.addEventListener('rank', handle(applyRank));
+    source.addEventListener('error', () => {
+        if (liveFeedConnected) {
+            // EventSource keeps retrying; poll until it gets back
+            liveFeedConnected = false;
+            if (!document.hidden) startAutoRefresh();
+        } else if (source.readyState === EventSource.CLOSED) {
+            // No live server here (e.g. the static site); polling already runs
+            source.close();
+        }
+    });
 }
 
 // Handle page visibility to save resources
 document.addEventListener('visibilitychange', () => {
     if (document.hidden) {
         stopAutoRefresh();
-    } else {
-        loadDashboardData();
+    } else if (!liveFeedConnected) {
         startAutoRefresh();
     }
 });
 
+function watchPointsChart() {
+    const canvas = document.getElementById('pointsChart');
+    if (!('IntersectionObserver' in window)) {
+        pointsChartVisible = true;
+        return;
+    }
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            observer.disconnect();
+            pointsChartVisible = true;
+            if (dashboardData) {
+                updatePointsChart(dashboardData.leaderboard || []);
+            }
+        }
+    });
+    observer.observe(canvas);
+}
+
 // Initial load
 document.addEventListener('DOMContentLoaded', () => {
-    loadDashboardData();
+    watchPointsChart();
     startAutoRefresh();
+    connectLiveFeed();
 });
\ No newline at end of file
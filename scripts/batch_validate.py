@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Validate many submissions in one process (regrades, outage catch-up).
+
+Reads a JSONL manifest with one submission per line:
+    {"team": "...", "repository": "owner/repo", "sha": "...", "path": "checkout dir"}
+and writes one results document per line (the same format as
+validate_submission.py) as each submission finishes. Every milestone of
+every submission runs on one shared worker pool with a global
+concurrency limit, taking turns between teams.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from card_registry import CardRegistry
+from card_test_index import CardTestIndex
+from env_cache import EnvironmentCache
+from impact import ImpactStore
+from limits import load_limits
+from pytest_worker import PytestWorker
+from result_cache import ResultCache
+from scheduler import FairScheduler
+from validate_submission import MilestoneValidator, error_result, load_milestones
+
+
+def read_manifest(manifest_file):
+    """Yield (entry, error) for each non-empty manifest line"""
+    with open(manifest_file, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {}, f"Invalid JSON on manifest line {line_number}: {e}"
+                continue
+            missing = [k for k in ("team", "repository", "sha", "path") if not entry.get(k)]
+            if missing:
+                yield entry, f"Manifest line {line_number} is missing {', '.join(missing)}"
+            else:
+                yield entry, None
+
+
+def batch_validate(manifest_file, output, concurrency, max_active_teams, cache_dir=None,
+                   wheelhouse=None, env_cache_size=5120, result_cache=True,
+                   result_cache_size=64, impact=True, warm_worker=True):
+    milestones = load_milestones()
+    limits = load_limits()
+    test_index = CardTestIndex(root=cache_dir)
+    card_registries = CardRegistry(root=cache_dir)
+    env_cache = EnvironmentCache(root=cache_dir, max_bytes=env_cache_size * 1024 * 1024,
+                                 wheelhouse=wheelhouse)
+    results_cache = ResultCache(root=cache_dir, max_bytes=result_cache_size * 1024 * 1024) \
+        if result_cache else None
+    repo_root = Path(__file__).parent.absolute().parent
+    pytest_worker = PytestWorker(cwd=repo_root) \
+        if warm_worker and PytestWorker.supported() else None
+    scheduler = FairScheduler(concurrency)
+    output_lock = threading.Lock()
+
+    def emit(results):
+        with output_lock:
+            output.write(json.dumps(results) + "\n")
+            output.flush()
+
+    def grade_team(entries):
+        # A team's submissions run in manifest order so impact data stays consistent
+        for entry in entries:
+            try:
+                validator = MilestoneValidator(
+                    entry["path"],
+                    entry["team"],
+                    entry["repository"],
+                    entry["sha"],
+                    entry.get("timestamp"),
+                    pytest_worker=pytest_worker,
+                    warm_worker=warm_worker,
+                    env_cache=env_cache,
+                    result_cache=results_cache,
+                    impact_store=ImpactStore(entry["repository"], root=cache_dir) if impact else None,
+                    scheduler=scheduler,
+                    milestones=milestones,
+                    limits=limits,
+                    test_index=test_index,
+                    card_registries=card_registries
+                )
+                emit(validator.grade())
+            except Exception as e:
+                emit(error_result(entry["team"], entry["repository"], entry["sha"],
+                                  entry.get("timestamp"), e))
+
+    teams = {}
+    for entry, error in read_manifest(manifest_file):
+        if error:
+            emit(error_result(entry.get("team", "unknown"), entry.get("repository", "unknown"),
+                              entry.get("sha", "unknown"), entry.get("timestamp"), error))
+        else:
+            teams.setdefault(entry["team"], []).append(entry)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_active_teams) as drivers:
+            for future in [drivers.submit(grade_team, entries) for entries in teams.values()]:
+                future.result()
+    finally:
+        scheduler.shutdown()
+        if pytest_worker is not None:
+            pytest_worker.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest", required=True,
+                        help="JSONL file with team, repository, sha and path per line")
+    parser.add_argument("--output", default=None,
+                        help="Write results here instead of stdout (one JSON document per line)")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="Maximum number of milestones running at once (default: CPU count)")
+    parser.add_argument("--max-active-teams", type=int, default=None,
+                        help="Maximum number of submissions in progress at once (default: 2x concurrency)")
+    parser.add_argument("--no-warm-worker", action="store_true",
+                        help="Start a fresh pytest process for every hidden test file")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for grading caches (default: ~/.cache/dominion-grading)")
+    parser.add_argument("--wheelhouse", default=None,
+                        help="Local wheel directory used to build student environments offline")
+    parser.add_argument("--env-cache-size", type=int, default=5120,
+                        help="Maximum size of the student environment cache in MB")
+    parser.add_argument("--no-result-cache", action="store_true",
+                        help="Always re-run milestones instead of reusing cached outcomes")
+    parser.add_argument("--result-cache-size", type=int, default=64,
+                        help="Maximum size of the milestone result cache in MB")
+    parser.add_argument("--no-impact", action="store_true",
+                        help="Don't carry forward results whose dependencies are unchanged")
+    args = parser.parse_args()
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        batch_validate(
+            args.manifest,
+            output,
+            concurrency=args.concurrency,
+            max_active_teams=args.max_active_teams or 2 * args.concurrency,
+            cache_dir=args.cache_dir,
+            wheelhouse=args.wheelhouse,
+            env_cache_size=args.env_cache_size,
+            result_cache=not args.no_result_cache,
+            result_cache_size=args.result_cache_size,
+            impact=not args.no_impact,
+            warm_worker=not args.no_warm_worker
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
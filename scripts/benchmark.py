@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+End-to-end grading benchmark.
+
+Synthetic student checkouts are generated from the reference dominion
+package in benchmarks/reference, which has every bug fixed and every new
+card implemented:
+
+    starter        the pristine starter code: every bug, no new cards
+    partial        some bugs fixed and one new card
+    fixed          everything fixed, with a full student test suite
+    broken_import  like fixed, but the package fails to import
+
+each with and without the starter's pyproject.toml (so dependency
+environments are built and reused). Every checkout is graded with
+MilestoneValidator, sharing caches and the pytest worker the way
+batch_validate.py does, and the report gives latency distributions per
+milestone type, throughput in submissions per minute and peak RSS. The
+report can be compared with a stored baseline to flag regressions,
+including any change in which milestones pass.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+
+resource: ModuleType | None
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from card_registry import CardRegistry
+from card_test_index import CardTestIndex
+from env_cache import EnvironmentCache
+from limits import load_limits
+from pytest_worker import PytestWorker
+from result_cache import ResultCache
+from validate_submission import MilestoneValidator, error_result, load_milestones
+
+REPO_ROOT = Path(__file__).parent.absolute().parent
+REFERENCE_DIR = REPO_ROOT / "benchmarks" / "reference"
+BASELINE_FILE = REPO_ROOT / "benchmarks" / "baseline.json"
+
+# Bump when the report format or the generated checkouts change
+REPORT_VERSION = 1
+
+# How each bug_fix milestone's bug is put back: (file, fixed code, buggy code)
+BUGS = {
+    "bug_estate_supply": [(
+        "game.py",
+        '                player.deck.add(Card.create("Estate"))\n',
+        '                player.deck.add(supply.draw("Estate"))\n',
+    )],
+    "bug_controller_params": [(
+        "card.py",
+        '    name = "Market"\n    cost = 5\n\n    def play(self, controller):\n'
+        '        player = controller.current_player\n',
+        '    name = "Market"\n    cost = 5\n\n    def play(self, game):\n'
+        '        player = game.current_player\n',
+    ), (
+        "card.py",
+        '    def play(self, controller):\n        controller.current_player.draw_into_hand(3)\n',
+        '    def play(self, game):\n        game.current_player.draw_into_hand(3)\n',
+    )],
+    "bug_prompt_formatting": [
+        ("controller.py", f'prompt = f"Pick {text}', f'prompt = "Pick {text}')
+        for text in ("exactly {minimum}", "between {minimum}", "at most {maximum}", "at least {minimum}")
+    ],
+    "fixme_discard_validation": [(
+        "player.py",
+        '        if card is None:\n            raise ValueError("Cannot discard nothing")\n'
+        '        self.remove_from_hand(card)\n',
+        '        # FIXME: check that the card is in the hand before discarding it\n'
+        '        self.hand.remove(card)\n',
+    )],
+    "fixme_draw_limit": [(
+        "player.py",
+        '                if not self.discard_pile.cards:\n                    break\n',
+        '                # FIXME: handle n being larger than the cards left in deck and discard\n',
+    )],
+    "fixme_treasure_to_played": [(
+        "game.py",
+        '                # Play every treasure in hand\n'
+        '                for card in [card for card in player.hand if isinstance(card, TreasureCard)]:\n'
+        '                    player.remove_from_hand(card)\n'
+        '                    player.played.append(card)\n'
+        '                    player.coins += card.value\n',
+        '                # FIXME: treasure cards should be moved to the played pile\n'
+        '                for card in player.hand:\n'
+        '                    if isinstance(card, TreasureCard):\n'
+        '                        player.coins += card.value\n',
+    )],
+    "fixme_bureaucrat_silver_check": [(
+        "card.py",
+        '        if game.supply.remaining("Silver") > 0:\n'
+        '            player.deck.add(game.supply.draw("Silver"))\n',
+        '        # FIXME: check that there is a Silver left in the supply\n'
+        '        player.deck.add(game.supply.draw("Silver"))\n',
+    )],
+}
+
+# Line that makes the package fail to import
+BROKEN_IMPORT = "from dominion.expansions import EXPANSION_CARDS\n"
+
+VARIANTS = {
+    "starter": {
+        "fixed": [],
+        "cards": [],
+        "tests": ["test_supply.py"],
+        "prompts": 0,
+    },
+    "partial": {
+        "fixed": ["bug_estate_supply", "fixme_discard_validation", "fixme_draw_limit"],
+        "cards": ["Laboratory"],
+        "tests": ["test_player.py", "test_supply.py"],
+        "prompts": 2,
+    },
+    "fixed": {
+        "fixed": list(BUGS),
+        "cards": ["Laboratory", "Gardens", "Witch"],
+        "tests": None,
+        "prompts": 5,
+    },
+    "broken_import": {
+        "fixed": list(BUGS),
+        "cards": ["Laboratory", "Gardens", "Witch"],
+        "tests": None,
+        "prompts": 5,
+        "broken_import": True,
+    },
+}
+
+
+def inject_bug(package_dir, milestone_id):
+    for file_name, fixed, buggy in BUGS[milestone_id]:
+        path = package_dir / file_name
+        source = path.read_text()
+        if source.count(fixed) != 1:
+            raise ValueError(f"Reference {file_name} no longer matches the {milestone_id} injection")
+        path.write_text(source.replace(fixed, buggy))
+
+
+def remove_card(card_file, class_name):
+    """Delete a card class (the ones students add in new_card milestones)"""
+    source = card_file.read_text()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef) and node.name == class_name:
+            lines = source.splitlines(keepends=True)
+            del lines[node.lineno - 1:node.end_lineno]
+            card_file.write_text("".join(lines))
+            return
+    raise ValueError(f"Reference card.py has no class {class_name}")
+
+
+def claim(milestones, prompts):
+    """claim.json claiming every milestone, with some documented LLM prompts"""
+    return {
+        "milestones": list(milestones),
+        "llm_prompts": [{
+            "purpose": f"Benchmark prompt {i + 1}",
+            "prompt": "Explain why drawing from an empty deck raises an IndexError here",
+            "model": "benchmark",
+            "helpful": True,
+        } for i in range(prompts)],
+    }
+
+
+def generate_checkout(dest, variant, milestones, pyproject=False):
+    """Write one synthetic student checkout"""
+    spec = VARIANTS[variant]
+    dest = Path(dest)
+    shutil.copytree(REFERENCE_DIR, dest, ignore=shutil.ignore_patterns("__pycache__", ".coverage"))
+
+    package_dir = dest / "dominion"
+    for milestone_id in BUGS:
+        if milestone_id not in spec["fixed"]:
+            inject_bug(package_dir, milestone_id)
+    for milestone in milestones.values():
+        card_name = milestone.get("card_name")
+        if milestone["type"] == "new_card" and card_name not in spec["cards"]:
+            remove_card(package_dir / "card.py", card_name)
+    if spec.get("broken_import"):
+        init_file = package_dir / "__init__.py"
+        init_file.write_text(init_file.read_text() + BROKEN_IMPORT)
+
+    if spec["tests"] is not None:
+        for test_file in (dest / "tests").glob("test_*.py"):
+            if test_file.name not in spec["tests"]:
+                test_file.unlink()
+
+    if pyproject:
+        for name in ("pyproject.toml", "poetry.lock"):
+            shutil.copy(REPO_ROOT / name, dest / name)
+
+    (dest / "submissions").mkdir(exist_ok=True)
+    with open(dest / "submissions" / "claim.json", 'w') as f:
+        json.dump(claim(milestones, spec["prompts"]), f, indent=2)
+    return dest
+
+
+def generate_checkouts(root, milestones, variants=None, pyproject="both"):
+    """Generate checkouts under root; returns [(name, path)]"""
+    modes = {"without": [False], "with": [True], "both": [False, True]}[pyproject]
+    checkouts = []
+    for variant in variants or VARIANTS:
+        for with_pyproject in modes:
+            name = variant + ("+pyproject" if with_pyproject else "")
+            checkouts.append((name, generate_checkout(Path(root) / name, variant, milestones, with_pyproject)))
+    return checkouts
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and of its largest finished child"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "grader": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 2 ** 20, 1),
+    }
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def distribution(values):
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 3),
+        "p50": round(percentile(values, 0.5), 3),
+        "p90": round(percentile(values, 0.9), 3),
+        "p99": round(percentile(values, 0.99), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def outcome(results):
+    return {
+        "totalPoints": results.get("totalPoints", 0),
+        "passed": sorted(m["id"] for m in results.get("passed", [])),
+        "failed": sorted(m["id"] for m in results.get("failed", [])),
+        "error": results.get("error"),
+    }
+
+
+def run_benchmark(checkouts, rounds=3, jobs=None, cache_dir=None, wheelhouse=None,
+                  result_cache=False, warm_worker=True):
+    """Grade every checkout `rounds` times and return the report"""
+    milestones = load_milestones()
+    limits = load_limits()
+    env_cache = EnvironmentCache(root=cache_dir, wheelhouse=wheelhouse)
+    results_cache = ResultCache(root=cache_dir) if result_cache else None
+    test_index = CardTestIndex(root=cache_dir)
+    card_registries = CardRegistry(root=cache_dir)
+    pytest_worker = PytestWorker(cwd=REPO_ROOT) \
+        if warm_worker and PytestWorker.supported() else None
+
+    latencies = {"submission": []}
+    outcomes = {}
+    flaky = set()
+    start = time.monotonic()
+    try:
+        for round_number in range(rounds):
+            for name, path in checkouts:
+                submission_start = time.monotonic()
+                try:
+                    validator = MilestoneValidator(
+                        path,
+                        f"benchmark-{name}",
+                        f"benchmark/{name}",
+                        f"{name}-{round_number}",
+                        jobs=jobs,
+                        pytest_worker=pytest_worker,
+                        warm_worker=warm_worker,
+                        env_cache=env_cache,
+                        result_cache=results_cache,
+                        milestones=milestones,
+                        limits=limits,
+                        test_index=test_index,
+                        card_registries=card_registries
+                    )
+                    results = validator.grade()
+                except Exception as e:
+                    results = error_result(f"benchmark-{name}", f"benchmark/{name}", name, None, e)
+                latencies["submission"].append(time.monotonic() - submission_start)
+
+                for entry in results.get("passed", []) + results.get("failed", []):
+                    seconds = entry.get("timings", {}).get("total")
+                    if seconds is not None:
+                        latencies.setdefault(milestones[entry["id"]]["type"], []).append(seconds)
+
+                graded = outcome(results)
+                if name not in outcomes:
+                    outcomes[name] = graded
+                elif outcomes[name] != graded:
+                    flaky.add(name)
+    finally:
+        if pytest_worker is not None:
+            pytest_worker.close()
+    wall_seconds = time.monotonic() - start
+
+    submissions = rounds * len(checkouts)
+    return {
+        "version": REPORT_VERSION,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": {
+            "checkouts": [name for name, _ in checkouts],
+            "jobs": jobs,
+            "resultCache": result_cache,
+            "warmWorker": warm_worker,
+        },
+        "rounds": rounds,
+        "submissions": submissions,
+        "wallSeconds": round(wall_seconds, 3),
+        "throughputPerMinute": round(submissions / wall_seconds * 60, 2) if wall_seconds else None,
+        "peakRssMb": peak_rss_mb(),
+        "latency": {kind: distribution(values) for kind, values in latencies.items() if values},
+        "outcomes": outcomes,
+        "flaky": sorted(flaky),
+    }
+
+
+def compare(report, baseline, tolerance=0.25, min_seconds=0.05):
+    """Regressions of report against baseline, as human-readable lines.
+
+    Latencies and memory may grow by `tolerance` (a fraction) and latencies
+    by at least `min_seconds` before they count; any change in which
+    milestones pass is a regression.
+    """
+    regressions = []
+    if baseline.get("version") != report["version"]:
+        return [f"Baseline is report version {baseline.get('version')}, not {report['version']}"]
+    if baseline.get("config") != report["config"]:
+        return [f"Baseline was measured with {baseline.get('config')}, not {report['config']}"]
+
+    for kind, stats in report["latency"].items():
+        base = baseline.get("latency", {}).get(kind)
+        if base is None:
+            continue
+        for stat in ("p50", "p90"):
+            if stats[stat] > base[stat] * (1 + tolerance) and stats[stat] - base[stat] >= min_seconds:
+                regressions.append(f"{kind} {stat} latency {base[stat]:.3f}s -> {stats[stat]:.3f}s")
+
+    base_throughput = baseline.get("throughputPerMinute")
+    throughput = report["throughputPerMinute"]
+    if base_throughput and throughput is not None and throughput < base_throughput * (1 - tolerance):
+        regressions.append(f"throughput {base_throughput:.2f} -> {throughput:.2f} submissions/minute")
+
+    for process, megabytes in (report["peakRssMb"] or {}).items():
+        base = (baseline.get("peakRssMb") or {}).get(process)
+        if base and megabytes > base * (1 + tolerance):
+            regressions.append(f"{process} peak RSS {base:.1f}MB -> {megabytes:.1f}MB")
+
+    for name, graded in report["outcomes"].items():
+        base = baseline.get("outcomes", {}).get(name)
+        if base is not None and (base["passed"], base["failed"]) != (graded["passed"], graded["failed"]):
+            regressions.append(f"{name} grading changed: passed {base['passed']} -> {graded['passed']}")
+    for name in report["flaky"]:
+        regressions.append(f"{name} graded differently between rounds")
+    return regressions
+
+
+def format_report(report):
+    lines = [
+        f"{report['submissions']} submissions in {report['wallSeconds']:.1f}s "
+        f"({report['throughputPerMinute']} submissions/minute)",
+    ]
+    if report["peakRssMb"]:
+        lines.append(f"Peak RSS: grader {report['peakRssMb']['grader']}MB, "
+                     f"largest child {report['peakRssMb']['children']}MB")
+    lines.append(f"{'':24}{'count':>7}{'mean':>9}{'p50':>9}{'p90':>9}{'max':>9}")
+    for kind, stats in report["latency"].items():
+        lines.append(f"{kind:24}{stats['count']:>7}{stats['mean']:>9.3f}{stats['p50']:>9.3f}"
+                     f"{stats['p90']:>9.3f}{stats['max']:>9.3f}")
+    for name, graded in report["outcomes"].items():
+        detail = graded["error"] or f"{len(graded['passed'])} passed, {len(graded['failed'])} failed"
+        lines.append(f"{name}: {graded['totalPoints']} points ({detail})")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="How many times to grade each checkout (default: 3)")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), default=None,
+                        help="Checkout variants to generate (default: all)")
+    parser.add_argument("--pyproject", choices=["with", "without", "both"], default="both",
+                        help="Generate checkouts with the starter's pyproject.toml, without, or both")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Milestones validated concurrently per submission (default: CPU count)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for grading caches (default: a fresh temporary directory)")
+    parser.add_argument("--wheelhouse", default=None,
+                        help="Local wheel directory used to build student environments offline")
+    parser.add_argument("--result-cache", action="store_true",
+                        help="Reuse cached milestone outcomes between rounds")
+    parser.add_argument("--no-warm-worker", action="store_true",
+                        help="Start a fresh pytest process for every hidden test file")
+    parser.add_argument("--checkouts", default=None,
+                        help="Generate checkouts here and keep them (default: a temporary directory)")
+    parser.add_argument("--generate-only", action="store_true",
+                        help="Only generate checkouts and a batch_validate.py manifest, don't grade")
+    parser.add_argument("--output", default=None,
+                        help="Write the JSON report here")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE),
+                        help=f"Baseline report to compare against (default: {BASELINE_FILE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store this run's report as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth before flagging (default: 0.25)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="grading-benchmark-") as scratch:
+        checkout_root = Path(args.checkouts) if args.checkouts else Path(scratch) / "checkouts"
+        checkout_root.mkdir(parents=True, exist_ok=True)
+        checkouts = generate_checkouts(checkout_root, load_milestones(), args.variants, args.pyproject)
+
+        if args.generate_only:
+            with open(checkout_root / "manifest.jsonl", 'w') as f:
+                for name, path in checkouts:
+                    f.write(json.dumps({"team": f"benchmark-{name}", "repository": f"benchmark/{name}",
+                                        "sha": name, "path": str(path)}) + "\n")
+            print(f"Wrote {len(checkouts)} checkouts and manifest.jsonl to {checkout_root}")
+            sys.exit(0)
+
+        report = run_benchmark(
+            checkouts,
+            rounds=args.rounds,
+            jobs=args.jobs,
+            cache_dir=args.cache_dir or Path(scratch) / "cache",
+            wheelhouse=args.wheelhouse,
+            result_cache=args.result_cache,
+            warm_worker=not args.no_warm_worker
+        )
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif Path(args.baseline).exists():
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
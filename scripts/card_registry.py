@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Registry of the cards a student's dominion package defines.
+
+The registry is extracted statically: starting from dominion/__init__.py
+and dominion/card.py, every module they import is parsed and each
+subclass of Card with a literal `name` is a registered card, with its
+cost and base classes (ActionCard, VictoryCard, ...). When static
+analysis is inconclusive (dynamic names or bases, decorators, duplicate
+class names, unparseable modules) the package is imported once in a
+sandboxed, resource-limited interpreter instead. Registries are cached
+by a hash of the package, so every milestone and every resubmission
+with the same package shares one extraction.
+"""
+import ast
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from env_cache import default_cache_root
+from limits import run_limited
+from result_cache import DiskCache
+
+# Bump when the registry format or extraction rules change
+REGISTRY_VERSION = 1
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Bases that never make a class a card
+NEUTRAL_BASES = {"object", "ABC", "Generic", "Protocol"}
+
+IMPORT_REGISTRY = """
+import json
+import sys
+sys.path.insert(0, '.')
+from dominion.card import Card
+
+cards = {}
+for card_type in Card.registered():
+    name = getattr(card_type, 'name', None)
+    if not isinstance(name, str):
+        continue
+    cost = getattr(card_type, 'cost', None)
+    cards[name] = {
+        "class": card_type.__name__,
+        "cost": cost if isinstance(cost, int) else None,
+        "types": [cls.__name__ for cls in card_type.__mro__],
+    }
+print(json.dumps(cards))
+"""
+
+
+class Inconclusive(Exception):
+    """Static analysis can't tell what the registry contains"""
+
+
+def _module_path(package_dir, module):
+    """File for a dominion.* module name, or None if it isn't in the package"""
+    parts = module.split(".")
+    if parts[0] != "dominion":
+        return None
+    base = package_dir.joinpath(*parts[1:])
+    for path in (base.with_suffix(".py"), base / "__init__.py"):
+        if path.is_file():
+            return path
+    return None
+
+
+def _module_name(package_dir, path):
+    rel = path.relative_to(package_dir).with_suffix("")
+    parts = ["dominion"] + list(rel.parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _top_level(body):
+    """Statements executed at import time, looking inside if/try blocks"""
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            yield from _top_level(node.body)
+            yield from _top_level(node.orelse)
+        elif isinstance(node, ast.Try):
+            for block in (node.body, node.orelse, node.finalbody):
+                yield from _top_level(block)
+            for handler in node.handlers:
+                yield from _top_level(handler.body)
+
+
+def _imported_modules(tree, module, is_package):
+    """dominion.* modules (and their parent packages) imported at module level"""
+    package = module if is_package else module.rpartition(".")[0]
+    names = set()
+    for node in _top_level(tree.body):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                anchor = package.split(".")
+                if node.level > 1:
+                    anchor = anchor[:-(node.level - 1)]
+                base = ".".join(anchor + ([node.module] if node.module else []))
+            else:
+                base = node.module or ""
+            names.add(base)
+            # from package import submodule
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    modules = set()
+    for name in names:
+        parts = name.split(".")
+        for i in range(1, len(parts) + 1):
+            modules.add(".".join(parts[:i]))
+    return {m for m in modules if m == "dominion" or m.startswith("dominion.")}
+
+
+def _base_name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    raise Inconclusive("computed base class")
+
+
+def _class_info(node):
+    """Bases and literal name/cost of a class definition"""
+    info = {"bases": [_base_name(b) for b in node.bases], "name": None, "cost": None,
+            "dynamic_name": False, "decorated": bool(node.decorator_list)}
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign):
+            targets, value = stmt.targets, stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+            targets, value = [stmt.target], stmt.value
+        else:
+            continue
+        for target in targets:
+            if not isinstance(target, ast.Name) or target.id not in ("name", "cost"):
+                continue
+            literal = value.value if isinstance(value, ast.Constant) else None
+            if target.id == "name":
+                if isinstance(literal, str):
+                    info["name"] = literal
+                elif not (isinstance(value, ast.Constant) and value.value is None):
+                    # name = None marks an abstract base; anything else needs an import
+                    info["dynamic_name"] = True
+            elif isinstance(literal, int) and not isinstance(literal, bool):
+                info["cost"] = literal
+    return info
+
+
+def static_registry(package_dir):
+    """{card name: {"class", "cost", "types"}} from source alone.
+
+    Raises Inconclusive when only importing the package would tell.
+    """
+    package_dir = Path(package_dir)
+    pending = [_module_path(package_dir, "dominion"), _module_path(package_dir, "dominion.card")]
+    if pending[1] is None:
+        raise Inconclusive("no dominion/card.py")
+
+    classes = {}
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path is None or path in seen:
+            continue
+        seen.add(path)
+        try:
+            tree = ast.parse(path.read_text(errors="replace"))
+        except SyntaxError:
+            raise Inconclusive(f"can't parse {path.name}")
+        module = _module_name(package_dir, path)
+        for name in _imported_modules(tree, module, path.name == "__init__.py"):
+            pending.append(_module_path(package_dir, name))
+        for node in _top_level(tree.body):
+            if isinstance(node, ast.ClassDef):
+                if node.name in classes:
+                    raise Inconclusive(f"class {node.name} is defined twice")
+                classes[node.name] = _class_info(node)
+
+    if "Card" not in classes:
+        raise Inconclusive("no Card class")
+
+    def ancestry(name, trail=()):
+        """Class names from name up to Card, or None if it isn't a Card"""
+        if name == "Card":
+            return ["Card"]
+        if name in trail or name not in classes:
+            return None
+        for base in classes[name]["bases"]:
+            chain = ancestry(base, trail + (name,))
+            if chain is not None:
+                return [name] + chain
+        return None
+
+    def all_bases(name, trail=()):
+        if name not in classes or name in trail:
+            return {name}
+        names = {name}
+        for base in classes[name]["bases"]:
+            names |= all_bases(base, trail + (name,))
+        return names
+
+    cards = {}
+    for class_name, info in classes.items():
+        if class_name == "Card":
+            continue
+        chain = ancestry(class_name)
+        unknown = {b for b in all_bases(class_name) if b not in classes} - NEUTRAL_BASES
+        if chain is None:
+            if info["name"] is not None and unknown:
+                # Might be a card through a base we can't see
+                raise Inconclusive(f"unknown base for {class_name}")
+            continue
+        if unknown or info["decorated"] or info["dynamic_name"]:
+            raise Inconclusive(f"can't resolve {class_name} statically")
+        if info["name"] is None:
+            continue
+        if info["name"] in cards:
+            raise Inconclusive(f"two cards named {info['name']}")
+        types = [class_name] + sorted(all_bases(class_name) - NEUTRAL_BASES - {class_name})
+        cards[info["name"]] = {"class": class_name, "cost": info["cost"], "types": types}
+    return cards
+
+
+class CardRegistry:
+    """Card registries of student packages, cached on disk by package hash"""
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache = DiskCache(Path(root or default_cache_root()) / "card-registry", max_bytes)
+
+    @staticmethod
+    def key(package_hash):
+        return hashlib.sha256(f"v{REGISTRY_VERSION}\0{package_hash}".encode()).hexdigest()
+
+    def lookup(self, package_hash, view, env, limits):
+        """Registry for the dominion package in a sandbox view.
+
+        Returns {"source": "static" | "import", "cards": {...} or None};
+        cards is None when the package can't be imported.
+        """
+        key = self.key(package_hash) if package_hash else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            registry = {"source": "static", "cards": static_registry(view.root / "dominion")}
+        except Inconclusive:
+            result = run_limited([sys.executable, "-c", IMPORT_REGISTRY], limits, cwd=view.root, env=env)
+            try:
+                cards = json.loads(result.stdout) if result.returncode == 0 else None
+            except ValueError:
+                cards = None
+            registry = {"source": "import", "cards": cards}
+
+        if key is not None:
+            self.cache.put(key, registry)
+        return registry
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Index of which cards each student test refers to.
+
+Every tests/test_*.py file is parsed once with ast. For each test
+function (including test methods of Test* classes) the index records
+the string constants and identifiers used in its body and decorators,
+so pytest.mark.parametrize arguments count too, as do module-level
+lists of card names the test refers to by name. Indexes are cached by
+file hash, so unchanged test files are never parsed again.
+"""
+import ast
+import hashlib
+from pathlib import Path
+
+from env_cache import default_cache_root
+from result_cache import DiskCache
+
+# Bump when the shape of an index entry changes
+INDEX_VERSION = 1
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class _References(ast.NodeVisitor):
+    """String constants and identifiers used anywhere in a node"""
+
+    def __init__(self):
+        self.strings = set()
+        self.names = set()
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, str):
+            self.strings.add(node.value)
+
+    def visit_Name(self, node):
+        self.names.add(node.id)
+
+    def visit_Attribute(self, node):
+        self.names.add(node.attr)
+        self.generic_visit(node)
+
+
+def _module_constants(tree):
+    """Strings assigned to each module-level name, e.g. CARDS = ["Smithy", ...]"""
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        references = _References()
+        references.visit(value)
+        if not references.strings:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name):
+                constants.setdefault(target.id, set()).update(references.strings)
+    return constants
+
+
+def _is_test(node):
+    return isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test")
+
+
+def _test_functions(tree):
+    """(qualified name, nodes to scan) for every test pytest would collect from the module"""
+    for node in tree.body:
+        if _is_test(node):
+            yield node.name, [node]
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            for item in node.body:
+                if _is_test(item):
+                    # Class-level parametrize applies to every method
+                    yield f"{node.name}.{item.name}", [item] + node.decorator_list
+
+
+def index_source(source):
+    """Map each test in a module to the strings and identifiers it uses"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {}
+
+    constants = _module_constants(tree)
+    index = {}
+    for qualname, nodes in _test_functions(tree):
+        references = _References()
+        for node in nodes:
+            references.visit(node)
+        strings = set(references.strings)
+        for name in references.names:
+            strings.update(constants.get(name, ()))
+        index[qualname] = {"strings": sorted(strings), "names": sorted(references.names)}
+    return index
+
+
+def referenced_cards(indexes, card_names):
+    """Cards referred to by at least one test in any of the given file indexes"""
+    tested = set()
+    for index in indexes:
+        for qualname, entry in index.items():
+            strings = set(entry["strings"])
+            names = set(entry["names"])
+            for card_name in card_names:
+                if (card_name.lower() in qualname.lower()
+                        or card_name in strings
+                        or card_name in names
+                        or f"{card_name}Card" in names):
+                    tested.add(card_name)
+    return tested
+
+
+class CardTestIndex:
+    """Per-file test indexes, cached on disk by content hash"""
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache = DiskCache(Path(root or default_cache_root()) / "test-index", max_bytes)
+
+    def index_file(self, path):
+        source = Path(path).read_bytes()
+        key = hashlib.sha256(f"v{INDEX_VERSION}\0".encode() + source).hexdigest()
+        index = self.cache.get(key)
+        if index is None:
+            index = index_source(source.decode(errors="replace"))
+            self.cache.put(key, index)
+        return index
+
+    def index_directory(self, test_dir):
+        """Index of every test_*.py file in a directory, by file name"""
+        indexes = {}
+        for test_file in sorted(Path(test_dir).glob("test_*.py")):
+            try:
+                indexes[test_file.name] = self.index_file(test_file)
+            except OSError:
+                continue
+        return indexes
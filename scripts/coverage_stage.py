@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Shared coverage stage for a submission.
+
+Runs the student's test suite once under coverage, with each test's node
+id recorded as a coverage context, then answers every coverage milestone
+from that single data file through coverage's Python API. The same run
+records which action cards each test played, for test_action_cards, and
+which test files failed to collect.
+"""
+import io
+import json
+import os
+import re
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+
+import coverage
+from coverage.exceptions import CoverageException
+
+from limits import LimitExceeded, ResourceLimits, run_limited
+
+PLUGIN_DIR = Path(__file__).parent.absolute() / "plugins"
+
+
+class CoverageStage:
+    def __init__(self, view, python, env, limits=None, timings=None):
+        self.view = view
+        self.python = python
+        self.limits = limits or ResourceLimits()
+        self.timings = timings
+        self.env = dict(env)
+        self.env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (str(PLUGIN_DIR), env.get('PYTHONPATH')) if p
+        )
+        self.data_file = Path(self.env.get('COVERAGE_FILE') or view.overlay / ".coverage")
+        self.env['COVERAGE_FILE'] = str(self.data_file)
+        self.card_plays_file = view.overlay / "card_plays.json"
+        self.env['GRADING_CARD_PLAYS'] = str(self.card_plays_file)
+        self.collection_errors_file = view.overlay / "collection_errors.json"
+        self.env['GRADING_COLLECTION_ERRORS'] = str(self.collection_errors_file)
+        self._ran = False
+        self._error = None
+        self._percents = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name):
+        return self.timings.stage(name) if self.timings is not None else nullcontext()
+
+    def run(self):
+        """Run the whole suite under coverage (only the first call does any work).
+
+        Raises LimitExceeded, for every caller, if the suite ran out of time or memory.
+        """
+        with self._lock:
+            if not self._ran:
+                self._ran = True
+                try:
+                    # Failing tests still produce coverage data, so the exit code is ignored
+                    with self._stage("coverageRun"):
+                        run_limited(
+                            [self.python, "-m", "coverage", "run", "-m", "pytest",
+                             "-p", "grading_plugin", "--continue-on-collection-errors", "-q"],
+                            self.limits,
+                            cwd=self.view.root,
+                            env=self.env
+                        )
+                except LimitExceeded as e:
+                    self._error = e
+            if self._error is not None:
+                raise self._error
+
+    def _config_file(self):
+        """The student's coverage configuration, if they have one"""
+        rc_file = self.view.root / ".coveragerc"
+        if rc_file.exists():
+            return str(rc_file)
+        pyproject = self.view.root / "pyproject.toml"
+        if pyproject.exists() and "[tool.coverage" in pyproject.read_text(errors="replace"):
+            return str(pyproject)
+        return False
+
+    def _percent(self, include, contexts=None):
+        """Percent covered for files matching include, or None without data"""
+        self.run()
+        key = (tuple(include), tuple(contexts or ()))
+        with self._lock:
+            if key in self._percents:
+                return self._percents[key]
+
+            percent = None
+            cov = coverage.Coverage(data_file=str(self.data_file), config_file=self._config_file())
+            with self._stage("coverageReport"):
+                try:
+                    parallel_files = list(self.data_file.parent.glob(self.data_file.name + ".*"))
+                    if parallel_files:
+                        cov.combine([str(p) for p in parallel_files], keep=True)
+                    else:
+                        cov.load()
+                    percent = cov.report(
+                        include=include,
+                        contexts=contexts,
+                        file=io.StringIO(),
+                        ignore_errors=True
+                    )
+                except CoverageException:
+                    # No data collected for these files
+                    pass
+
+            self._percents[key] = percent
+            return percent
+
+    def card_plays(self):
+        """{test node id: names of the ActionCards whose play() it called}"""
+        self.run()
+        try:
+            with open(self.card_plays_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            # The session never finished, e.g. the suite couldn't be collected
+            return {}
+
+    def collection_errors(self):
+        """{test file: package whose import failed, or None} for files that didn't collect"""
+        self.run()
+        try:
+            with open(self.collection_errors_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def module_percent(self, module):
+        """Coverage of dominion/<module>.py by tests/test_<module>.py.
+
+        None if that file failed to collect, or if any file failed because the
+        dominion package itself doesn't import: run on its own, the file
+        couldn't have been collected either.
+        """
+        test_file = f"tests/test_{module}.py"
+        errors = self.collection_errors()
+        if test_file in errors or "dominion" in errors.values():
+            return None
+        # The empty context holds lines run at import time, before any test starts
+        contexts = ["^$", "^" + re.escape(test_file) + "::"]
+        return self._percent([str(self.view.root / "dominion" / f"{module}.py")], contexts)
+
+    def total_percent(self):
+        """Coverage of the whole dominion package by the whole suite"""
+        return self._percent([str(self.view.root / "dominion" / "*")])
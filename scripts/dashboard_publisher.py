@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Coalescing dashboard publisher.
+
+Validations hand their results to the publisher instead of updating and
+pushing the dashboard themselves. Each result document is written
+atomically into a spool directory, which any number of processes can do
+at once. Every `window` seconds the publisher takes the dashboard's
+publish lock, appends everything spooled to the results log, rebuilds
+the summary and the changed team shards once, and (optionally) makes a
+single commit and push for the whole batch. A spooled document is only
+removed once its line is in the log, so no result is lost if the
+publisher stops part way. Each line carries the name of the spool file
+it came from, and a journal written before the batch lets the next
+flush recognise lines that were logged but never unlinked, so a crash
+between the two never counts a result twice. Publishing cost grows with
+the number of windows, not the number of submissions.
+
+    python scripts/dashboard_publisher.py submit --results results.json
+    python scripts/dashboard_publisher.py run --window 10 --commit --push
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from env_cache import default_cache_root
+from update_dashboard import (append_record, dashboard_files, load_results, log_paths, publish,
+                              publish_lock, results_record, write_json)
+
+REPO_ROOT = Path(__file__).parent.absolute().parent
+
+DEFAULT_WINDOW = 10.0
+
+# Pushes rejected because someone else pushed first are retried this many times
+PUSH_ATTEMPTS = 5
+
+GIT_TIMEOUT = 120
+
+# Written to the spool directory while a batch is being moved into the log
+JOURNAL_FILE = "flush.journal"
+
+
+def log(message):
+    print(f"[dashboard-publisher] {message}", file=sys.stderr, flush=True)
+
+
+def default_spool():
+    return default_cache_root() / "dashboard-spool"
+
+
+class DashboardPublisher:
+    def __init__(self, output_dir, spool=None, window=DEFAULT_WINDOW, commit=False, push=False,
+                 repo=REPO_ROOT):
+        self.output_dir = Path(output_dir)
+        self.spool = Path(spool) if spool else default_spool()
+        self.window = window
+        self.commit = commit or push
+        self.push = push
+        self.repo = Path(repo)
+        # Seconds from submission to being published, for every result this publisher flushed
+        self.latencies = []
+        self.flushes = 0
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def submit(self, results):
+        """Spool one result document; safe to call from any thread or process"""
+        self.spool.mkdir(parents=True, exist_ok=True)
+        # Names sort in submission order and carry the submission time
+        name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        fd, tmp_path = tempfile.mkstemp(dir=self.spool, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(results, f)
+        os.replace(tmp_path, self.spool / name)
+        return name
+
+    def pending(self):
+        if not self.spool.exists():
+            return []
+        return sorted(self.spool.glob("*.json"))
+
+    def recover(self, log_path):
+        """Drop spooled documents an interrupted flush already appended to the log"""
+        journal_path = self.spool / JOURNAL_FILE
+        try:
+            with open(journal_path, 'r') as f:
+                journal = json.load(f)
+        except FileNotFoundError:
+            return
+        logged = set()
+        if log_path.exists():
+            with open(log_path, 'rb') as f:
+                f.seek(journal["logOffset"])
+                for line in f:
+                    if line.endswith(b"\n") and line.strip():
+                        logged.add(json.loads(line).get("spoolFile"))
+        for name in journal["spooled"]:
+            if name in logged:
+                (self.spool / name).unlink(missing_ok=True)
+        journal_path.unlink()
+
+    def flush(self):
+        """Publish everything spooled so far as one update; returns how many results it covered"""
+        with publish_lock(self.output_dir):
+            log_path, _ = log_paths(self.output_dir)
+            self.recover(log_path)
+            spooled = self.pending()
+            if not spooled:
+                return 0
+            # Where this batch starts in the log, for recover() if we stop part way
+            write_json(self.spool / JOURNAL_FILE, {
+                "logOffset": log_path.stat().st_size if log_path.exists() else 0,
+                "spooled": [path.name for path in spooled],
+            })
+            teams = []
+            for path in spooled:
+                record = results_record(load_results(path))
+                record["spoolFile"] = path.name
+                append_record(log_path, record)
+                path.unlink()
+                teams.append(record["team"])
+            (self.spool / JOURNAL_FILE).unlink()
+            publish(self.output_dir)
+            if self.commit:
+                self.commit_dashboard(teams)
+
+        now = time.time_ns()
+        self.latencies.extend((now - int(path.name.split("-")[0])) / 1e9 for path in spooled)
+        self.flushes += 1
+        return len(spooled)
+
+    def _git(self, args):
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=self.repo,
+                              timeout=GIT_TIMEOUT)
+
+    def commit_dashboard(self, teams):
+        """One commit (and push) for a whole batch of updates"""
+        names = sorted(set(teams))
+        message = f"Update dashboard for team {names[0]}" if len(names) == 1 else \
+            f"Update dashboard for {len(teams)} submissions from {len(names)} teams\n\n" + "\n".join(names)
+        try:
+            self._git(["add", *map(str, dashboard_files(self.output_dir))])
+            if self._git(["diff", "--cached", "--quiet"]).returncode == 0:
+                return
+            result = self._git(["commit", "-q", "-m", message])
+            if result.returncode != 0:
+                log(f"could not commit dashboard: {result.stderr.strip()}")
+                return
+            if self.push:
+                self.push_dashboard()
+        except subprocess.TimeoutExpired as e:
+            log(f"could not commit dashboard: {e}")
+
+    def push_dashboard(self):
+        for attempt in range(PUSH_ATTEMPTS):
+            result = self._git(["push", "-q"])
+            if result.returncode == 0:
+                return True
+            # Someone else pushed first: replay our commits on top of theirs
+            rebase = self._git(["pull", "-q", "--rebase"])
+            if rebase.returncode != 0:
+                self._git(["rebase", "--abort"])
+                log(f"could not rebase dashboard commit: {rebase.stderr.strip()}")
+                return False
+            time.sleep(min(2 ** attempt, 30))
+        log(f"gave up pushing dashboard after {PUSH_ATTEMPTS} attempts: {result.stderr.strip()}")
+        return False
+
+    def run(self):
+        """Flush every window until stopped, then flush what is left"""
+        while not self._stopping.wait(self.window):
+            try:
+                self.flush()
+            except Exception as e:
+                # Spooled results stay put for the next window
+                log(f"publishing failed: {e}")
+        self.flush()
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="dashboard-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["submit", "run", "flush"],
+                        help="submit: spool a results file; run: publish every window; flush: publish once")
+    parser.add_argument("--results", help="Results JSON file to submit")
+    parser.add_argument("--output", default=str(REPO_ROOT / "docs"), help="Dashboard data directory")
+    parser.add_argument("--spool", default=None,
+                        help=f"Spool directory shared by submitters and the publisher (default: {default_spool()})")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW,
+                        help=f"Seconds of results to coalesce into each update (default: {DEFAULT_WINDOW})")
+    parser.add_argument("--commit", action="store_true", help="Commit the dashboard after each update")
+    parser.add_argument("--push", action="store_true", help="Commit and push the dashboard after each update")
+    args = parser.parse_args()
+
+    publisher = DashboardPublisher(args.output, spool=args.spool, window=args.window, commit=args.commit,
+                                   push=args.push)
+    if args.command == "submit":
+        if not args.results:
+            parser.error("submit needs --results")
+        print(publisher.submit(load_results(args.results)))
+    elif args.command == "flush":
+        print(f"Published {publisher.flush()} results")
+    else:
+        log(f"publishing {args.output} every {args.window}s from {publisher.spool}")
+        try:
+            publisher.run()
+        except KeyboardInterrupt:
+            publisher.flush()
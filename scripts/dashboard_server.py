@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Live dashboard server for running the leaderboard on a local network.
+
+Serves the dashboard (docs/) and pushes changes to open pages as they
+are published, over Server-Sent Events at /events, instead of waiting
+for the next poll. It follows the results log update_dashboard.py
+appends to, applying each newly published result to its own copy of the
+dashboard state, and sends:
+
+    hello       on connect: the current revision, so a page can catch up
+    submission  the team's new leaderboard row, cohort totals, the new
+                timeline entries and the submission itself
+    milestone   a team passed a milestone for the first time
+    rank        teams whose place on the leaderboard changed
+
+dashboard.js applies these as deltas and falls back to polling
+version.json whenever the stream isn't available (e.g. on GitHub Pages).
+Only the standard library is used, so it runs on a laptop with no
+network beyond the workshop LAN.
+
+    python scripts/dashboard_server.py --host 0.0.0.0 --port 8000
+"""
+import argparse
+import functools
+import json
+import os
+import queue
+import sys
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from update_dashboard import (SUMMARY_FILE, VERSION_FILE, apply_record, load_state, log_paths,
+                              published_offset, render_row, render_totals, timeline_events)
+
+REPO_ROOT = Path(__file__).parent.absolute().parent
+
+# Seconds between checks for a new publish
+POLL_INTERVAL = 0.5
+
+# Comment line sent to idle streams so proxies and browsers keep them open
+KEEPALIVE_INTERVAL = 15
+
+# Events a slow client may fall behind by before it is dropped (it reconnects and catches up)
+MAX_PENDING_EVENTS = 1000
+
+
+def log(message):
+    print(f"[dashboard-server] {message}", file=sys.stderr, flush=True)
+
+
+class DashboardFeed:
+    """Follows the published results log and turns each new result into events"""
+
+    def __init__(self, output_dir, interval=POLL_INTERVAL):
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.log_path, snapshot_path = log_paths(self.output_dir)
+        # Start from what is published, so the first events follow on from summary.json
+        published = published_offset(self.output_dir / SUMMARY_FILE)
+        self.state, self.offset, _ = load_state(self.log_path, snapshot_path, self.output_dir,
+                                                until=published or 0)
+        self._version = None
+        self._clients = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def revision(self):
+        with self._lock:
+            return self.state["revision"]
+
+    def subscribe(self):
+        client = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+        with self._lock:
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            self._clients.discard(client)
+
+    def _broadcast(self, events):
+        """Queue events for every client without ever blocking on a slow one"""
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                for event in events:
+                    client.put_nowait(event)
+            except queue.Full:
+                # Ending its stream makes the browser reconnect and resync;
+                # what it hasn't read yet is dropped to make room for the end
+                self.unsubscribe(client)
+                while True:
+                    try:
+                        client.get_nowait()
+                    except queue.Empty:
+                        break
+                client.put_nowait(None)
+
+    def events_for(self, record):
+        """Apply one result to the state; returns [(event name, data)]"""
+        state = self.state
+        team = record["team"]
+        old_ranks = {name: rank for rank, name in enumerate(state["leaderboard"], 1)}
+        # Milestones this team has never passed before
+        firsts = [m["id"] for m in record["passed"]
+                  if team not in state["milestoneStats"].get(m["id"], {}).get("completedBy", {})]
+
+        apply_record(state, record)
+        team_data = state["teams"][team]
+        new_ranks = {name: rank for rank, name in enumerate(state["leaderboard"], 1)}
+
+        events = [("submission", {
+            "revision": state["revision"],
+            "lastUpdate": state["lastUpdate"],
+            "row": render_row(team, team_data, new_ranks[team]),
+            "totals": render_totals(state),
+            # Newest first, like summary.json
+            "timeline": timeline_events(record)[::-1],
+            "customMilestones": [dict(custom, team=team, timestamp=record["timestamp"])
+                                 for custom in record["customMilestones"]],
+            "submission": team_data["submissions"][-1],
+        })]
+        for mid in firsts:
+            stats = state["milestoneStats"][mid]
+            events.append(("milestone", {
+                "team": team,
+                "id": mid,
+                "name": stats["name"],
+                "points": stats["points"],
+                "count": len(stats["completedBy"]),
+                "timestamp": record["timestamp"],
+            }))
+        moves = [{"team": name, "rank": rank, "previousRank": old_ranks.get(name)}
+                 for name, rank in new_ranks.items() if old_ranks.get(name) != rank]
+        if moves:
+            events.append(("rank", {"revision": state["revision"], "moves": moves}))
+        return events
+
+    def poll(self):
+        """Turn results published since the last poll into events"""
+        version_path = self.output_dir / VERSION_FILE
+        try:
+            stat = version_path.stat()
+        except FileNotFoundError:
+            return
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._version:
+            return
+        self._version = version
+
+        # Only results the published files already reflect, so pages that
+        # fetch summary.json or a team's history see what the events describe
+        published = published_offset(self.output_dir / SUMMARY_FILE)
+        if published is None or published <= self.offset:
+            return
+        events = []
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.offset)
+            while self.offset < published:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                self.offset += len(line)
+                if line.strip():
+                    with self._lock:
+                        events += self.events_for(json.loads(line))
+        if events:
+            self._broadcast(events)
+
+    def run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                self.poll()
+            except (OSError, ValueError) as e:
+                log(f"could not read published results: {e}")
+
+    def start(self):
+        threading.Thread(target=self.run, name="dashboard-feed", daemon=True).start()
+
+    def stop(self):
+        self._stopping.set()
+
+
+class DashboardRequestHandler(SimpleHTTPRequestHandler):
+    server_version = "DominionDashboard/1.0"
+
+    def do_GET(self):
+        if self.path.split("?")[0].rstrip("/") == "/events":
+            self.stream_events()
+        else:
+            super().do_GET()
+
+    def end_headers(self):
+        if self.path.split("?")[0].endswith(VERSION_FILE):
+            # Always revalidate; unchanged polls get a 304
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def _write_event(self, name, data):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+    def stream_events(self):
+        feed = self.server.feed
+        client = feed.subscribe()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "keep-alive")
+            self.end_headers()
+            self.wfile.write(b"retry: 3000\n\n")
+            self._write_event("hello", {"revision": feed.revision})
+            while True:
+                try:
+                    event = client.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+                    continue
+                if event is None:
+                    break
+                self._write_event(*event)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            feed.unsubscribe(client)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            log(f"{self.address_string()} {format % args}")
+
+
+def serve(host, port, output_dir, verbose=False):
+    """A dashboard server (port 0 picks a free port); call serve_forever() to run it"""
+    handler = functools.partial(DashboardRequestHandler, directory=str(output_dir))
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.feed = DashboardFeed(output_dir)
+    server.verbose = verbose
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="Address to listen on (default: localhost only; 0.0.0.0 for the LAN)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--dashboard", default=str(REPO_ROOT / "docs"),
+                        help="Dashboard directory to serve and follow (default: docs)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dashboard):
+        parser.error(f"{args.dashboard} is not a directory")
+    server = serve(args.host, args.port, args.dashboard, verbose=args.verbose)
+    server.feed.start()
+    log(f"serving {args.dashboard} on http://{args.host}:{server.server_address[1]} (events at /events)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.feed.stop()
+        server.server_close()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Cache of student dependency environments.
+
+Virtualenvs are keyed on the hash of the student's pyproject.toml and
+poetry.lock plus the Python version, so the many teams that keep the
+starter lockfile share a single ready-to-use environment. Misses are
+filled from a local wheelhouse when one is configured (no network
+needed) and from `poetry install` otherwise. Least recently used
+environments are evicted once the cache exceeds its size cap.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+tomllib: ModuleType | None
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+DEFAULT_MAX_BYTES = 5 * 1024 ** 3
+
+# Give up on a dependency install that hangs (e.g. waiting on the network)
+INSTALL_TIMEOUT = 900
+
+# Marker files inside each cached environment
+READY_MARKER = ".grading-ready"
+SIZE_MARKER = ".grading-size"
+
+
+def default_cache_root():
+    """Shared cache directory for the grader (override with DOMINION_GRADING_CACHE)"""
+    root = os.environ.get("DOMINION_GRADING_CACHE")
+    if root:
+        return Path(root)
+    return Path.home() / ".cache" / "dominion-grading"
+
+
+def venv_python(venv):
+    """Path of the interpreter inside a virtualenv"""
+    if os.name == "nt":
+        return Path(venv) / "Scripts" / "python.exe"
+    return Path(venv) / "bin" / "python"
+
+
+def _dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+@contextmanager
+def _file_lock(path, mode):
+    """Hold an flock on path for the duration of the block"""
+    with open(path, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, mode)
+        yield f
+
+
+class EnvironmentBuildError(Exception):
+    """A student environment could not be built"""
+
+
+class EnvironmentCache:
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES, wheelhouse=None, python=None):
+        self.root = Path(root or default_cache_root()) / "envs"
+        self.max_bytes = max_bytes
+        wheelhouse = wheelhouse or os.environ.get("DOMINION_GRADING_WHEELHOUSE")
+        self.wheelhouse = Path(wheelhouse) if wheelhouse else None
+        self.python = python or sys.executable
+        self._python_version = None
+        self._lock = threading.Lock()
+
+    def python_version(self):
+        if self._python_version is None:
+            if self.python == sys.executable:
+                version = f"{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}"
+            else:
+                result = subprocess.run(
+                    [self.python, "-c",
+                     "import sys; print(f'{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}')"],
+                    capture_output=True, text=True
+                )
+                version = result.stdout.strip()
+            self._python_version = version
+        return self._python_version
+
+    def key(self, project_dir):
+        """Cache key for the project's dependency specification"""
+        project_dir = Path(project_dir)
+        digest = hashlib.sha256(self.python_version().encode())
+        for name in ("pyproject.toml", "poetry.lock"):
+            path = project_dir / name
+            digest.update(b"\0" + name.encode() + b"\0")
+            if path.exists():
+                digest.update(path.read_bytes())
+        return digest.hexdigest()[:32]
+
+    @contextmanager
+    def environment(self, project_dir):
+        """Yield a ready virtualenv for the project, building it on a miss.
+
+        The environment is held with a shared lock while in use so that
+        eviction never removes it from under a running test suite.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        key = self.key(project_dir)
+        venv = self.root / key
+
+        # Users only ever take the shared lock, so every submission on the
+        # same key can use the environment at once; builds are serialised
+        # on a lock of their own
+        with _file_lock(self.root / f"{key}.lock", fcntl.LOCK_SH if fcntl else None):
+            filled = False
+            if not (venv / READY_MARKER).exists():
+                with _file_lock(self.root / f"{key}.build", fcntl.LOCK_EX if fcntl else None):
+                    # Someone else may have built it while we waited
+                    if not (venv / READY_MARKER).exists():
+                        self._fill(venv, Path(project_dir))
+                        filled = True
+            # Mark as most recently used
+            os.utime(venv / READY_MARKER)
+            if filled:
+                self.evict(keep=key)
+            yield venv
+
+    def _fill(self, venv, project_dir):
+        """Build a virtualenv with the project's locked dependencies"""
+        if venv.exists():
+            # Leftover from an interrupted build
+            shutil.rmtree(venv, ignore_errors=True)
+
+        result = subprocess.run([self.python, "-m", "venv", str(venv)], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise EnvironmentBuildError(f"Could not create virtualenv: {result.stderr.strip()}")
+
+        requirements = self._locked_requirements(project_dir)
+        try:
+            if self.wheelhouse and self.wheelhouse.is_dir() and requirements:
+                result = self._install_from_wheelhouse(venv, requirements)
+            else:
+                result = self._poetry_install(venv, project_dir)
+        except subprocess.TimeoutExpired:
+            shutil.rmtree(venv, ignore_errors=True)
+            raise EnvironmentBuildError(f"Installing dependencies took longer than {INSTALL_TIMEOUT}s")
+
+        if result.returncode != 0:
+            shutil.rmtree(venv, ignore_errors=True)
+            output = (result.stderr or result.stdout or "").strip().splitlines()
+            raise EnvironmentBuildError(
+                "Installing dependencies failed: " + (output[-1] if output else "unknown error")
+            )
+
+        (venv / SIZE_MARKER).write_text(str(_dir_size(venv)))
+        (venv / READY_MARKER).touch()
+
+    def _locked_requirements(self, project_dir):
+        """Pinned requirements from poetry.lock, or [] if it can't be read"""
+        lock_file = project_dir / "poetry.lock"
+        if tomllib is None or not lock_file.exists():
+            return []
+        try:
+            with open(lock_file, 'rb') as f:
+                lock = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError):
+            return []
+
+        requirements = []
+        for package in lock.get("package", []):
+            if package.get("source", {}).get("type") in ("directory", "file", "git", "url"):
+                continue
+            requirement = f"{package['name']}=={package['version']}"
+            markers = package.get("markers")
+            if isinstance(markers, str) and markers:
+                requirement += f"; {markers}"
+            requirements.append(requirement)
+        return requirements
+
+    def _install_from_wheelhouse(self, venv, requirements):
+        with tempfile.NamedTemporaryFile('w', suffix=".txt", delete=False) as f:
+            f.write("\n".join(requirements) + "\n")
+            requirements_file = f.name
+        try:
+            return subprocess.run(
+                [str(venv_python(venv)), "-m", "pip", "install", "--no-index",
+                 "--find-links", str(self.wheelhouse), "--disable-pip-version-check",
+                 "-r", requirements_file],
+                capture_output=True, text=True, timeout=INSTALL_TIMEOUT
+            )
+        finally:
+            os.unlink(requirements_file)
+
+    def _poetry_install(self, venv, project_dir):
+        # Poetry installs into the active virtualenv when VIRTUAL_ENV is set
+        env = os.environ.copy()
+        env['VIRTUAL_ENV'] = str(venv)
+        env['PATH'] = str(venv_python(venv).parent) + os.pathsep + env.get('PATH', '')
+        env.pop('PYTHONHOME', None)
+        return subprocess.run(
+            ["poetry", "install", "--no-interaction", "--no-root"],
+            capture_output=True, text=True, cwd=project_dir, env=env, timeout=INSTALL_TIMEOUT
+        )
+
+    def evict(self, keep=None):
+        """Remove least recently used environments until under the size cap"""
+        with self._lock:
+            entries = []
+            for venv in self.root.iterdir():
+                marker = venv / READY_MARKER
+                if not venv.is_dir() or not marker.exists():
+                    continue
+                try:
+                    size = int((venv / SIZE_MARKER).read_text())
+                except (OSError, ValueError):
+                    size = _dir_size(venv)
+                entries.append((marker.stat().st_mtime, size, venv))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, venv in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if venv.name == keep:
+                    continue
+                if self._remove_if_idle(venv):
+                    total -= size
+
+    def _remove_if_idle(self, venv):
+        lock_path = self.root / f"{venv.name}.lock"
+        with open(lock_path, 'a+') as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False  # In use by another validation
+            (venv / READY_MARKER).unlink(missing_ok=True)
+            shutil.rmtree(venv, ignore_errors=True)
+        return True
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the parts of the GitHub REST API results are posted to.
+
+Implements what validate.yml's github-script step and github_api.py use:
+listing open issues by label, creating an issue and commenting on it.
+Issues and comments are kept in memory. An optional delay per request
+imitates API latency, so load tests see realistic comment-post times
+without touching real repositories.
+
+    python scripts/fake_github.py --port 8766 --delay 0.2
+    python scripts/grading_daemon.py --github-api http://127.0.0.1:8766
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ISSUES_PATH = re.compile(r"^/repos/(?P<repository>[^/]+/[^/]+)/issues$")
+COMMENTS_PATH = re.compile(r"^/repos/(?P<repository>[^/]+/[^/]+)/issues/(?P<number>\d+)/comments$")
+
+
+class FakeGitHubState:
+    """Issues and comments by repository"""
+
+    def __init__(self):
+        self.issues = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def list_issues(self, repository, label=None):
+        with self._lock:
+            self.requests += 1
+            return [
+                {"number": issue["number"], "title": issue["title"], "labels": issue["labels"]}
+                for issue in self.issues.get(repository, [])
+                if issue["state"] == "open" and (label is None or label in issue["labels"])
+            ]
+
+    def create_issue(self, repository, title, body, labels):
+        with self._lock:
+            self.requests += 1
+            issues = self.issues.setdefault(repository, [])
+            issue = {"number": len(issues) + 1, "title": title, "body": body, "state": "open",
+                     "labels": list(labels), "comments": []}
+            issues.append(issue)
+            return {"number": issue["number"], "title": title, "labels": issue["labels"]}
+
+    def add_comment(self, repository, number, body):
+        """The new comment, or None if there is no such issue"""
+        with self._lock:
+            self.requests += 1
+            for issue in self.issues.get(repository, []):
+                if issue["number"] == number:
+                    issue["comments"].append({"body": body, "created_at": time.time()})
+                    return {"id": len(issue["comments"]), "body": body}
+            return None
+
+    def comment_count(self):
+        with self._lock:
+            return sum(len(issue["comments"]) for issues in self.issues.values() for issue in issues)
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    server_version = "FakeGitHub/1.0"
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _request(self):
+        """(path, query) after waiting out the configured delay"""
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        url = urllib.parse.urlsplit(self.path)
+        return url.path.rstrip("/"), urllib.parse.parse_qs(url.query)
+
+    def do_GET(self):
+        path, query = self._request()
+        match = ISSUES_PATH.match(path)
+        if match is None:
+            self._send(404, {"message": "Not Found"})
+            return
+        label = query.get("labels", [None])[0]
+        self._send(200, self.server.state.list_issues(match["repository"], label))
+
+    def do_POST(self):
+        path, _ = self._request()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"message": "Problems parsing JSON"})
+            return
+
+        match = ISSUES_PATH.match(path)
+        if match is not None:
+            issue = self.server.state.create_issue(match["repository"], body.get("title", ""),
+                                                   body.get("body", ""), body.get("labels", []))
+            self._send(201, issue)
+            return
+        match = COMMENTS_PATH.match(path)
+        if match is not None:
+            comment = self.server.state.add_comment(match["repository"], int(match["number"]),
+                                                    body.get("body", ""))
+            if comment is not None:
+                self._send(201, comment)
+                return
+        self._send(404, {"message": "Not Found"})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            print(f"[fake-github] {self.address_string()} {format % args}", file=sys.stderr, flush=True)
+
+
+def serve(host="127.0.0.1", port=0, delay=0.0, verbose=False):
+    """A fake GitHub API server (port 0 picks a free port); call serve_forever() to run it"""
+    server = ThreadingHTTPServer((host, port), FakeGitHubHandler)
+    server.state = FakeGitHubState()
+    server.delay = delay
+    server.verbose = verbose
+    return server
+
+
+def api_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Seconds to wait before answering each request")
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port, args.delay, verbose=True)
+    print(f"[fake-github] listening on {api_url(server)}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -8,7 +8,31 @@ from pathlib import Path
 from datetime import datetime
 
 
-def format_comment(results_file, template_file):
+def format_timings(results):
+    """Markdown section with the submission's stage timings"""
+    timings = results.get("timings")
+    if not timings:
+        return ""
+    
+    text = "\n### ⏱️ Timings\n\n| Stage | Seconds |\n|---|---|\n"
+    for stage, seconds in timings.items():
+        if stage != "total":
+            text += f"| {stage} | {seconds:.2f} |\n"
+    if "total" in timings:
+        text += f"| **total** | **{timings['total']:.2f}** |\n"
+    
+    milestones = [m for m in results.get("passed", []) + results.get("failed", []) if m.get("timings")]
+    if milestones:
+        text += "\n"
+        for milestone in milestones:
+            stages = milestone["timings"]
+            breakdown = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items() if stage != "total")
+            text += f"- **{milestone['name']}**: {stages.get('total', 0):.2f}s"
+            text += f" ({breakdown})\n" if breakdown else "\n"
+    return text
+
+
+def format_comment(results_file, template_file, show_timings=False):
     """Format validation results using the comment template"""
     
     # Load results
@@ -19,6 +43,12 @@ def format_comment(results_file, template_file):
     with open(template_file, 'r') as f:
         template = f.read()
     
+    print(render_comment(results, template, show_timings))
+
+
+def render_comment(results, template, show_timings=False):
+    """Fill in the comment template for a results document and return the text"""
+    
     # Format passed milestones
     passed_text = ""
     if results.get("passed"):
@@ -69,13 +99,19 @@ def format_comment(results_file, template_file):
         error_section = f"\n### ⚠️ Validation Error\n\n```\n{results['error']}\n```\n"
         comment = comment.replace("---\n*Validated at:", error_section + "---\n*Validated at:")
     
-    print(comment)
+    if show_timings:
+        timings_section = format_timings(results)
+        if timings_section:
+            comment = comment.replace("---\n*Validated at:", timings_section + "\n---\n*Validated at:")
+    
+    return comment
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--results", required=True, help="Path to results JSON file")
     parser.add_argument("--template", required=True, help="Path to comment template file")
+    parser.add_argument("--timings", action="store_true", help="Include stage timings in the comment")
     args = parser.parse_args()
     
-    format_comment(args.results, args.template)
\ No newline at end of file
+    format_comment(args.results, args.template, show_timings=args.timings)
\ No newline at end of file
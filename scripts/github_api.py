@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Minimal GitHub REST client for posting results comments.
+
+Does what the workflow's github-script step does: find the open issue
+labelled submission-results in the student's repository (creating it
+if needed) and comment on it. The API base URL is configurable so the
+daemon can run against GitHub Enterprise or a local fake.
+"""
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+DEFAULT_API_URL = "https://api.github.com"
+
+RESULTS_LABEL = "submission-results"
+RESULTS_ISSUE_TITLE = "Submission Results"
+RESULTS_ISSUE_BODY = (
+    "This issue tracks your submission validation results. Each time you push a "
+    "claim.json file, results will appear here as a comment."
+)
+
+
+class GitHubError(Exception):
+    """A GitHub API request failed"""
+
+
+class GitHubClient:
+    def __init__(self, token=None, api_url=None, timeout=30):
+        self.token = token or os.environ.get("WORKSHOP_BOT_TOKEN")
+        self.api_url = (api_url or os.environ.get("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, body=None, params=None):
+        url = self.api_url + path
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        request = urllib.request.Request(url, data=data, headers=headers, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = response.read()
+        except urllib.error.HTTPError as e:
+            raise GitHubError(f"{method} {path} failed with HTTP {e.code}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise GitHubError(f"{method} {path} failed: {e}") from e
+        return json.loads(content) if content else None
+
+    def results_issue(self, repository):
+        """Number of the repository's submission results issue, creating it if needed"""
+        issues = self.request("GET", f"/repos/{repository}/issues",
+                              params={"state": "open", "labels": RESULTS_LABEL})
+        if issues:
+            return issues[0]["number"]
+        issue = self.request("POST", f"/repos/{repository}/issues", body={
+            "title": RESULTS_ISSUE_TITLE,
+            "body": RESULTS_ISSUE_BODY,
+            "labels": [RESULTS_LABEL],
+        })
+        return issue["number"]
+
+    def post_results_comment(self, repository, body):
+        """Comment on the results issue; returns the issue number"""
+        issue_number = self.results_issue(repository)
+        self.request("POST", f"/repos/{repository}/issues/{issue_number}/comments", body={"body": body})
+        return issue_number
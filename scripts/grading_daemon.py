@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Resident validation service.
+
+Accepts submission jobs over HTTP, keeps them in a durable SQLite queue
+and grades them on workers that stay warm between jobs (pytest worker,
+dependency environments, result cache). Results are published the way
+the workflow does it: a comment on the team's results issue and an
+update to the dashboard data, which a DashboardPublisher coalesces into
+one update (and commit) per publish window.
+
+    POST /jobs      {"repository": "...", "team": "...", "sha": "...", "timestamp": "..."}
+                    -> 202 {"id": 1}
+    GET  /jobs/<id> -> status, results, queue/end-to-end latency and the time
+                       spent validating, commenting and publishing, in seconds;
+                       jobs that couldn't be graded are "failed", with the error
+    GET  /health    -> job counts by status
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from card_registry import CardRegistry
+from card_test_index import CardTestIndex
+from dashboard_publisher import DEFAULT_WINDOW, DashboardPublisher
+from env_cache import EnvironmentCache, default_cache_root
+from format_comment import render_comment
+from github_api import GitHubClient, GitHubError
+from impact import ImpactStore
+from job_queue import JobQueue
+from limits import load_limits
+from pytest_worker import PytestWorker
+from result_cache import ResultCache
+from scheduler import FairScheduler
+from validate_submission import MilestoneValidator, error_result, load_milestones
+
+REPO_ROOT = Path(__file__).parent.absolute().parent
+
+DEFAULT_CLONE_URL = "https://github.com/{repository}.git"
+
+# Fetching a student repository should never take this long
+GIT_TIMEOUT = 300
+
+
+def log(message):
+    print(f"[grading-daemon] {message}", file=sys.stderr, flush=True)
+
+
+class GradingDaemon:
+    def __init__(self, queue, workdir, concurrency, max_active, cache_dir=None, wheelhouse=None,
+                 env_cache_size=5120, result_cache=True, result_cache_size=64, impact=True,
+                 clone_url=DEFAULT_CLONE_URL, github=None, template=None, dashboard=None,
+                 push_dashboard=False, publish_window=DEFAULT_WINDOW):
+        self.queue = queue
+        self.workdir = Path(workdir)
+        self.max_active = max_active
+        self.cache_dir = cache_dir
+        self.impact = impact
+        self.clone_url = clone_url
+        self.github = github
+        self.template = Path(template) if template else REPO_ROOT / "templates" / "comment_template.md"
+        self.publisher = DashboardPublisher(dashboard, spool=self.workdir / "dashboard-spool",
+                                            window=publish_window, push=push_dashboard) \
+            if dashboard else None
+
+        # Everything below is shared by every job and stays warm between them
+        self.milestones = load_milestones()
+        self.limits = load_limits()
+        self.test_index = CardTestIndex(root=cache_dir)
+        self.card_registries = CardRegistry(root=cache_dir)
+        self.env_cache = EnvironmentCache(root=cache_dir, max_bytes=env_cache_size * 1024 * 1024,
+                                          wheelhouse=wheelhouse)
+        self.result_cache = ResultCache(root=cache_dir, max_bytes=result_cache_size * 1024 * 1024) \
+            if result_cache else None
+        self.pytest_worker = PytestWorker(cwd=REPO_ROOT) if PytestWorker.supported() else None
+        self.scheduler = FairScheduler(concurrency)
+
+        self._repo_locks = {}
+        self._repo_locks_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.pytest_worker is not None:
+            # Pay for the imports now rather than on the first job
+            self.pytest_worker.start()
+        if self.publisher is not None:
+            self.publisher.start()
+        for i in range(self.max_active):
+            thread = threading.Thread(target=self._dispatch, name=f"dispatcher-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self.scheduler.shutdown()
+        if self.publisher is not None:
+            # Publishes whatever is still spooled
+            self.publisher.stop()
+        if self.pytest_worker is not None:
+            self.pytest_worker.close()
+
+    def _dispatch(self):
+        while not self._stopping.is_set():
+            job = self.queue.claim(timeout=1)
+            if job is not None:
+                self.process(job)
+
+    def process(self, job):
+        """Grade one job, publish its results and record them in the queue"""
+        log(f"job {job['id']}: grading {job['repository']}@{job['sha'][:12]} for {job['team']}")
+        start = time.monotonic()
+        error = None
+        try:
+            with self.checkout(job["repository"], job["sha"]) as student_dir:
+                results = MilestoneValidator(
+                    student_dir,
+                    job["team"],
+                    job["repository"],
+                    job["sha"],
+                    job["timestamp"],
+                    pytest_worker=self.pytest_worker,
+                    env_cache=self.env_cache,
+                    result_cache=self.result_cache,
+                    impact_store=ImpactStore(job["repository"], root=self.cache_dir) if self.impact else None,
+                    scheduler=self.scheduler,
+                    milestones=self.milestones,
+                    limits=self.limits,
+                    test_index=self.test_index,
+                    card_registries=self.card_registries
+                ).grade()
+        except Exception as e:
+            # The team still gets a results comment and dashboard entry explaining the error
+            error = e
+            results = error_result(job["team"], job["repository"], job["sha"], job["timestamp"], e)
+        phases = {"validation": round(time.monotonic() - start, 3)}
+
+        phases.update(self.publish(job, results))
+        if error is None:
+            self.queue.complete(job["id"], results, phases)
+            log(f"job {job['id']}: {results.get('totalPoints', 0)} points")
+        else:
+            self.queue.fail(job["id"], error, results, phases)
+            log(f"job {job['id']}: failed: {error}")
+
+    def _repo_lock(self, repository):
+        with self._repo_locks_lock:
+            return self._repo_locks.setdefault(repository, threading.Lock())
+
+    def _git(self, args, cwd, extra_config=()):
+        command = ["git"]
+        for config in extra_config:
+            command += ["-c", config]
+        result = subprocess.run(command + args, capture_output=True, text=True, cwd=cwd,
+                                timeout=GIT_TIMEOUT)
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+
+    @contextmanager
+    def checkout(self, repository, sha):
+        """Check out a submission into the repository's reusable working copy.
+
+        Jobs for the same repository take turns, since they share the checkout.
+        """
+        key = hashlib.sha256(repository.encode()).hexdigest()[:32]
+        path = self.workdir / "checkouts" / key
+        with self._repo_lock(repository):
+            if not (path / ".git").exists():
+                path.mkdir(parents=True, exist_ok=True)
+                self._git(["init", "-q"], path)
+            url = self.clone_url.format(repository=repository)
+            extra_config = []
+            if self.github is not None and self.github.token and url.startswith("https://"):
+                credentials = base64.b64encode(f"x-access-token:{self.github.token}".encode()).decode()
+                extra_config.append(f"http.extraHeader=Authorization: Basic {credentials}")
+            self._git(["fetch", "-q", "--depth", "1", url, sha], path, extra_config)
+            self._git(["checkout", "-q", "--force", "--detach", "FETCH_HEAD"], path)
+            self._git(["clean", "-q", "-ffdx"], path)
+            yield path
+
+    def publish(self, job, results):
+        """Post the results comment and hand the results to the dashboard publisher.
+
+        Failures are only logged. Returns how long each step took.
+        """
+        phases = {}
+        if self.github is not None:
+            start = time.monotonic()
+            try:
+                comment = render_comment(results, self.template.read_text())
+                self.github.post_results_comment(job["repository"], comment)
+            except (GitHubError, OSError) as e:
+                log(f"job {job['id']}: could not post comment: {e}")
+            phases["comment"] = round(time.monotonic() - start, 3)
+
+        if self.publisher is not None:
+            start = time.monotonic()
+            try:
+                self.publisher.submit(results)
+            except OSError as e:
+                log(f"job {job['id']}: could not spool dashboard update: {e}")
+            phases["dashboard"] = round(time.monotonic() - start, 3)
+        return phases
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = "DominionGrading/1.0"
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.server.token
+        if not token:
+            return True
+        if self.headers.get("Authorization") == f"Bearer {token}":
+            return True
+        self._send(401, {"error": "unauthorized"})
+        return False
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            job = json.loads(self.rfile.read(length) or b"{}")
+            # A repository_dispatch body works as-is
+            job = job.get("client_payload", job)
+            job_id = self.server.queue.enqueue(job)
+        except (ValueError, AttributeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(202, {"id": job_id})
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = self.path.rstrip("/")
+        if path == "/health":
+            self._send(200, {"status": "ok", "jobs": self.server.queue.counts()})
+            return
+        if path.startswith("/jobs/"):
+            try:
+                job = self.server.queue.get(int(path[len("/jobs/"):]))
+            except ValueError:
+                job = None
+            if job is not None:
+                self._send(200, job)
+                return
+        self._send(404, {"error": "not found"})
+
+    def log_message(self, format, *args):
+        log(f"{self.address_string()} {format % args}")
+
+
+def serve(host, port, queue, token=None):
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.queue = queue
+    server.token = token
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workdir", default=None,
+                        help="Queue database, checkouts and results (default: <cache-dir>/daemon)")
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="Maximum number of milestones running at once (default: CPU count)")
+    parser.add_argument("--max-active", type=int, default=None,
+                        help="Maximum number of jobs in progress at once (default: 2x concurrency)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for grading caches (default: ~/.cache/dominion-grading)")
+    parser.add_argument("--wheelhouse", default=None,
+                        help="Local wheel directory used to build student environments offline")
+    parser.add_argument("--env-cache-size", type=int, default=5120,
+                        help="Maximum size of the student environment cache in MB")
+    parser.add_argument("--no-result-cache", action="store_true",
+                        help="Always re-run milestones instead of reusing cached outcomes")
+    parser.add_argument("--result-cache-size", type=int, default=64,
+                        help="Maximum size of the milestone result cache in MB")
+    parser.add_argument("--no-impact", action="store_true",
+                        help="Don't carry forward results whose dependencies are unchanged")
+    parser.add_argument("--clone-url", default=DEFAULT_CLONE_URL,
+                        help="Where to fetch submissions from; {repository} is replaced with owner/name")
+    parser.add_argument("--github-api", default=None,
+                        help="GitHub API base URL (default: $GITHUB_API_URL or https://api.github.com)")
+    parser.add_argument("--no-comment", action="store_true",
+                        help="Don't post results comments to student repositories")
+    parser.add_argument("--dashboard", default=str(REPO_ROOT / "docs"),
+                        help="Dashboard data directory to update after each job")
+    parser.add_argument("--push-dashboard", action="store_true",
+                        help="Commit and push the dashboard data after each publish window")
+    parser.add_argument("--publish-window", type=float, default=DEFAULT_WINDOW,
+                        help=f"Seconds of results to coalesce into each dashboard update (default: {DEFAULT_WINDOW})")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir or Path(args.cache_dir or default_cache_root()) / "daemon")
+    workdir.mkdir(parents=True, exist_ok=True)
+    queue = JobQueue(workdir / "jobs.sqlite")
+    daemon = GradingDaemon(
+        queue,
+        workdir,
+        concurrency=args.concurrency,
+        max_active=args.max_active or 2 * args.concurrency,
+        cache_dir=args.cache_dir,
+        wheelhouse=args.wheelhouse,
+        env_cache_size=args.env_cache_size,
+        result_cache=not args.no_result_cache,
+        result_cache_size=args.result_cache_size,
+        impact=not args.no_impact,
+        clone_url=args.clone_url,
+        github=None if args.no_comment else GitHubClient(api_url=args.github_api),
+        dashboard=args.dashboard,
+        push_dashboard=args.push_dashboard,
+        publish_window=args.publish_window
+    )
+    daemon.start()
+    server = serve(args.host, args.port, queue, token=os.environ.get("DOMINION_GRADING_TOKEN"))
+    log(f"listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.stop()
+        queue.close()
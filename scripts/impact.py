@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test-impact analysis for resubmissions.
+
+When a hidden test file passes, the grader records which student files
+and functions it executed. On the team's next submission each of those
+functions is compared by AST fingerprint with the previous SHA, and a
+milestone whose dependencies are all unchanged is carried forward
+without running its tests again.
+"""
+import ast
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from env_cache import default_cache_root
+
+# Symbol for code that runs at import time (module and class bodies, def lines)
+MODULE_SYMBOL = "<module>"
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+class _FunctionCollector(ast.NodeVisitor):
+    """Qualified names and body line ranges of every function in a module"""
+
+    def __init__(self):
+        self.scope = []
+        self.functions = []
+
+    def visit_ClassDef(self, node):
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node):
+        self.scope.append(node.name)
+        qualname = ".".join(self.scope)
+        self.functions.append((node.body[0].lineno, node.end_lineno, qualname, node))
+        self.generic_visit(node)
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+class _StripBodies(ast.NodeTransformer):
+    """Replace function bodies so only import-time code is left"""
+
+    def visit_FunctionDef(self, node):
+        node.body = [ast.Pass()]
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+
+def fingerprint_source(source):
+    """Map each symbol in a module to a hash of its AST.
+
+    Hashing the AST rather than the text means comment and formatting
+    changes never force a rerun.
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return {MODULE_SYMBOL: _digest(source)}
+
+    collector = _FunctionCollector()
+    collector.visit(tree)
+    symbols = {}
+    for _, _, qualname, node in collector.functions:
+        symbols[qualname] = _digest(ast.dump(node))
+    symbols[MODULE_SYMBOL] = _digest(ast.dump(_StripBodies().visit(tree)))
+    return symbols
+
+
+def executed_symbols(source, lines):
+    """Symbols whose bodies contain any of the executed line numbers"""
+    symbols = {MODULE_SYMBOL}
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return symbols
+
+    collector = _FunctionCollector()
+    collector.visit(tree)
+    for line in lines:
+        # Innermost function whose body contains the line
+        best = None
+        for start, end, qualname, _ in collector.functions:
+            if start <= line <= end and (best is None or start >= best[0]):
+                best = (start, qualname)
+        if best is not None:
+            symbols.add(best[1])
+    return symbols
+
+
+class ImpactStore:
+    """Dependency maps and fingerprints from a repository's last submission"""
+
+    def __init__(self, repository, root=None):
+        self.repository = repository
+        self.root = Path(root or default_cache_root()) / "impact"
+        self.path = self.root / f"{hashlib.sha256(repository.encode()).hexdigest()[:32]}.json"
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r') as f:
+                self.previous = json.load(f)
+        except (OSError, ValueError):
+            self.previous = {"sha": None, "files": {}, "milestones": {}}
+        self.milestones = {}
+
+    def carry_forward(self, milestone_id, key, fingerprints):
+        """True if the previous passing result for this milestone still holds"""
+        record = self.previous["milestones"].get(milestone_id)
+        if not record or record.get("key") != key or not record.get("success"):
+            return False
+        old_files = self.previous["files"]
+        for rel, symbols in record["deps"].items():
+            old, new = old_files.get(rel), fingerprints.get(rel)
+            if old is None or new is None:
+                return False
+            if any(old.get(symbol) != new.get(symbol) for symbol in symbols):
+                return False
+        with self._lock:
+            self.milestones[milestone_id] = record
+        return True
+
+    def record(self, milestone_id, key, success, deps):
+        """Remember what a milestone's tests executed; only passes are reusable"""
+        with self._lock:
+            if success and deps is not None:
+                self.milestones[milestone_id] = {
+                    "key": key,
+                    "success": True,
+                    "deps": {rel: sorted(symbols) for rel, symbols in deps.items()},
+                }
+            else:
+                self.milestones.pop(milestone_id, None)
+
+    def save(self, sha, fingerprints):
+        """Persist this submission's state for the next one"""
+        with self._lock:
+            state = {"sha": sha, "files": fingerprints, "milestones": self.milestones}
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
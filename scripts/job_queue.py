@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Durable queue of submission jobs for the grading daemon.
+
+Jobs use the repository_dispatch payload as their schema (repository,
+team, sha, timestamp) and live in a SQLite database, so nothing queued
+is lost when the daemon restarts. Jobs that were running when it
+stopped are queued again on startup.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+JOB_FIELDS = ("repository", "team", "sha", "timestamp")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repository TEXT NOT NULL,
+    team TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    timestamp TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    results TEXT,
+    phases TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+class JobQueue:
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+        with self._lock:
+            # Jobs interrupted by a restart start over
+            self._db.execute("UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'")
+
+    def enqueue(self, job):
+        """Add a job and return its id; job needs repository, team and sha"""
+        missing = [field for field in ("repository", "team", "sha") if not job.get(field)]
+        if missing:
+            raise ValueError(f"Job is missing {', '.join(missing)}")
+        with self._available:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (repository, team, sha, timestamp, enqueued_at) VALUES (?, ?, ?, ?, ?)",
+                (job["repository"], job["team"], job["sha"], job.get("timestamp"), time.time())
+            )
+            self._available.notify()
+            return cursor.lastrowid
+
+    def claim(self, timeout=None):
+        """Mark the oldest queued job as running and return it, or None on timeout"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._available:
+            while True:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                        (time.time(), row["id"])
+                    )
+                    return {"id": row["id"], **{field: row[field] for field in JOB_FIELDS}}
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._available.wait(remaining)
+
+    def complete(self, job_id, results, phases=None):
+        """Store a job's results and how long each processing phase took (in seconds)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, results = ?, phases = ? WHERE id = ?",
+                (time.time(), json.dumps(results), json.dumps(phases) if phases else None, job_id)
+            )
+
+    def fail(self, job_id, error, results=None, phases=None):
+        """Mark a job that couldn't be graded, with the error results published for it"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ?, results = ?, phases = ? "
+                "WHERE id = ?",
+                (time.time(), str(error), json.dumps(results) if results is not None else None,
+                 json.dumps(phases) if phases else None, job_id)
+            )
+
+    def get(self, job_id):
+        """A job's status, results and latencies, or None if there is no such job"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {"id": row["id"], "status": row["status"], **{field: row[field] for field in JOB_FIELDS}}
+        if row["started_at"] is not None:
+            job["queuedSeconds"] = round(row["started_at"] - row["enqueued_at"], 3)
+        if row["finished_at"] is not None:
+            job["latencySeconds"] = round(row["finished_at"] - row["enqueued_at"], 3)
+        if row["phases"] is not None:
+            job["phases"] = json.loads(row["phases"])
+        if row["results"] is not None:
+            job["results"] = json.loads(row["results"])
+        if row["error"] is not None:
+            job["error"] = row["error"]
+        return job
+
+    def counts(self):
+        """Number of jobs in each status"""
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
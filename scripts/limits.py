@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Resource limits for processes that run student code.
+
+Budgets are configured per milestone type in milestones/limits.json.
+Every child runs in its own process group with CPU-time and
+address-space rlimits, and a wall-clock watchdog kills the whole group
+when the budget runs out, so one hung submission can't stall the queue.
+"""
+import json
+import os
+import re
+import signal
+import subprocess
+from pathlib import Path
+from types import ModuleType
+
+resource: ModuleType | None
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+LIMITS_FILE = Path(__file__).absolute().parent.parent / "milestones" / "limits.json"
+
+# Used when limits.json is missing or doesn't mention a setting
+DEFAULT_LIMITS = {"wall_seconds": 120, "cpu_seconds": 90, "memory_mb": 2048}
+
+# Lines naming MemoryError as the exception that ended a traceback: Python's
+# own last line, pytest's "path:line: MemoryError" crash location, or its
+# "FAILED node - MemoryError" summary
+MEMORY_ERROR_LINE = re.compile(
+    r"^(?:MemoryError|\S+:\d+: MemoryError|(?:FAILED|ERROR) \S+ - MemoryError)(?::.*)?$",
+    re.MULTILINE
+)
+
+
+class ResourceLimits:
+    def __init__(self, wall_seconds=None, cpu_seconds=None, memory_mb=None):
+        self.wall_seconds = wall_seconds
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+
+    @classmethod
+    def from_dict(cls, data):
+        data = data or {}
+        return cls(data.get("wall_seconds"), data.get("cpu_seconds"), data.get("memory_mb"))
+
+    def to_dict(self):
+        return {
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_mb": self.memory_mb,
+        }
+
+    def _rlimits(self):
+        limits = []
+        if resource is None:
+            return limits
+        if self.cpu_seconds:
+            # SIGXCPU at the soft limit, SIGKILL a second later if it's ignored
+            cpu = int(self.cpu_seconds)
+            limits.append((resource.RLIMIT_CPU, (cpu, cpu + 1)))
+        if self.memory_mb:
+            memory = int(self.memory_mb) * 1024 * 1024
+            limits.append((resource.RLIMIT_AS, (memory, memory)))
+        return limits
+
+    def apply(self):
+        """Limit the current process (used in forked children)"""
+        for which, value in self._rlimits():
+            try:
+                resource.setrlimit(which, value)
+            except (ValueError, OSError):
+                pass
+
+    def apply_to(self, pid):
+        """Limit an already started process, where the platform allows it"""
+        if resource is None or not hasattr(resource, "prlimit"):
+            return
+        for which, value in self._rlimits():
+            try:
+                resource.prlimit(pid, which, value)
+            except (ValueError, OSError):
+                pass
+
+
+class LimitExceeded(Exception):
+    """Student code ran out of time or memory"""
+
+    def __init__(self, reason, limits):
+        self.reason = reason
+        self.limits = limits
+        if reason == "oom":
+            message = f"Ran out of memory (limit {limits.memory_mb} MB)"
+        else:
+            message = (f"Timed out (limit {limits.wall_seconds}s, {limits.cpu_seconds}s CPU)"
+                       " - check for infinite loops")
+        super().__init__(message)
+
+
+def load_limits(path=LIMITS_FILE):
+    """Budgets by milestone type, with a "default" entry for everything else"""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        config = {}
+    default = {**DEFAULT_LIMITS, **config.get("default", {})}
+    limits = {"default": ResourceLimits.from_dict(default)}
+    for name, values in config.items():
+        if name != "default":
+            limits[name] = ResourceLimits.from_dict({**default, **values})
+    return limits
+
+
+def limits_for(limits, milestone_type):
+    return limits.get(milestone_type) or limits["default"]
+
+
+def exceeded_reason(returncode, output):
+    """"timeout" or "oom" if a process was stopped by its limits, else None"""
+    if returncode == 0:
+        return None
+    if returncode == -signal.SIGXCPU:
+        return "timeout"
+    # The kernel OOM killer, or the hard CPU limit if SIGXCPU was ignored
+    if returncode == -signal.SIGKILL:
+        return "oom"
+    # An allocation the memory rlimit refused, not just a failing test
+    # that mentions MemoryError
+    if MEMORY_ERROR_LINE.search(output or ""):
+        return "oom"
+    return None
+
+
+def kill_group(pgid):
+    """Kill every process left in a process group"""
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_limited(cmd, limits, **kwargs):
+    """subprocess.run() with output captured, under the given limits.
+
+    Raises LimitExceeded when the watchdog or an rlimit stops the process.
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+        **kwargs
+    )
+    # prlimit rather than preexec_fn, which isn't safe with threads running
+    limits.apply_to(process.pid)
+    try:
+        stdout, stderr = process.communicate(timeout=limits.wall_seconds)
+    except subprocess.TimeoutExpired:
+        kill_group(process.pid)
+        process.communicate()
+        raise LimitExceeded("timeout", limits)
+    finally:
+        # Background processes the student code left behind
+        kill_group(process.pid)
+
+    reason = exceeded_reason(process.returncode, stderr + stdout)
+    if reason is not None:
+        raise LimitExceeded(reason, limits)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Workshop burst load test for the grading daemon.
+
+Replays a workshop's pushes against the full pipeline: every team gets a
+local git repository whose commits progress from the starter code to a
+complete solution (see benchmark.py), and repository_dispatch payloads
+for those commits are POSTed to the daemon at times drawn from an
+arrival pattern:
+
+    deadline  pushes pile up towards the end of the window
+    uniform   pushes are spread evenly over the window
+    burst     every team pushes at the same few moments
+
+The daemon fetches from the local repositories, posts comments to a local
+stand-in for the GitHub API (fake_github.py) and updates a scratch copy
+of the dashboard data, so nothing outside this machine is touched. The
+report gives percentiles of queue wait, validation, comment-post and
+dashboard-publish time per job (from handing results to the dashboard
+publisher until the update containing them is written), plus end-to-end
+latency and throughput.
+
+    python scripts/load_test.py --teams 20 --pushes-per-team 3 --window 900 --time-scale 30
+"""
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from benchmark import distribution, generate_checkout
+from fake_github import api_url, serve as serve_github
+from github_api import GitHubClient
+from grading_daemon import REPO_ROOT, GradingDaemon, serve as serve_daemon
+from job_queue import JobQueue
+from validate_submission import load_milestones
+
+PATTERNS = ("deadline", "uniform", "burst")
+
+# What a team's repository looks like after each of its pushes
+PROGRESSION = ["starter", "partial", "fixed"]
+
+# Seconds between job status polls
+POLL_INTERVAL = 0.2
+
+
+def log(message):
+    print(f"[load-test] {message}", file=sys.stderr, flush=True)
+
+
+def git(args, **kwargs):
+    result = subprocess.run(["git", *args], capture_output=True, text=True, **kwargs)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout.strip()
+
+
+def create_team_repository(remote, pushes, milestones, scratch):
+    """A bare repository with one commit per push; returns their SHAs"""
+    git(["init", "-q", "--bare", str(remote)])
+    # The daemon fetches single commits by SHA
+    git(["--git-dir", str(remote), "config", "uploadpack.allowAnySHA1InWant", "true"])
+    env = dict(os.environ, GIT_AUTHOR_NAME="Load Test", GIT_AUTHOR_EMAIL="load-test@localhost",
+               GIT_COMMITTER_NAME="Load Test", GIT_COMMITTER_EMAIL="load-test@localhost")
+    shas = []
+    for i in range(pushes):
+        variant = PROGRESSION[min(i * len(PROGRESSION) // pushes, len(PROGRESSION) - 1)]
+        work_tree = generate_checkout(Path(scratch) / f"push-{i}", variant, milestones)
+        repo_args = ["--git-dir", str(remote), "--work-tree", str(work_tree)]
+        git([*repo_args, "add", "-A"], env=env)
+        git([*repo_args, "commit", "-q", "--allow-empty", "-m", f"{remote.name}: push {i + 1} ({variant})"],
+            env=env)
+        shas.append(git(["--git-dir", str(remote), "rev-parse", "HEAD"]))
+        shutil.rmtree(work_tree)
+    return shas
+
+
+def arrival_times(pattern, pushes, window, rng):
+    """Sorted seconds into the window at which one team pushes"""
+    if pattern == "deadline":
+        # Density grows linearly towards the deadline
+        times = [window * math.sqrt(rng.random()) for _ in range(pushes)]
+    elif pattern == "uniform":
+        times = [window * rng.random() for _ in range(pushes)]
+    else:
+        # Everyone pushes within a few seconds of each checkpoint
+        times = [window * (i + 1) / (pushes + 1) + rng.uniform(0, 5) for i in range(pushes)]
+    return sorted(times)
+
+
+def schedule(teams, pushes, window, pattern, seed):
+    """[(seconds, team index, push index)] in arrival order"""
+    rng = random.Random(seed)
+    arrivals = []
+    for team in range(teams):
+        for push, at in enumerate(arrival_times(pattern, pushes, window, rng)):
+            arrivals.append((at, team, push))
+    return sorted(arrivals)
+
+
+def request_json(url, body=None, token=None):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, headers=headers, method="POST" if data else "GET")
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def replay(daemon_url, arrivals, payloads, time_scale, token=None):
+    """POST every payload at its scheduled (scaled) time; returns the job IDs in order"""
+    job_ids = []
+    start = time.monotonic()
+    for at, team, push in arrivals:
+        delay = start + at / time_scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        body = {"event_type": "validate-submission", "client_payload": payloads[team][push]}
+        job_ids.append(request_json(f"{daemon_url}/jobs", body, token)["id"])
+    return job_ids
+
+
+def wait_for_jobs(daemon_url, job_ids, timeout, token=None):
+    """Poll until every job has finished; returns the jobs that did"""
+    pending = set(job_ids)
+    finished = {}
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        for job_id in sorted(pending):
+            job = request_json(f"{daemon_url}/jobs/{job_id}", token=token)
+            if job["status"] in ("done", "failed"):
+                finished[job_id] = job
+                pending.discard(job_id)
+        if pending:
+            time.sleep(POLL_INTERVAL)
+    if pending:
+        log(f"{len(pending)} jobs still unfinished after {timeout}s")
+    return [finished[job_id] for job_id in job_ids if job_id in finished]
+
+
+def report(jobs, wall_seconds, config, comments=None, publish_latencies=None):
+    phases = {"queueWait": [], "validation": [], "commentPost": [], "dashboardPublish": [], "endToEnd": []}
+    for job in jobs:
+        timings = job.get("phases", {})
+        for name, key in (("validation", "validation"), ("commentPost", "comment"),
+                          ("dashboardPublish", "dashboard")):
+            if key in timings:
+                phases[name].append(timings[key])
+        if "queuedSeconds" in job:
+            phases["queueWait"].append(job["queuedSeconds"])
+        if "latencySeconds" in job:
+            phases["endToEnd"].append(job["latencySeconds"])
+    if publish_latencies is not None:
+        # The job only spools its update; this is how long until it was published
+        phases["dashboardPublish"] = list(publish_latencies)
+    return {
+        "config": config,
+        "jobs": len(jobs),
+        "failedJobs": sum(1 for job in jobs if job["status"] == "failed"),
+        "wallSeconds": round(wall_seconds, 1),
+        "throughputPerMinute": round(60 * len(jobs) / wall_seconds, 2) if wall_seconds else None,
+        "latency": {name: distribution(values) for name, values in phases.items() if values},
+        "commentsPosted": comments,
+    }
+
+
+def format_report(result):
+    lines = [
+        f"{result['jobs']} jobs ({result['failedJobs']} failed) in {result['wallSeconds']:.1f}s "
+        f"({result['throughputPerMinute']} jobs/minute)",
+    ]
+    if result["commentsPosted"] is not None:
+        lines.append(f"Comments posted: {result['commentsPosted']}")
+    lines.append(f"{'':20}{'count':>7}{'mean':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for name, stats in result["latency"].items():
+        lines.append(f"{name:20}{stats['count']:>7}{stats['mean']:>9.3f}{stats['p50']:>9.3f}"
+                     f"{stats['p90']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--pushes-per-team", type=int, default=3)
+    parser.add_argument("--pattern", choices=PATTERNS, default="deadline",
+                        help="How pushes are spread over the window (default: deadline)")
+    parser.add_argument("--window", type=float, default=900,
+                        help="Length of the simulated workshop window in seconds (default: 900)")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Replay this many times faster than real time (default: 1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 1,
+                        help="Maximum number of milestones running at once (default: CPU count)")
+    parser.add_argument("--max-active", type=int, default=None,
+                        help="Maximum number of jobs in progress at once (default: 2x concurrency)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for grading caches (default: a fresh temporary directory)")
+    parser.add_argument("--wheelhouse", default=None,
+                        help="Local wheel directory used to build student environments offline")
+    parser.add_argument("--publish-window", type=float, default=10.0,
+                        help="Seconds of results the daemon coalesces into each dashboard update (default: 10)")
+    parser.add_argument("--github-delay", type=float, default=0.1,
+                        help="Simulated GitHub API latency per request in seconds (default: 0.1)")
+    parser.add_argument("--daemon-url", default=None,
+                        help="Send jobs to this running daemon instead of starting one; it must be "
+                             "able to fetch from the generated repositories (see --workdir)")
+    parser.add_argument("--workdir", default=None,
+                        help="Keep team repositories and daemon state here (default: a temporary directory)")
+    parser.add_argument("--timeout", type=float, default=3600,
+                        help="Give up waiting for jobs after this many seconds")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="dominion-load-test-"))
+    cache_dir = args.cache_dir or str(workdir / "cache")
+    remotes = workdir / "remotes"
+    milestones = load_milestones()
+
+    log(f"creating {args.teams} team repositories in {remotes}")
+    payloads = []
+    window_start = datetime.now(timezone.utc)
+    arrivals = schedule(args.teams, args.pushes_per_team, args.window, args.pattern, args.seed)
+    push_times = {(team, push): at for at, team, push in arrivals}
+    with tempfile.TemporaryDirectory() as scratch:
+        for team in range(args.teams):
+            repository = f"workshop/team-{team + 1:02d}"
+            shas = create_team_repository(remotes / repository, args.pushes_per_team, milestones,
+                                          Path(scratch) / repository)
+            payloads.append([{
+                "repository": repository,
+                "team": f"team-{team + 1:02d}",
+                "sha": sha,
+                "timestamp": (window_start + timedelta(seconds=push_times[team, push]))
+                .strftime("%Y-%m-%dT%H:%M:%SZ"),
+            } for push, sha in enumerate(shas)])
+
+    token = os.environ.get("DOMINION_GRADING_TOKEN")
+    github_server = daemon = daemon_server = queue = None
+    daemon_url = args.daemon_url
+    if daemon_url is None:
+        github_server = serve_github(delay=args.github_delay)
+        threading.Thread(target=github_server.serve_forever, daemon=True).start()
+        dashboard = workdir / "dashboard"
+        dashboard.mkdir()
+        shutil.copy(REPO_ROOT / "docs" / "data.snapshot.json", dashboard)
+        queue = JobQueue(workdir / "jobs.sqlite")
+        daemon = GradingDaemon(
+            queue,
+            workdir / "daemon",
+            concurrency=args.concurrency,
+            max_active=args.max_active or 2 * args.concurrency,
+            cache_dir=cache_dir,
+            wheelhouse=args.wheelhouse,
+            clone_url=f"file://{remotes}/{{repository}}",
+            github=GitHubClient(token="load-test", api_url=api_url(github_server)),
+            dashboard=dashboard,
+            publish_window=args.publish_window,
+        )
+        daemon.start()
+        daemon_server = serve_daemon("127.0.0.1", 0, queue, token=token)
+        threading.Thread(target=daemon_server.serve_forever, daemon=True).start()
+        daemon_url = f"http://127.0.0.1:{daemon_server.server_address[1]}"
+    daemon_url = daemon_url.rstrip("/")
+
+    try:
+        log(f"replaying {len(arrivals)} pushes ({args.pattern}) over "
+            f"{args.window / args.time_scale:.0f}s against {daemon_url}")
+        start = time.monotonic()
+        job_ids = replay(daemon_url, arrivals, payloads, args.time_scale, token)
+        jobs = wait_for_jobs(daemon_url, job_ids, args.timeout, token)
+        wall_seconds = time.monotonic() - start
+    finally:
+        if daemon_server is not None:
+            daemon_server.shutdown()
+            daemon_server.server_close()
+        if daemon is not None:
+            daemon.stop()
+        if queue is not None:
+            queue.close()
+        if github_server is not None:
+            github_server.shutdown()
+            github_server.server_close()
+
+    config = {
+        "teams": args.teams,
+        "pushesPerTeam": args.pushes_per_team,
+        "pattern": args.pattern,
+        "window": args.window,
+        "timeScale": args.time_scale,
+        "seed": args.seed,
+        "concurrency": args.concurrency,
+        "githubDelay": args.github_delay,
+        "publishWindow": args.publish_window,
+    }
+    result = report(jobs, wall_seconds, config,
+                    comments=github_server.state.comment_count() if github_server is not None else None,
+                    publish_latencies=daemon.publisher.latencies if daemon is not None else None)
+    print(format_report(result))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.workdir is None:
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,134 @@
+"""
+pytest plugin the grader loads into student test runs (`-p grading_plugin`).
+
+Labels coverage data with the node id of the running test, so a single
+coverage run can answer questions about individual test files.
+
+When GRADING_CARD_PLAYS names a file, it also records which ActionCard
+subclasses had their play() method called during each test and writes
+{node id: [card names]} there at the end of the session.
+
+When GRADING_COLLECTION_ERRORS names a file, every test file that failed
+to collect is written there as {file: package}, where package is the
+package whose __init__.py raised while the file was imported (None if
+the error was elsewhere). A package that fails to import can leave its
+submodules in sys.modules, so later files may still collect and run;
+this is how the grader tells those runs apart from healthy ones.
+"""
+import functools
+import json
+import os
+import sys
+import traceback
+from pathlib import Path
+
+import pytest
+
+# Cards played by the running test, and by every test so far
+_current_plays = None
+_card_plays: dict[str, list[str]] = {}
+
+# {test file node id: package whose import failed, or None}
+_collection_errors: dict[str, str | None] = {}
+
+
+def _current_coverage():
+    try:
+        import coverage
+    except ImportError:
+        return None
+    return coverage.Coverage.current()
+
+
+def _card_name(card):
+    name = getattr(card, "name", None)
+    return name if isinstance(name, str) else type(card).__name__
+
+
+def _action_card_types():
+    """Every ActionCard subclass defined so far (the tests import the package)"""
+    module = sys.modules.get("dominion.card")
+    action_card = getattr(module, "ActionCard", None)
+    if not isinstance(action_card, type):
+        return []
+    types, pending = [], [action_card]
+    while pending:
+        cls = pending.pop()
+        types.append(cls)
+        pending.extend(cls.__subclasses__())
+    return types
+
+
+def _wrap_play(cls):
+    """Record calls to play() defined on cls (inherited ones are wrapped on the base)"""
+    play = cls.__dict__.get("play")
+    if not callable(play) or getattr(play, "_grading_recorder", False):
+        return
+
+    @functools.wraps(play)
+    def recorded_play(self, *args, **kwargs):
+        if _current_plays is not None:
+            _current_plays.add(_card_name(self))
+        return play(self, *args, **kwargs)
+
+    recorded_play._grading_recorder = True
+    cls.play = recorded_play
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    global _current_plays
+    cov = _current_coverage()
+    if cov is not None:
+        cov.switch_context(item.nodeid)
+    recording = bool(os.environ.get("GRADING_CARD_PLAYS"))
+    if recording:
+        # Cards can be defined at any point during collection, so check every test
+        for cls in _action_card_types():
+            _wrap_play(cls)
+        _current_plays = set()
+    try:
+        yield
+    finally:
+        if cov is not None:
+            cov.switch_context("")
+        if recording:
+            if _current_plays:
+                _card_plays[item.nodeid] = sorted(_current_plays)
+            _current_plays = None
+
+
+def _failed_package(node, error):
+    """The rootdir package whose __init__.py the error was raised from, if any"""
+    root = node.config.rootpath
+    package = None
+    # pytest reports import errors as a CollectError raised from the original
+    while error is not None:
+        for frame in traceback.extract_tb(error.__traceback__):
+            path = Path(frame.filename)
+            if path.name != "__init__.py":
+                continue
+            try:
+                parts = path.relative_to(root).parts
+            except ValueError:
+                # importlib and other library frames
+                continue
+            package = ".".join(parts[:-1])
+        error = error.__cause__ or error.__context__
+    return package
+
+
+def pytest_exception_interact(node, call, report):
+    if report.when == "collect" and report.failed and call.excinfo is not None:
+        _collection_errors[report.nodeid] = _failed_package(node, call.excinfo.value)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    path = os.environ.get("GRADING_CARD_PLAYS")
+    if path:
+        with open(path, 'w') as f:
+            json.dump(_card_plays, f)
+    path = os.environ.get("GRADING_COLLECTION_ERRORS")
+    if path:
+        with open(path, 'w') as f:
+            json.dump(_collection_errors, f)
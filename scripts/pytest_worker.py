@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Warm pytest worker for running hidden tests.
+
+The worker runs in the grading venv with pytest, its plugins and coverage
+already imported. For each request it forks a child that points
+PYTHONPATH at the submission, runs the hidden test file with pytest.main()
+and exits, so each student's `dominion` import stays in its own process.
+
+Protocol: one JSON request per line on stdin
+    {"id": 1, "args": [...], "cwd": "...", "env": {...}, "trace": "...", "limits": {...}}
+and one JSON response per line on stdout
+    {"id": 1, "returncode": 0, "output": "...", "executed": {...}, "reason": "..."}
+
+When "trace" names a directory, the child runs under coverage and the
+response maps each executed file in it to its executed line numbers.
+Children run under the request's CPU and memory limits and are killed
+when they pass its wall-clock budget; "reason" is then "timeout" or "oom".
+"""
+import json
+import os
+import select
+import sys
+import tempfile
+import threading
+import time
+import subprocess
+from pathlib import Path
+
+from limits import LimitExceeded, ResourceLimits, exceeded_reason, kill_group
+
+# Keep responses small; the tail of the pytest output is the useful part
+MAX_OUTPUT = 64 * 1024
+
+
+class WorkerError(Exception):
+    """The warm worker died or could not be started"""
+
+
+def _warm_imports():
+    """Import everything a hidden test run needs before the first fork"""
+    import importlib.metadata
+    import pytest  # noqa: F401
+    import _pytest.python  # noqa: F401
+    import _pytest.assertion.rewrite  # noqa: F401
+    try:
+        import coverage  # noqa: F401
+    except ImportError:
+        pass
+    # Third-party plugins are normally discovered and imported per run
+    for entry_point in importlib.metadata.entry_points(group="pytest11"):
+        try:
+            entry_point.load()
+        except Exception:
+            pass
+
+
+def _start_trace(directory):
+    """Start measuring the files under directory, if coverage is available"""
+    if not directory:
+        return None
+    try:
+        import coverage
+        cov = coverage.Coverage(
+            data_file=None,
+            config_file=False,
+            include=[os.path.join(directory, "*")]
+        )
+        cov.start()
+        return cov
+    except Exception:
+        return None
+
+
+def _run_child(request, output_path):
+    """Body of the forked child: run pytest and exit with its status"""
+    import pytest
+
+    returncode = 3  # pytest's INTERNAL_ERROR
+    try:
+        os.setpgid(0, 0)
+        limits = ResourceLimits.from_dict(request.get("limits"))
+        limits.apply()
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.dup2(fd, 1)
+        os.dup2(fd, 2)
+        null = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null, 0)
+        sys.stdin = open(0, closefd=False)
+        sys.stdout = open(1, 'w', closefd=False)
+        sys.stderr = open(2, 'w', closefd=False)
+
+        env = request.get("env", {})
+        os.environ.update(env)
+        if env.get("PYTHONPATH"):
+            sys.path[:0] = env["PYTHONPATH"].split(os.pathsep)
+        if env.get("PYTHONPYCACHEPREFIX"):
+            sys.pycache_prefix = env["PYTHONPYCACHEPREFIX"]
+        os.chdir(request.get("cwd") or ".")
+
+        cov = _start_trace(request.get("trace"))
+        returncode = int(pytest.main(request["args"]))
+        if cov is not None:
+            cov.stop()
+            data = cov.get_data()
+            executed = {path: sorted(data.lines(path) or []) for path in data.measured_files()}
+            with open(output_path + ".trace", 'w') as f:
+                json.dump(executed, f)
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        except Exception:
+            pass
+        os._exit(returncode)
+
+
+def _respond(response):
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+
+
+def _finish(pid, status, running, timed_out):
+    """Report the outcome of a finished child"""
+    request, output_path, _ = running.pop(pid)
+    # Anything the test run started in the background goes with it
+    kill_group(pid)
+    if os.WIFEXITED(status):
+        returncode = os.WEXITSTATUS(status)
+    else:
+        returncode = -os.WTERMSIG(status)
+    try:
+        with open(output_path, 'r', errors='replace') as f:
+            output = f.read()[-MAX_OUTPUT:]
+        os.unlink(output_path)
+    except OSError:
+        output = ""
+    response = {"id": request["id"], "returncode": returncode, "output": output}
+    if pid in timed_out:
+        timed_out.discard(pid)
+        response["reason"] = "timeout"
+    elif request.get("limits"):
+        reason = exceeded_reason(returncode, output)
+        if reason is not None:
+            response["reason"] = reason
+    try:
+        with open(output_path + ".trace", 'r') as f:
+            response["executed"] = json.load(f)
+        os.unlink(output_path + ".trace")
+    except (OSError, ValueError):
+        pass
+    _respond(response)
+
+
+def serve():
+    """Read requests from stdin and fork a pytest child for each one"""
+    _warm_imports()
+    _respond({"id": 0, "ready": True})
+
+    running = {}
+    timed_out = set()
+    buffer = b""
+    stdin_open = True
+    while stdin_open or running:
+        # Once stdin is closed this just sleeps while the stragglers finish
+        readable, _, _ = select.select([0] if stdin_open else [], [], [], 0.05)
+        if readable:
+            chunk = os.read(0, 65536)
+            if not chunk:
+                stdin_open = False
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                fd, output_path = tempfile.mkstemp(prefix="pytest-worker-", suffix=".log")
+                os.close(fd)
+                sys.stdout.flush()
+                pid = os.fork()
+                if pid == 0:
+                    _run_child(request, output_path)
+                try:
+                    # Also done in the child; whichever runs first wins the race
+                    os.setpgid(pid, pid)
+                except OSError:
+                    pass
+                wall = (request.get("limits") or {}).get("wall_seconds")
+                deadline = time.monotonic() + wall if wall else None
+                running[pid] = (request, output_path, deadline)
+
+        # Watchdog: kill the process group of every child over its budget
+        now = time.monotonic()
+        for pid, (_, _, deadline) in running.items():
+            if deadline is not None and now > deadline and pid not in timed_out:
+                timed_out.add(pid)
+                kill_group(pid)
+
+        # Reap every child that has finished since the last pass
+        while running:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                break
+            _finish(pid, status, running, timed_out)
+
+
+class PytestWorker:
+    """Client for a warm worker process; safe to share between threads"""
+
+    def __init__(self, command=None, cwd=None):
+        self.command = command or [sys.executable, str(Path(__file__).absolute()), "--serve"]
+        self.cwd = cwd
+        self._process = None
+        self._next_id = 1
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def supported():
+        return hasattr(os, "fork")
+
+    def start(self):
+        """Start the worker and wait until its imports are done"""
+        with self._lock:
+            if self._process is not None:
+                return
+            if not self.supported():
+                raise WorkerError("fork() is not available on this platform")
+            process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                cwd=self.cwd
+            )
+            ready = process.stdout.readline()
+            if not ready or not json.loads(ready).get("ready"):
+                process.kill()
+                raise WorkerError("pytest worker failed to start")
+            self._process = process
+            threading.Thread(target=self._read_responses, daemon=True).start()
+
+    def _read_responses(self):
+        for line in self._process.stdout:
+            response = json.loads(line)
+            with self._lock:
+                waiter = self._pending.pop(response["id"], None)
+            if waiter is not None:
+                waiter[1] = response
+                waiter[0].set()
+        # The worker exited; wake everyone still waiting
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter[0].set()
+
+    def run(self, args, cwd=None, env=None, trace=None, limits=None):
+        """Run pytest with the given arguments; returns (returncode, output, executed).
+
+        executed is None unless trace names a directory to measure. Raises
+        LimitExceeded if the run is stopped by its resource limits.
+        """
+        self.start()
+        waiter = [threading.Event(), None]
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = waiter
+            request = {"id": request_id, "args": [str(a) for a in args],
+                       "cwd": str(cwd) if cwd else None, "env": env or {},
+                       "trace": str(trace) if trace else None,
+                       "limits": limits.to_dict() if limits else None}
+            try:
+                self._process.stdin.write(json.dumps(request) + "\n")
+                self._process.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                self._pending.pop(request_id, None)
+                raise WorkerError("pytest worker is not running")
+        waiter[0].wait()
+        if waiter[1] is None:
+            raise WorkerError("pytest worker exited unexpectedly")
+        if waiter[1].get("reason"):
+            raise LimitExceeded(waiter[1]["reason"], limits)
+        return waiter[1]["returncode"], waiter[1]["output"], waiter[1].get("executed")
+
+    def close(self):
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            process.wait()
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv[1:]:
+        serve()
+    else:
+        print("usage: pytest_worker.py --serve", file=sys.stderr)
+        sys.exit(2)
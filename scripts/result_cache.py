@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Persistent, content-addressed caches shared by every grading run.
+
+DiskCache is a small size-bounded JSON store. ResultCache keys milestone
+outcomes on everything that can change them: the milestone id and its
+definitions.json entry, the hidden test files, and a Merkle hash of the
+relevant student files. Teams that push byte-identical code (including
+different teams early in the workshop) get their results immediately.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from env_cache import default_cache_root
+
+# Bump when grading logic changes in a way that invalidates cached outcomes
+CACHE_VERSION = 2
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def hash_file(path):
+    """sha256 of a file's contents, or None if it doesn't exist"""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class DiskCache:
+    """JSON values stored one file per key, evicting least recently used"""
+
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                value = json.load(f)
+            # Mark as most recently used
+            os.utime(path)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, separators=(",", ":"))
+        # Write atomically so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield st.st_mtime, st.st_size, path
+
+    def _disk_size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop the oldest entries until the cache is at 90% of its cap"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+
+class ResultCache(DiskCache):
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        super().__init__(Path(root or default_cache_root()) / "results", max_bytes)
+
+    @staticmethod
+    def key(milestone_id, milestone, hidden_test_hashes, student_hash):
+        """Cache key for one milestone outcome"""
+        material = json.dumps({
+            "version": CACHE_VERSION,
+            "milestone": milestone_id,
+            "definition": milestone,
+            "hidden_tests": hidden_test_hashes,
+            "student": student_hash,
+        }, sort_keys=True)
+        return hashlib.sha256(material.encode()).hexdigest()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Per-submission sandbox for running student code.
+
+The student checkout is copied once into a read-only snapshot (skipping
+.git, virtualenvs and large binaries). Each milestone then gets a cheap
+view of that snapshot built from hardlinks, plus a small writable overlay
+for .coverage data and __pycache__ files.
+"""
+import hashlib
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Directories that are never needed to grade a submission
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", ".venv", "venv", "env", ".tox", ".nox",
+    "node_modules", "__pycache__", ".pytest_cache", ".mypy_cache",
+    ".ruff_cache", ".idea", ".vscode", "build", "dist",
+}
+
+# Build artifacts and binaries that students sometimes commit by accident
+SKIP_SUFFIXES = {
+    ".pyc", ".pyo", ".so", ".dylib", ".dll", ".exe", ".whl", ".egg",
+    ".zip", ".tar", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".jar",
+    ".mp4", ".mov", ".pdf", ".sqlite", ".db",
+}
+
+# Stale coverage data would be picked up by `coverage report`
+SKIP_FILES = {".coverage", "coverage.xml", "coverage.json"}
+
+# Anything larger than this is not source code
+MAX_FILE_SIZE = 2 * 1024 * 1024
+
+# ioctl request number for FICLONE (copy-on-write clone on btrfs/xfs)
+FICLONE = 0x40049409
+
+
+def _clone_file(src, dst):
+    """Copy a file, using a reflink when the filesystem supports it"""
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _make_writable(func, path, exc_info=None):
+    """rmtree error handler that restores write permission and retries"""
+    os.chmod(os.path.dirname(path), stat.S_IRWXU)
+    if os.path.isdir(path) and not os.path.islink(path):
+        os.chmod(path, stat.S_IRWXU)
+    func(path)
+
+
+class SandboxView:
+    """A milestone's private view of the submission snapshot"""
+
+    def __init__(self, root, overlay):
+        self.root = root
+        self.overlay = overlay
+
+    def env(self, base=None):
+        """Environment that sends bytecode and coverage data to the overlay"""
+        env = dict(os.environ if base is None else base)
+        env['PYTHONPYCACHEPREFIX'] = str(self.overlay / "pycache")
+        env['COVERAGE_FILE'] = str(self.overlay / ".coverage")
+        return env
+
+
+class SubmissionSandbox:
+    def __init__(self, source, workdir=None):
+        self.source = Path(source).absolute()
+        self.workdir = Path(workdir) if workdir else None
+        self._root = None
+        self._manifest = None
+        self._snapshot = None
+        self._file_hashes = {}
+        self._lock = threading.Lock()
+
+    def manifest(self):
+        """List the files worth copying, relative to the checkout root"""
+        if self._manifest is None:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(self.source):
+                # Prune skipped directories and any committed virtualenv
+                dirnames[:] = sorted(
+                    d for d in dirnames
+                    if d not in SKIP_DIRS
+                    and not d.endswith(".egg-info")
+                    and not (Path(dirpath) / d / "pyvenv.cfg").exists()
+                )
+                for name in sorted(filenames):
+                    path = Path(dirpath) / name
+                    if name in SKIP_FILES or path.suffix.lower() in SKIP_SUFFIXES:
+                        continue
+                    try:
+                        if path.is_symlink() or not path.is_file():
+                            continue
+                        if path.stat().st_size > MAX_FILE_SIZE:
+                            continue
+                    except OSError:
+                        continue
+                    files.append(path.relative_to(self.source))
+            self._manifest = files
+        return self._manifest
+
+    def file_hash(self, rel):
+        """sha256 of a manifest file's contents (memoized)"""
+        rel = Path(rel)
+        digest = self._file_hashes.get(rel)
+        if digest is None:
+            digest = hashlib.sha256((self.source / rel).read_bytes()).hexdigest()
+            self._file_hashes[rel] = digest
+        return digest
+
+    def tree_hash(self, entries=None, exclude=None):
+        """Merkle hash over the manifest files under the given top-level entries.
+
+        Each directory hashes the sorted (name, child hash) pairs of its
+        children, so two checkouts hash equal exactly when the selected
+        files have identical paths and contents. `exclude` is an optional
+        predicate on relative paths.
+        """
+        tree = {}
+        for rel in self.manifest():
+            if entries and rel.parts[0] not in entries:
+                continue
+            if exclude and exclude(rel):
+                continue
+            node = tree
+            for part in rel.parts[:-1]:
+                node = node.setdefault(part, {})
+            node[rel.name] = self.file_hash(rel)
+
+        def digest(node):
+            h = hashlib.sha256()
+            for name in sorted(node):
+                child = node[name]
+                kind, value = ("tree", digest(child)) if isinstance(child, dict) else ("blob", child)
+                h.update(f"{kind} {name}\0{value}\n".encode())
+            return h.hexdigest()
+
+        return digest(tree)
+
+    def snapshot(self):
+        """Materialize the read-only snapshot once and return its path"""
+        with self._lock:
+            if self._snapshot is None:
+                self._root = Path(tempfile.mkdtemp(prefix="dominion-sandbox-", dir=self.workdir))
+                snapshot = self._root / "snapshot"
+                snapshot.mkdir()
+                for rel in self.manifest():
+                    dst = snapshot / rel
+                    dst.parent.mkdir(parents=True, exist_ok=True)
+                    _clone_file(self.source / rel, dst)
+                    # Read-only so a view can never write through a hardlink
+                    os.chmod(dst, stat.S_IMODE(dst.stat().st_mode) & ~0o222)
+                self._snapshot = snapshot
+            return self._snapshot
+
+    @contextmanager
+    def view(self, *entries):
+        """Yield a SandboxView containing the given top-level entries (default: all)"""
+        snapshot = self.snapshot()
+        files = self.manifest()
+        if entries:
+            for entry in entries:
+                if not (self.source / entry).exists():
+                    raise FileNotFoundError(f"{self.source / entry} not found in submission")
+            files = [rel for rel in files if rel.parts[0] in entries]
+
+        view_dir = Path(tempfile.mkdtemp(prefix="view-", dir=self._root))
+        root = view_dir / "student"
+        overlay = view_dir / "overlay"
+        root.mkdir()
+        overlay.mkdir()
+        try:
+            for rel in files:
+                dst = root / rel
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(snapshot / rel, dst)
+                except OSError:
+                    shutil.copy2(snapshot / rel, dst)
+            yield SandboxView(root, overlay)
+        finally:
+            shutil.rmtree(view_dir, onerror=_make_writable)
+
+    def cleanup(self):
+        """Remove the snapshot and any leftover views"""
+        with self._lock:
+            if self._root is not None:
+                shutil.rmtree(self._root, onerror=_make_writable)
+            self._root = None
+            self._snapshot = None
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Worker pool shared by many submissions.
+
+Tasks are queued per team and the worker threads take them round-robin
+across teams, so one team claiming every milestone can't starve the
+others. The number of tasks running at once is capped globally.
+"""
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+
+class FairScheduler:
+    def __init__(self, concurrency):
+        self.concurrency = max(1, concurrency)
+        # team -> deque of (future, fn, args); insertion order is the rotation
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._work, name=f"grader-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, team, fn, *args):
+        """Queue fn(*args) on behalf of team and return a Future for its result"""
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("scheduler has been shut down")
+            self._queues.setdefault(team, deque()).append((future, fn, args))
+            self._condition.notify()
+        return future
+
+    def _next_task(self):
+        """Pop the next task, moving its team to the back of the rotation"""
+        with self._condition:
+            while not self._queues and not self._shutdown:
+                self._condition.wait()
+            if not self._queues:
+                return None
+            team, queue = next(iter(self._queues.items()))
+            task = queue.popleft()
+            del self._queues[team]
+            if queue:
+                self._queues[team] = queue
+            return task
+
+    def _work(self):
+        while True:
+            task = self._next_task()
+            if task is None:
+                return
+            future, fn, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; queued tasks still run before the workers exit"""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
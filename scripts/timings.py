@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Stage timings for a graded submission.
+
+Each stage (claim parse, sandbox copy, dependency install, card
+discovery, pytest run, coverage run, coverage report) is timed with a
+monotonic clock. Durations are added to the submission's totals and to
+the milestone running on the current thread, so concurrently validated
+milestones each get their own breakdown.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _rounded(stages):
+    return {name: round(seconds, 3) for name, seconds in stages.items()}
+
+
+class Timings:
+    def __init__(self):
+        self.submission = {}
+        self.milestones = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _add(self, stages, name, seconds):
+        stages[name] = stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def milestone(self, milestone_id):
+        """Attribute stages timed on this thread to a milestone"""
+        previous = getattr(self._local, "milestone", None)
+        self._local.milestone = milestone_id
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._add(self.milestones.setdefault(milestone_id, {}), "total", time.monotonic() - start)
+            self._local.milestone = previous
+
+    @contextmanager
+    def stage(self, name):
+        """Time one stage for the submission and the current milestone"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            seconds = time.monotonic() - start
+            milestone_id = getattr(self._local, "milestone", None)
+            with self._lock:
+                self._add(self.submission, name, seconds)
+                if milestone_id is not None:
+                    self._add(self.milestones.setdefault(milestone_id, {}), name, seconds)
+
+    def for_milestone(self, milestone_id):
+        with self._lock:
+            return _rounded(self.milestones.get(milestone_id, {}))
+
+    def for_submission(self, total=None):
+        """Stage totals across all milestones, plus the submission's wall-clock total"""
+        with self._lock:
+            stages = dict(self.submission)
+        if total is not None:
+            stages["total"] = total
+        return _rounded(stages)
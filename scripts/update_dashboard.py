@@ -1,19 +1,71 @@
 #!/usr/bin/env python3
 """
 Update the dashboard with latest results
+
+Every submission is appended as one compact JSON line to a results log
+in the dashboard data directory (data.log.jsonl), which is the source of
+truth and keeps the full history. The published files are derived from a
+snapshot of the dashboard state (data.snapshot.json) plus the log lines
+written since the snapshot was taken; the snapshot is compacted whenever
+that tail grows past COMPACT_EVERY lines.
+
+The state also carries aggregates that are maintained as each result is
+applied rather than recomputed: the ranked leaderboard (points, then who
+reached their score first, then team name), per-milestone completion
+sets and counts, and cohort totals. The dashboard reads them ready to
+render from a small summary.json, along with the latest events, and fetches a team's teams/<team>.json history only when
+it needs it. Each update rewrites the summary and the shards of the teams
+it changed, and then version.json, a few bytes with a revision that goes
+up with every applied result and a hash of the summary, which is all the
+dashboard polls for. Publishing holds an flock on the directory's .publish.lock,
+so concurrent updaters never interleave their writes.
 """
 import json
 import argparse
+import bisect
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
 import sys
 
-def update_dashboard(results_file, output_file):
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+SNAPSHOT_VERSION = 3
+
+# Fold the log tail into the snapshot once it has this many lines
+COMPACT_EVERY = 200
+
+LOCK_FILE = ".publish.lock"
+SUMMARY_FILE = "summary.json"
+VERSION_FILE = "version.json"
+TEAMS_DIR = "teams"
+
+# How much summary.json carries; team shards keep every submission
+MAX_SUMMARY_TIMELINE = 20
+MAX_SUMMARY_CUSTOM = 10
+
+
+def log_paths(output_dir):
+    """(results log, snapshot) in a dashboard data directory"""
+    output_dir = Path(output_dir)
+    return output_dir / "data.log.jsonl", output_dir / "data.snapshot.json"
+
+
+def load_results(results_file):
     # Check if results file exists
     if not Path(results_file).exists():
         print(f"Error: Results file '{results_file}' not found")
         # Create a minimal error result
-        new_results = {
+        return {
             "team": "unknown",
             "repository": "unknown",
             "sha": "unknown",
@@ -23,190 +75,476 @@ def update_dashboard(results_file, output_file):
             "failed": [],
             "error": f"Results file {results_file} not found"
         }
-    else:
-        try:
-            # Load new results
-            with open(results_file, 'r') as f:
-                content = f.read()
-                if not content.strip():
-                    raise json.JSONDecodeError("Empty file", "", 0)
-                new_results = json.loads(content)
-                print(f"Loaded results for team: {new_results.get('team', 'unknown')}")
-        except json.JSONDecodeError as e:
-            print(f"Error: Invalid JSON in results file: {e}")
-            new_results = {
-                "team": "unknown",
-                "repository": "unknown", 
-                "sha": "unknown",
-                "timestamp": datetime.now().isoformat(),
-                "totalPoints": 0,
-                "passed": [],
-                "failed": [],
-                "error": f"Invalid JSON in results file: {str(e)}"
-            }
-        except Exception as e:
-            print(f"Error reading results file: {e}")
-            new_results = {
-                "team": "unknown",
-                "repository": "unknown",
-                "sha": "unknown",
-                "timestamp": datetime.now().isoformat(),
-                "totalPoints": 0,
-                "passed": [],
-                "failed": [],
-                "error": f"Error reading results: {str(e)}"
-            }
-    
-    # Load existing dashboard data
-    output_path = Path(output_file)
-    if output_path.exists():
-        try:
-            with open(output_path, 'r') as f:
-                dashboard_data = json.load(f)
-        except Exception as e:
-            print(f"Warning: Could not load existing dashboard data: {e}")
-            dashboard_data = {
-                "teams": {},
-                "lastUpdate": None,
-                "milestoneStats": {},
-                "customMilestones": {},
-                "timeline": []
-            }
-    else:
-        print(f"Creating new dashboard data file at {output_path}")
-        dashboard_data = {
-            "teams": {},
-            "lastUpdate": None,
-            "milestoneStats": {},
-            "customMilestones": {},
-            "timeline": []
+    try:
+        # Load new results
+        with open(results_file, 'r') as f:
+            content = f.read()
+            if not content.strip():
+                raise json.JSONDecodeError("Empty file", "", 0)
+            new_results = json.loads(content)
+            print(f"Loaded results for team: {new_results.get('team', 'unknown')}")
+            return new_results
+    except json.JSONDecodeError as e:
+        print(f"Error: Invalid JSON in results file: {e}")
+        return {
+            "team": "unknown",
+            "repository": "unknown",
+            "sha": "unknown",
+            "timestamp": datetime.now().isoformat(),
+            "totalPoints": 0,
+            "passed": [],
+            "failed": [],
+            "error": f"Invalid JSON in results file: {str(e)}"
+        }
+    except Exception as e:
+        print(f"Error reading results file: {e}")
+        return {
+            "team": "unknown",
+            "repository": "unknown",
+            "sha": "unknown",
+            "timestamp": datetime.now().isoformat(),
+            "totalPoints": 0,
+            "passed": [],
+            "failed": [],
+            "error": f"Error reading results: {str(e)}"
         }
-    
-    # Ensure customMilestones exists (for older data files)
-    if "customMilestones" not in dashboard_data:
-        dashboard_data["customMilestones"] = {}
-    
-    # Update team data
-    team = new_results.get("team", "unknown")
-    
+
+
+def results_record(new_results):
+    """The log line for a submission: only what the dashboard needs"""
+    record = {
+        "team": new_results.get("team", "unknown"),
+        "timestamp": new_results.get("timestamp", datetime.now().isoformat()),
+        "recordedAt": datetime.now().isoformat(),
+        "totalPoints": new_results.get("totalPoints", 0),
+        "passed": [{"id": m.get("id", "unknown"), "name": m.get("name", m.get("id", "unknown")),
+                    "points": m.get("points", 0)} for m in new_results.get("passed", [])],
+        "failed": len(new_results.get("failed", [])),
+        "customMilestones": [{"id": c["id"], "name": c["name"], "description": c["description"],
+                              "points": c.get("points", 1)} for c in new_results.get("customMilestones", [])],
+    }
+    if "error" in new_results:
+        record["error"] = new_results["error"]
+    return record
+
+
+def append_record(log_path, record):
+    """Append one line to the results log.
+
+    The line goes out in a single O_APPEND write, so concurrent writers
+    never interleave within a line.
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    line = (json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+    fd = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+def empty_state():
+    return {
+        "teams": {},
+        "lastUpdate": None,
+        "milestoneStats": {},
+        "customMilestones": {},
+        "timeline": [],
+        # Number of results applied so far
+        "revision": 0,
+        # Team names in rank order
+        "leaderboard": [],
+        "totals": {"points": 0, "submissions": 0, "milestonesCompleted": 0}
+    }
+
+
+def leaderboard_key(team, team_data):
+    """Most points first; ties go to whoever reached their score first, then by name"""
+    return (-team_data["totalPoints"], team_data["reachedAt"] or "", team)
+
+
+def rebuild_aggregates(state):
+    """Derive the aggregates from scratch, for state saved before they were maintained"""
+    for team_data in state["teams"].values():
+        team_data.setdefault("rankDelta", None)
+        submissions = team_data["submissions"]
+        team_data["pointsDelta"] = submissions[-1]["points"] - submissions[-2]["points"] \
+            if len(submissions) > 1 else None
+        # The first of the latest run of submissions at the team's current score
+        team_data["reachedAt"] = team_data.get("lastSubmission")
+        for submission in reversed(submissions):
+            if submission["points"] != team_data["totalPoints"]:
+                break
+            team_data["reachedAt"] = submission["timestamp"]
+    state["leaderboard"] = sorted(state["teams"], key=lambda team: leaderboard_key(team, state["teams"][team]))
+
+    for stats in state["milestoneStats"].values():
+        if isinstance(stats["completedBy"], list):
+            # Completion times weren't kept
+            stats["completedBy"] = dict.fromkeys(stats["completedBy"])
+        stats["holders"] = 0
+    for team_data in state["teams"].values():
+        for mid in team_data["completedMilestones"]:
+            if mid in state["milestoneStats"]:
+                state["milestoneStats"][mid]["holders"] += 1
+    state["totals"] = {
+        "points": sum(team_data["totalPoints"] for team_data in state["teams"].values()),
+        "submissions": sum(len(team_data["submissions"]) for team_data in state["teams"].values()),
+        "milestonesCompleted": sum(1 for stats in state["milestoneStats"].values() if stats["holders"]),
+    }
+    state.setdefault("revision", state["totals"]["submissions"])
+    return state
+
+
+def state_from_dashboard(output_path):
+    """Seed the state from a data.json written before the results log existed"""
+    if not output_path.exists():
+        print(f"Creating new dashboard data in {output_path.parent}")
+        return empty_state()
+    try:
+        with open(output_path, 'r') as f:
+            dashboard_data = json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not load existing dashboard data: {e}")
+        return empty_state()
+    state = empty_state()
+    state.update(dashboard_data)
+    # The state keeps the timeline oldest first
+    state["timeline"] = sorted(state["timeline"], key=lambda x: x["timestamp"])
+    return rebuild_aggregates(state)
+
+
+def timeline_events(record):
+    """The timeline entries for one results log line, oldest first"""
+    team = record["team"]
+    timestamp = record["timestamp"]
+    events = [{
+        "timestamp": timestamp,
+        "team": team,
+        "event": f"Completed {milestone['name']}",
+        "points": milestone["points"],
+        "type": "standard"
+    } for milestone in record["passed"]]
+    events += [{
+        "timestamp": timestamp,
+        "team": team,
+        "event": f"⭐ Custom: {custom['name']}",
+        "points": custom["points"],
+        "type": "custom"
+    } for custom in record["customMilestones"]]
+    if "error" in record and not record["passed"] and not record["customMilestones"]:
+        events.append({
+            "timestamp": timestamp,
+            "team": team,
+            "event": "Submission failed - see logs",
+            "points": 0,
+            "type": "error"
+        })
+    return events
+
+
+def apply_record(state, record):
+    """Fold one results log line into the dashboard state"""
+    team = record["team"]
+    timestamp = record["timestamp"]
+
+    leaderboard = state["leaderboard"]
+    totals = state["totals"]
+
+    def rank_key(name):
+        return leaderboard_key(name, state["teams"][name])
+
     # Initialize team data if not exists
-    if team not in dashboard_data["teams"]:
-        dashboard_data["teams"][team] = {
+    old_rank = None
+    if team not in state["teams"]:
+        state["teams"][team] = {
             "totalPoints": 0,
             "completedMilestones": [],
             "customMilestones": [],
             "submissions": [],
-            "lastSubmission": None
+            "lastSubmission": None,
+            "reachedAt": None,
+            "pointsDelta": None,
+            "rankDelta": None
         }
-    
-    team_data = dashboard_data["teams"][team]
-    
-    # Ensure customMilestones field exists in team data
-    if "customMilestones" not in team_data:
-        team_data["customMilestones"] = []
-    
+    else:
+        # Take the team out of the leaderboard while its key changes
+        old_rank = bisect.bisect_left(leaderboard, rank_key(team), key=rank_key)
+        del leaderboard[old_rank]
+    team_data = state["teams"][team]
+    old_milestones = set(team_data["completedMilestones"])
+
     # Update points and milestones
-    team_data["totalPoints"] = new_results.get("totalPoints", 0)
-    team_data["completedMilestones"] = [m["id"] for m in new_results.get("passed", [])]
-    team_data["lastSubmission"] = new_results.get("timestamp", datetime.now().isoformat())
-    
-    # Update custom milestones
-    custom_milestones = new_results.get("customMilestones", [])
-    team_data["customMilestones"] = [m["id"] for m in custom_milestones]
-    
+    if old_rank is None or record["totalPoints"] != team_data["totalPoints"]:
+        team_data["reachedAt"] = timestamp
+    totals["points"] += record["totalPoints"] - team_data["totalPoints"]
+    team_data["totalPoints"] = record["totalPoints"]
+    team_data["completedMilestones"] = [m["id"] for m in record["passed"]]
+    team_data["customMilestones"] = [c["id"] for c in record["customMilestones"]]
+    team_data["lastSubmission"] = timestamp
+
+    new_rank = bisect.bisect_left(leaderboard, rank_key(team), key=rank_key)
+    leaderboard.insert(new_rank, team)
+    # Places gained (positive) or lost by this submission
+    team_data["rankDelta"] = None if old_rank is None else old_rank - new_rank
+
     # Add to submissions history
     submission_record = {
-        "timestamp": new_results.get("timestamp", datetime.now().isoformat()),
-        "points": new_results.get("totalPoints", 0),
-        "passed": len(new_results.get("passed", [])),
-        "failed": len(new_results.get("failed", [])),
-        "custom": len(custom_milestones)
+        "timestamp": timestamp,
+        "points": record["totalPoints"],
+        "passed": len(record["passed"]),
+        "failed": record["failed"],
+        "custom": len(record["customMilestones"])
     }
-    
-    # Add error info if present
-    if "error" in new_results:
-        submission_record["error"] = new_results["error"]
-    
-    team_data["submissions"].append(submission_record)
-    
-    # Keep only last 50 submissions per team
-    team_data["submissions"] = team_data["submissions"][-50:]
-    
-    # Update milestone statistics
-    for milestone in new_results.get("passed", []):
-        mid = milestone.get("id", "unknown")
-        if mid not in dashboard_data["milestoneStats"]:
-            dashboard_data["milestoneStats"][mid] = {
-                "name": milestone.get("name", mid),
-                "points": milestone.get("points", 0),
-                "completedBy": []
+    if "error" in record:
+        submission_record["error"] = record["error"]
+    submissions = team_data["submissions"]
+    team_data["pointsDelta"] = record["totalPoints"] - submissions[-1]["points"] if submissions else None
+    submissions.append(submission_record)
+    totals["submissions"] += 1
+
+    # Update milestone statistics; completedBy is every team that ever passed it (with when, in order)
+    for milestone in record["passed"]:
+        mid = milestone["id"]
+        if mid not in state["milestoneStats"]:
+            state["milestoneStats"][mid] = {
+                "name": milestone["name"],
+                "points": milestone["points"],
+                "completedBy": {},
+                "holders": 0
             }
-        if team not in dashboard_data["milestoneStats"][mid]["completedBy"]:
-            dashboard_data["milestoneStats"][mid]["completedBy"].append(team)
-    
+        state["milestoneStats"][mid]["completedBy"].setdefault(team, timestamp)
+    # holders counts the teams whose latest submission passes it
+    new_milestones = set(team_data["completedMilestones"])
+    for mid in new_milestones - old_milestones:
+        stats = state["milestoneStats"][mid]
+        stats["holders"] += 1
+        if stats["holders"] == 1:
+            totals["milestonesCompleted"] += 1
+    for mid in old_milestones - new_milestones:
+        stats = state["milestoneStats"].get(mid)
+        if stats is None:
+            continue
+        stats["holders"] -= 1
+        if stats["holders"] == 0:
+            totals["milestonesCompleted"] -= 1
+
     # Update custom milestone tracking
-    for custom in custom_milestones:
+    for custom in record["customMilestones"]:
         custom_id = f"{team}_{custom['id']}"  # Prefix with team to avoid conflicts
-        dashboard_data["customMilestones"][custom_id] = {
-            "team": team,
-            "id": custom["id"],
-            "name": custom["name"],
-            "description": custom["description"],
-            "points": custom.get("points", 1),
-            "timestamp": new_results.get("timestamp", datetime.now().isoformat())
-        }
-    
+        state["customMilestones"][custom_id] = dict(custom, team=team, timestamp=timestamp)
+
     # Add to timeline
-    if new_results.get("passed"):
-        for milestone in new_results["passed"]:
-            dashboard_data["timeline"].append({
-                "timestamp": new_results.get("timestamp", datetime.now().isoformat()),
-                "team": team,
-                "event": f"Completed {milestone.get('name', 'Unknown milestone')}",
-                "points": milestone.get("points", 0),
-                "type": "standard"
-            })
-    
-    # Add custom milestones to timeline
-    for custom in custom_milestones:
-        dashboard_data["timeline"].append({
-            "timestamp": new_results.get("timestamp", datetime.now().isoformat()),
-            "team": team,
-            "event": f"⭐ Custom: {custom.get('name', 'Unknown')}",
-            "points": custom.get("points", 1),
-            "type": "custom"
-        })
-    
-    if "error" in new_results and not new_results.get("passed") and not custom_milestones:
-        dashboard_data["timeline"].append({
-            "timestamp": new_results.get("timestamp", datetime.now().isoformat()),
-            "team": team,
-            "event": "Submission failed - see logs",
-            "points": 0,
-            "type": "error"
-        })
-    
-    # Sort timeline by timestamp (newest first)
-    dashboard_data["timeline"].sort(key=lambda x: x["timestamp"], reverse=True)
-    dashboard_data["timeline"] = dashboard_data["timeline"][:100]  # Keep last 100 events
-    
-    # Update timestamp
-    dashboard_data["lastUpdate"] = datetime.now().isoformat()
-    
-    # Save updated data
+    timeline = state["timeline"]
+    for event in timeline_events(record):
+        # Results nearly always arrive in order, so this is almost always an append
+        if not timeline or timeline[-1]["timestamp"] <= timestamp:
+            timeline.append(event)
+        else:
+            timeline.insert(bisect.bisect_right(timeline, timestamp, key=lambda x: x["timestamp"]), event)
+
+    state["lastUpdate"] = record["recordedAt"]
+    state["revision"] += 1
+
+
+def load_state(log_path, snapshot_path, output_dir, until=None):
+    """(state, log offset it covers, [(end offset, record)] replayed on top of the snapshot)
+
+    With `until`, log lines past that offset are left unread.
+    """
+    if snapshot_path.exists():
+        with open(snapshot_path, 'r') as f:
+            snapshot = json.load(f)
+        state, offset = snapshot["state"], snapshot["logOffset"]
+        if snapshot.get("version", 1) < SNAPSHOT_VERSION:
+            rebuild_aggregates(state)
+    else:
+        state, offset = state_from_dashboard(Path(output_dir) / "data.json"), 0
+
+    tail = []
+    if log_path.exists():
+        with open(log_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if until is not None and offset >= until:
+                    break
+                if not line.endswith(b"\n"):
+                    # A line still being written; the next update picks it up
+                    break
+                offset += len(line)
+                if line.strip():
+                    record = json.loads(line)
+                    apply_record(state, record)
+                    tail.append((offset, record))
+    return state, offset, tail
+
+
+@contextmanager
+def publish_lock(output_dir):
+    """Hold the dashboard directory's publish lock for the duration of the block"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / LOCK_FILE, 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def write_json(path, data, **kwargs):
+    """Write atomically so readers (and the web server) never see a partial file; returns the text"""
+    text = json.dumps(data, **kwargs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, 'w') as f:
+        f.write(text)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return text
+
+
+def shard_name(team):
+    """File name of a team's history shard, safe for any team name"""
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", team)
+    if name != team or name.startswith("."):
+        # Keep mangled names distinct
+        name += "-" + hashlib.sha256(team.encode()).hexdigest()[:8]
+    return name + ".json"
+
+
+def render_row(team, team_data, rank):
+    """A team's leaderboard row"""
+    return {
+        "rank": rank,
+        "team": team,
+        "totalPoints": team_data["totalPoints"],
+        "milestones": len(team_data["completedMilestones"]),
+        "customMilestones": len(team_data["customMilestones"]),
+        "lastSubmission": team_data["lastSubmission"],
+        "submissionCount": len(team_data["submissions"]),
+        # Points gained and places moved by the latest submission
+        "pointsDelta": team_data["pointsDelta"],
+        "rankDelta": team_data["rankDelta"],
+        "history": f"{TEAMS_DIR}/{shard_name(team)}",
+    }
+
+
+def render_totals(state):
+    stats = state["milestoneStats"]
+    popular = max(stats, key=lambda mid: len(stats[mid]["completedBy"]), default=None)
+    return dict(
+        state["totals"],
+        teams=len(state["teams"]),
+        popularMilestone={"id": popular, "name": stats[popular]["name"], "teams": len(stats[popular]["completedBy"])}
+        if popular and stats[popular]["completedBy"] else None,
+    )
+
+
+def render_summary(state, offset):
+    """summary.json: everything the dashboard shows, ready to render, except per-team histories"""
+    leaderboard = [render_row(team, state["teams"][team], rank)
+                   for rank, team in enumerate(state["leaderboard"], 1)]
+    milestone_stats = {
+        mid: {
+            "name": stats["name"],
+            "points": stats["points"],
+            "completedBy": list(stats["completedBy"]),
+            "count": len(stats["completedBy"]),
+        }
+        for mid, stats in state["milestoneStats"].items()
+    }
+    custom = sorted(state["customMilestones"].values(), key=lambda c: c["timestamp"], reverse=True)
+    return {
+        "lastUpdate": state["lastUpdate"],
+        "logOffset": offset,
+        "totals": render_totals(state),
+        "leaderboard": leaderboard,
+        "milestoneStats": milestone_stats,
+        "customMilestones": custom[:MAX_SUMMARY_CUSTOM],
+        # Newest first
+        "timeline": state["timeline"][:-MAX_SUMMARY_TIMELINE - 1:-1]
+    }
+
+
+def render_team(team, team_data):
+    """A team's history shard"""
+    return {"team": team, "submissions": team_data["submissions"]}
+
+
+def published_offset(summary_path):
+    """How much of the log the current summary.json reflects"""
     try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
-            json.dump(dashboard_data, f, indent=2)
-        print(f"Successfully updated dashboard data at {output_path}")
+        with open(summary_path, 'r') as f:
+            return json.load(f)["logOffset"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def publish(output_dir, compact_every=COMPACT_EVERY):
+    """Bring summary.json and the team shards up to date with the snapshot and the log tail.
+
+    Only the shards of teams with results the current summary doesn't
+    reflect are rewritten; the snapshot is compacted if the tail is long.
+    Callers hold publish_lock().
+    """
+    output_dir = Path(output_dir)
+    log_path, snapshot_path = log_paths(output_dir)
+    summary_path = output_dir / SUMMARY_FILE
+    state, offset, tail = load_state(log_path, snapshot_path, output_dir)
+    if len(tail) >= compact_every or not snapshot_path.exists():
+        write_json(snapshot_path, {"version": SNAPSHOT_VERSION, "logOffset": offset, "state": state},
+                   separators=(",", ":"), ensure_ascii=False)
+
+    previous = published_offset(summary_path)
+    if previous is None or previous > offset:
+        changed = set(state["teams"])
+    else:
+        changed = {record["team"] for end, record in tail if end > previous}
+    for team in sorted(changed):
+        write_json(output_dir / TEAMS_DIR / shard_name(team), render_team(team, state["teams"][team]),
+                   separators=(",", ":"), ensure_ascii=False)
+    summary = write_json(summary_path, render_summary(state, offset), indent=2, ensure_ascii=False)
+    # Written last, so a client that sees the new revision finds the new summary and shards
+    write_json(output_dir / VERSION_FILE, {
+        "revision": state["revision"],
+        "hash": hashlib.sha256(summary.encode()).hexdigest()[:16],
+        "lastUpdate": state["lastUpdate"],
+    })
+
+
+def dashboard_files(output_dir):
+    """Everything update_dashboard writes, for committing"""
+    output_dir = Path(output_dir)
+    return [*log_paths(output_dir), output_dir / SUMMARY_FILE, output_dir / VERSION_FILE, output_dir / TEAMS_DIR]
+
+
+def update_dashboard(results_file, output_dir):
+    record = results_record(load_results(results_file))
+    log_path, _ = log_paths(output_dir)
+    append_record(log_path, record)
+
+    try:
+        with publish_lock(output_dir):
+            publish(output_dir)
+        print(f"Successfully updated dashboard data in {output_dir}")
     except Exception as e:
+        # The submission is safe in the log; the next update publishes it
         print(f"Error saving dashboard data: {e}")
         sys.exit(1)
 
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--results", required=True, help="Path to results JSON file")
-    parser.add_argument("--output", required=True, help="Path to output dashboard data file")
+    parser.add_argument("--results", help="Path to results JSON file")
+    parser.add_argument("--output", required=True,
+                        help="Dashboard data directory (summary.json, teams/, results log and snapshot)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Fold the whole results log into the snapshot now")
     args = parser.parse_args()
-    
-    update_dashboard(args.results, args.output)
\ No newline at end of file
+
+    if args.results:
+        update_dashboard(args.results, args.output)
+    if args.compact:
+        with publish_lock(args.output):
+            publish(args.output, compact_every=0)
+    if not args.results and not args.compact:
+        parser.error("nothing to do: pass --results and/or --compact")
@@ -4,20 +4,138 @@ Main validation script for student submissions
 """
 import json
 import sys
-import subprocess
 import os
 from pathlib import Path
-import tempfile
-import shutil
 import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 
+from card_registry import CardRegistry
+from card_test_index import CardTestIndex, referenced_cards
+from coverage_stage import CoverageStage
+from env_cache import EnvironmentCache, venv_python
+from sandbox import SubmissionSandbox
+from pytest_worker import PytestWorker, WorkerError
+from impact import MODULE_SYMBOL, ImpactStore, executed_symbols, fingerprint_source
+from limits import LimitExceeded, limits_for, load_limits, run_limited
+from result_cache import ResultCache, hash_file
+from timings import Timings
+
+# Used when the student's card registry can't be read
+KNOWN_ACTION_CARDS = [
+    'Market', 'Smithy', 'Cellar', 'Moat', 'Chancellor',
+    'Harbinger', 'Merchant', 'Vassal', 'Village', 'Woodcutter',
+    'Workshop', 'Militia', 'Moneylender', 'Poacher', 'Remodel',
+    'Spy', 'Chapel', 'Bureaucrat', 'Feast', 'Mine', 'Library'
+]
+
+
+# Validation stages; they run cheapest first by estimated cost per milestone (seconds).
+# Stage 0 (preflight) checks the claim and compiles the package before any milestone
+# runs; if the package doesn't compile, every stage that needs the code is cancelled.
+STAGES = [
+    {"name": "preflight", "cost": 0.01, "needs_code": False},
+    {"name": "static", "cost": 0.05, "needs_code": False},
+    {"name": "hidden_tests", "cost": 2.0, "needs_code": True},
+    {"name": "full_suite", "cost": 20.0, "needs_code": True},
+]
+
+
+def milestone_stage(milestone_id, milestone):
+    """Name of the stage a milestone runs in"""
+    if milestone["type"] in ("bug_fix", "new_card"):
+        return "hidden_tests"
+    if milestone["type"] in ("test_coverage", "test_coverage_overall") or milestone_id == "test_action_cards":
+        return "full_suite"
+    # Claim-only checks (llm_prompt_log) and anything unknown
+    return "static"
+
+
+def claim_schema_error(claims):
+    """What is wrong with the shape of claim.json, or None"""
+    if not isinstance(claims, dict):
+        return "claim.json must contain a JSON object"
+    milestones = claims.get("milestones", [])
+    if not isinstance(milestones, list) or not all(isinstance(m, str) for m in milestones):
+        return "\"milestones\" must be a list of milestone ids"
+    for field in ("custom_milestones", "llm_prompts"):
+        if not isinstance(claims.get(field, []), list):
+            return f"\"{field}\" must be a list"
+    return None
+
+
+def load_milestones():
+    """Load the milestone definitions from the grading repository"""
+    repo_root = Path(__file__).parent.absolute().parent
+    milestone_file = repo_root / "milestones" / "definitions.json"
+    
+    if not milestone_file.exists():
+        raise FileNotFoundError(f"Milestone definitions not found at {milestone_file}")
+    
+    with open(milestone_file, 'r') as f:
+        return json.load(f)
+
+
+def error_result(team, repository, sha, timestamp, error):
+    """Results document for a submission that could not be validated"""
+    return {
+        "team": team,
+        "repository": repository,
+        "sha": sha,
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "totalPoints": 0,
+        "passed": [],
+        "failed": [],
+        "error": str(error)
+    }
+
+
 class MilestoneValidator:
-    def __init__(self, student_code_path, team, repository, sha, timestamp=None):
+    def __init__(self, student_code_path, team, repository, sha, timestamp=None, jobs=None,
+                 pytest_worker=None, warm_worker=True, env_cache=None, result_cache=None,
+                 impact_store=None, scheduler=None, milestones=None, limits=None, test_index=None,
+                 card_registries=None):
         self.student_code_path = Path(student_code_path)
         self.team = team
         self.repository = repository
         self.sha = sha
+        # Size of the worker pool used to run claimed milestones concurrently
+        self.jobs = max(1, jobs or os.cpu_count() or 1)
+        # Optional pool shared with other submissions; takes precedence over jobs
+        self.scheduler = scheduler
+        # One read-only snapshot of the checkout shared by every milestone
+        self.sandbox = SubmissionSandbox(self.student_code_path)
+        # Warm pytest worker for hidden tests; started on first use unless one is shared with us
+        self.pytest_worker = pytest_worker
+        self._owns_worker = pytest_worker is None and warm_worker and PytestWorker.supported()
+        self._worker_lock = threading.Lock()
+        # Virtualenvs for student dependencies, shared across submissions
+        self.env_cache = env_cache or EnvironmentCache()
+        # One coverage run per submission answers every coverage milestone
+        self._coverage_stage = None
+        self._coverage_lock = threading.Lock()
+        self._resources = ExitStack()
+        # Outcomes shared across runs and teams, keyed on code and test hashes
+        self.result_cache = result_cache
+        self.cache_hits = 0
+        self._stats_lock = threading.Lock()
+        # Dependency maps from the team's previous submission
+        self.impact_store = impact_store
+        self.carried_forward = 0
+        self._fingerprints = None
+        self._local = threading.local()
+        # Which cards each student test refers to, cached by test file hash
+        self.test_index = test_index or CardTestIndex()
+        # Card registries of student packages, cached by package hash
+        self.card_registries = card_registries or CardRegistry()
+        self._registry = None
+        self._registry_error = None
+        self._registry_lock = threading.Lock()
+        # Where grading time goes, per stage and per milestone
+        self.timings = Timings()
         # Use provided timestamp or current time as fallback
         self.timestamp = timestamp or datetime.now().isoformat()
         self.results = {
@@ -29,50 +147,71 @@ class MilestoneValidator:
             "passed": [],
             "failed": [],
             "llmBonus": 0,
-            "llmPromptsCount": 0
+            "llmPromptsCount": 0,
+            "cacheHits": 0,
+            "carriedForward": 0
         }
         
         # Get the script's directory and find milestones relative to it
         script_dir = Path(__file__).parent.absolute()
         repo_root = script_dir.parent  # Go up from scripts/ to repo root
-        milestone_file = repo_root / "milestones" / "definitions.json"
+        self.repo_root = repo_root
         
-        # Load milestone definitions
-        if not milestone_file.exists():
-            raise FileNotFoundError(f"Milestone definitions not found at {milestone_file}")
-            
-        with open(milestone_file, 'r') as f:
-            self.milestones = json.load(f)
+        # Load milestone definitions (callers grading many submissions pass them in)
+        self.milestones = milestones if milestones is not None else load_milestones()
+        # Time and memory budgets for student code, by milestone type
+        self.limits = limits if limits is not None else load_limits()
     
     def validate(self):
         """Run all validations"""
-        # Check if claim file exists
-        claim_path = self.student_code_path / "submissions" / "claim.json"
-        if not claim_path.exists():
-            self.results["error"] = "No claim.json file found"
-            print(json.dumps(self.results, indent=2))
-            return
+        self.grade()
         
-        # Read claims
+        # Output ONLY the JSON results
+        print(json.dumps(self.results, indent=2))
+    
+    def grade(self):
+        """Run all validations and return the results document"""
+        start = time.monotonic()
         try:
-            with open(claim_path, 'r') as f:
-                claims = json.load(f)
-        except json.JSONDecodeError:
-            self.results["error"] = "Invalid JSON in claim.json"
-            print(json.dumps(self.results, indent=2))
-            return
+            return self._grade()
+        finally:
+            self.results["timings"] = self.timings.for_submission(time.monotonic() - start)
+    
+    def _grade(self):
+        with self.timings.stage("claimParse"):
+            # Check if claim file exists
+            claim_path = self.student_code_path / "submissions" / "claim.json"
+            if not claim_path.exists():
+                self.results["error"] = "No claim.json file found"
+                return self.results
+            
+            # Read claims
+            try:
+                with open(claim_path, 'r') as f:
+                    claims = json.load(f)
+            except json.JSONDecodeError:
+                self.results["error"] = "Invalid JSON in claim.json"
+                return self.results
+            
+            schema_error = claim_schema_error(claims)
+            if schema_error:
+                self.results["error"] = f"Invalid claim.json: {schema_error}"
+                return self.results
         
         # Validate each claimed milestone
-        for milestone_id in claims.get("milestones", []):
-            if milestone_id in self.milestones:
-                self.validate_milestone(milestone_id)
-            else:
-                self.results["failed"].append({
-                    "id": milestone_id,
-                    "name": f"Unknown milestone: {milestone_id}",
-                    "hint": "This milestone ID doesn't exist"
-                })
-            custom_milestones = claims.get("custom_milestones", [])
+        try:
+            self.run_milestones(claims.get("milestones", []))
+            self.results["cacheHits"] = self.cache_hits
+            self.results["carriedForward"] = self.carried_forward
+            if self.impact_store is not None:
+                self.impact_store.save(self.sha, self.source_fingerprints())
+        finally:
+            self._resources.close()
+            self.sandbox.cleanup()
+            if self._owns_worker and self.pytest_worker is not None:
+                self.pytest_worker.close()
+        
+        custom_milestones = claims.get("custom_milestones", [])
         self.results["customMilestones"] = []
     
         for custom in custom_milestones:
@@ -86,13 +225,117 @@ class MilestoneValidator:
                 })
                 self.results["totalPoints"] += 1
         
-        # Output ONLY the JSON results
-        print(json.dumps(self.results, indent=2))
+        return self.results
+    
+    def run_milestones(self, milestone_ids):
+        """Evaluate claimed milestones stage by stage, cheapest stage first.
+        
+        Milestones within a stage are independent, so they run concurrently, but
+        results are recorded in claim order so the output stays stable between runs.
+        """
+        known_ids = [m for m in milestone_ids if m in self.milestones]
+        
+        with self.timings.stage("preflight"):
+            fatal = self.compile_error()
+        
+        outcomes = {}
+        for stage in sorted(STAGES, key=lambda stage: stage["cost"]):
+            stage_ids = [m for m in known_ids if milestone_stage(m, self.milestones[m]) == stage["name"]]
+            if fatal and stage["needs_code"]:
+                for milestone_id in stage_ids:
+                    outcomes[milestone_id] = (False, f"Skipped: {fatal}", "cancelled")
+                continue
+            if stage["name"] == "static" and not fatal:
+                self.prefetch_card_registry(known_ids)
+            outcomes.update(self.run_stage(stage_ids))
+        
+        for milestone_id in milestone_ids:
+            if milestone_id in outcomes:
+                success, error, reason = outcomes[milestone_id]
+                self.record_milestone(milestone_id, success, error, reason)
+            else:
+                self.results["failed"].append({
+                    "id": milestone_id,
+                    "name": f"Unknown milestone: {milestone_id}",
+                    "hint": "This milestone ID doesn't exist"
+                })
+    
+    def run_stage(self, milestone_ids):
+        """Evaluate one stage's milestones on a bounded worker pool"""
+        if self.scheduler is not None:
+            # Shared pool (batch grading); it decides when each milestone runs
+            futures = [self.scheduler.submit(self.team, self.evaluate_milestone, m) for m in milestone_ids]
+            return dict(zip(milestone_ids, (f.result() for f in futures)))
+        if self.jobs > 1 and len(milestone_ids) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(milestone_ids))) as pool:
+                return dict(zip(milestone_ids, pool.map(self.evaluate_milestone, milestone_ids)))
+        return {m: self.evaluate_milestone(m) for m in milestone_ids}
+    
+    def prefetch_card_registry(self, milestone_ids):
+        """Extract the card registry up front if any claimed milestone needs it"""
+        needs_registry = [m for m in milestone_ids
+                          if self.milestones[m]["type"] == "new_card" or m == "test_action_cards"]
+        if not needs_registry:
+            return
+        try:
+            self.card_registry(self.milestone_limits(self.milestones[needs_registry[0]]))
+        except Exception:
+            # The milestones that need it report the problem themselves
+            pass
+    
+    def compile_error(self):
+        """Why the student's package can't be imported at all, or None (stage 0)"""
+        for rel in self.sandbox.manifest():
+            if rel.parts[0] != "dominion" or rel.suffix != ".py":
+                continue
+            try:
+                compile((self.student_code_path / rel).read_bytes(), str(rel), "exec", dont_inherit=True)
+            except SyntaxError as e:
+                return f"{rel} does not compile (line {e.lineno}: {e.msg})"
+            except (ValueError, OSError) as e:
+                return f"{rel} does not compile ({e})"
+        return None
     
     def validate_milestone(self, milestone_id):
         """Validate a single milestone"""
+        success, error, reason = self.evaluate_milestone(milestone_id)
+        self.record_milestone(milestone_id, success, error, reason)
+    
+    def evaluate_milestone(self, milestone_id):
+        """Run the checks for a single milestone, returning (success, error, reason).
+        
+        reason is "timeout" or "oom" when the milestone's limits stopped it.
+        """
+        with self.timings.milestone(milestone_id):
+            return self._evaluate_milestone(milestone_id)
+    
+    def _evaluate_milestone(self, milestone_id):
         milestone = self.milestones[milestone_id]
         
+        # Identical code and tests were graded before
+        key = self.result_key(milestone_id, milestone)
+        impact_key = self.impact_key(milestone_id, milestone)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                with self._stats_lock:
+                    self.cache_hits += 1
+                if impact_key is not None and cached["success"]:
+                    # Keep the dependency map for the next submission, which
+                    # would otherwise be saved without this milestone
+                    self.impact_store.carry_forward(milestone_id, impact_key, self.source_fingerprints())
+                return cached["success"], None, None
+        
+        # Nothing the hidden tests executed last time has changed since
+        if impact_key is not None and self.impact_store.carry_forward(
+                milestone_id, impact_key, self.source_fingerprints()):
+            with self._stats_lock:
+                self.carried_forward += 1
+            return True, None, None
+        
+        self._local.executed = None
+        # Set by checks that fell back after a stage failed; such outcomes aren't final
+        self._local.degraded = False
         try:
             if milestone["type"] == "bug_fix":
                 success = self.validate_bug_fix(milestone_id, milestone)
@@ -111,28 +354,104 @@ class MilestoneValidator:
                     success = False
             else:
                 success = False
-                
-            if success:
-                self.results["passed"].append({
-                    "id": milestone_id,
-                    "name": milestone["name"],
-                    "points": milestone["points"],
-                    "message": milestone.get("success_message", "Well done!")
-                })
-                self.results["totalPoints"] += milestone["points"]
-            else:
-                self.results["failed"].append({
-                    "id": milestone_id,
-                    "name": milestone["name"],
-                    "hint": milestone.get("failure_hint", "Check your implementation")
-                })
-                
+            
+            # Only clean outcomes are cached; errors and fallbacks are retried next time
+            if self._local.degraded:
+                return success, None, None
+            if key is not None:
+                self.result_cache.put(key, {"success": bool(success)})
+            if impact_key is not None:
+                self.impact_store.record(milestone_id, impact_key, success, self._local.executed)
+            return success, None, None
+        
+        except LimitExceeded as e:
+            # Not cached: a busy runner can push a borderline submission over
+            return False, str(e), e.reason
         except Exception as e:
-            self.results["failed"].append({
+            return False, f"Validation error: {str(e)}", None
+    
+    def hidden_test_file(self, milestone_id, milestone):
+        """Path of the hidden test file for bug_fix and new_card milestones"""
+        repo_root = self.repo_root
+        if milestone["type"] == "bug_fix":
+            return repo_root / "tests" / "bugs" / f"test_{milestone_id}.py"
+        if milestone["type"] == "new_card":
+            return repo_root / "tests" / "cards" / f"test_{milestone['card_name'].lower()}.py"
+        return None
+    
+    def hidden_test_hashes(self, milestone_id, milestone):
+        """Hashes of the hidden test files a milestone runs, or None if it has none"""
+        test_file = self.hidden_test_file(milestone_id, milestone)
+        if test_file is None or not test_file.exists():
+            return None
+        # Hidden tests also pick up conftest.py files next to them
+        hidden = {}
+        for path in (test_file, test_file.parent / "conftest.py", self.repo_root / "tests" / "conftest.py"):
+            if path.exists():
+                hidden[os.path.relpath(path, self.repo_root)] = hash_file(path)
+        return hidden
+    
+    def impact_key(self, milestone_id, milestone):
+        """Key tying a dependency map to the milestone and hidden tests it came from"""
+        if self.impact_store is None:
+            return None
+        hidden = self.hidden_test_hashes(milestone_id, milestone)
+        if hidden is None:
+            return None
+        return ResultCache.key(milestone_id, milestone, hidden, None)
+    
+    def result_key(self, milestone_id, milestone):
+        """Result cache key for a milestone, or None if it isn't cached"""
+        if self.result_cache is None:
+            return None
+        
+        try:
+            hidden = self.hidden_test_hashes(milestone_id, milestone)
+            if hidden is not None:
+                student_hash = self.sandbox.tree_hash(entries=("dominion",))
+            elif self.hidden_test_file(milestone_id, milestone) is not None:
+                # The hidden test file is missing; let the milestone report it
+                return None
+            elif milestone["type"] in ("test_coverage", "test_coverage_overall") or milestone_id == "test_action_cards":
+                # The student's own suite can depend on anything but claims and docs
+                hidden = {}
+                student_hash = self.sandbox.tree_hash(exclude=lambda rel: (
+                    rel.parts[0] == "submissions" or rel.suffix.lower() in (".md", ".rst")
+                ))
+            else:
+                return None
+        except OSError:
+            return None
+        
+        return ResultCache.key(milestone_id, milestone, hidden, student_hash)
+    
+    def milestone_limits(self, milestone):
+        """Resource limits for processes run on behalf of a milestone"""
+        return limits_for(self.limits, milestone["type"])
+    
+    def record_milestone(self, milestone_id, success, error=None, reason=None):
+        """Add a milestone outcome to the passed or failed list"""
+        milestone = self.milestones[milestone_id]
+        
+        if success:
+            self.results["passed"].append({
                 "id": milestone_id,
                 "name": milestone["name"],
-                "hint": f"Validation error: {str(e)}"
+                "points": milestone["points"],
+                "message": milestone.get("success_message", "Well done!"),
+                "timings": self.timings.for_milestone(milestone_id)
             })
+            self.results["totalPoints"] += milestone["points"]
+        else:
+            failure = {
+                "id": milestone_id,
+                "name": milestone["name"],
+                "hint": error or milestone.get("failure_hint", "Check your implementation"),
+                "timings": self.timings.for_milestone(milestone_id)
+            }
+            if reason:
+                failure["reason"] = reason
+            self.results["failed"].append(failure)
     
     def validate_custom_milestone(self, custom):
         """Validate a custom milestone has required fields"""
@@ -167,37 +486,148 @@ class MilestoneValidator:
     
     def validate_bug_fix(self, milestone_id, milestone):
         """Run bug fix tests"""
-        # Get proper path to test files
-        script_dir = Path(__file__).parent.absolute()
-        repo_root = script_dir.parent
-        test_file = repo_root / "tests" / "bugs" / f"test_{milestone_id}.py"
+        test_file = self.hidden_test_file(milestone_id, milestone)
         
         if not test_file.exists():
             raise Exception(f"Test file {test_file} not found")
         
-        # Create temp directory for testing
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            
-            # Copy student code
-            shutil.copytree(
-                self.student_code_path / "dominion",
-                tmpdir / "dominion"
-            )
-            
+        # Get a view of the student's package from the submission sandbox
+        with self.sandbox_view("dominion") as view:
             # Run test
-            env = os.environ.copy()
-            env['PYTHONPATH'] = str(tmpdir)
-            
-            result = subprocess.run(
-                ["poetry", "run", "pytest", str(test_file), "-xvs"],
-                capture_output=True,
-                text=True,
-                env=env,
+            return self.run_hidden_tests(test_file, view, self.milestone_limits(milestone)) == 0
+    
+    def run_hidden_tests(self, test_file, view, limits):
+        """Run a hidden test file against a sandbox view and return pytest's exit code.
+        
+        Raises LimitExceeded if the tests run out of time or memory.
+        """
+        repo_root = self.repo_root
+        args = [str(test_file), "-xvs", "-p", "no:cacheprovider"]
+        env = view.env({})
+        env['PYTHONPATH'] = str(view.root)
+        
+        with self._worker_lock:
+            if self._owns_worker and self.pytest_worker is None:
+                self.pytest_worker = PytestWorker(cwd=repo_root)
+        
+        with self.timings.stage("pytestRun"):
+            if self.pytest_worker is not None:
+                try:
+                    # Trace the student's package so impact analysis knows what ran
+                    trace = view.root / "dominion" if self.impact_store is not None else None
+                    returncode, _, executed = self.pytest_worker.run(
+                        args, cwd=repo_root, env=env, trace=trace, limits=limits)
+                    if executed is not None:
+                        self._local.executed = self.executed_dependencies(view, executed)
+                    return returncode
+                except WorkerError:
+                    # Fall back to a cold pytest run below
+                    pass
+            
+            result = run_limited(
+                ["poetry", "run", "pytest"] + args,
+                limits,
+                env={**os.environ, **env},
                 cwd=repo_root  # Run from repo root
             )
-            
-            return result.returncode == 0
+            return result.returncode
+    
+    def executed_dependencies(self, view, executed):
+        """Turn {path: executed lines} into {relative path: executed symbols}"""
+        deps = {}
+        for path, lines in executed.items():
+            path = Path(path)
+            try:
+                rel = path.relative_to(view.root)
+                deps[str(rel)] = executed_symbols(path.read_text(errors="replace"), lines)
+            except (ValueError, OSError):
+                continue
+        # Data files can't be traced, so any change to them invalidates everything
+        for rel in self.sandbox.manifest():
+            if rel.parts[0] == "dominion" and rel.suffix != ".py":
+                deps[str(rel)] = {MODULE_SYMBOL}
+        return deps
+    
+    def source_fingerprints(self):
+        """AST fingerprints of every file in the student's dominion package"""
+        with self._stats_lock:
+            if self._fingerprints is None:
+                fingerprints = {}
+                for rel in self.sandbox.manifest():
+                    if rel.parts[0] != "dominion":
+                        continue
+                    if rel.suffix == ".py":
+                        source = (self.student_code_path / rel).read_text(errors="replace")
+                        fingerprints[str(rel)] = fingerprint_source(source)
+                    else:
+                        fingerprints[str(rel)] = {MODULE_SYMBOL: self.sandbox.file_hash(rel)}
+                self._fingerprints = fingerprints
+            return self._fingerprints
+    
+    @contextmanager
+    def student_python(self, student_dir):
+        """Yield the interpreter to run the student's suite with.
+        
+        Projects with a pyproject.toml get a cached virtualenv holding their
+        locked dependencies; anything else runs with the default python.
+        """
+        if not (Path(student_dir) / "pyproject.toml").exists():
+            yield "python"
+            return
+        with ExitStack() as stack:
+            with self.timings.stage("dependencyInstall"):
+                venv = stack.enter_context(self.env_cache.environment(student_dir))
+            yield str(venv_python(venv))
+    
+    @contextmanager
+    def sandbox_view(self, *entries):
+        """A view of the submission sandbox, timing how long it takes to build"""
+        with ExitStack() as stack:
+            with self.timings.stage("sandboxCopy"):
+                view = stack.enter_context(self.sandbox.view(*entries))
+            yield view
+    
+    def card_registry(self, limits):
+        """The student's card registry, extracted once and shared by every milestone"""
+        with self._registry_lock:
+            if self._registry is None and self._registry_error is None:
+                try:
+                    package_hash = self.sandbox.tree_hash(entries=("dominion",))
+                except OSError:
+                    package_hash = None
+                try:
+                    with self.sandbox_view("dominion") as view:
+                        env = view.env()
+                        env['PYTHONPATH'] = str(view.root)
+                        with self.timings.stage("cardDiscovery"):
+                            self._registry = self.card_registries.lookup(package_hash, view, env, limits)
+                except Exception as e:
+                    self._registry_error = e
+            if self._registry_error is not None:
+                raise self._registry_error
+            return self._registry
+    
+    def student_env(self, view):
+        """Environment for running the student's own tests inside a view"""
+        env = view.env()
+        # Cached environments don't install the student's package itself
+        env['PYTHONPATH'] = str(view.root)
+        env.pop('VIRTUAL_ENV', None)
+        return env
+    
+    def coverage_stage(self):
+        """The submission's shared coverage run, started on first use"""
+        with self._coverage_lock:
+            if self._coverage_stage is None:
+                # The view stays alive until validation ends so reports can read sources
+                view = self._resources.enter_context(self.sandbox_view())
+                python = self._resources.enter_context(self.student_python(view.root))
+                # Both coverage milestone types share this run and the test_coverage budget
+                self._coverage_stage = CoverageStage(view, python, self.student_env(view),
+                                                     limits_for(self.limits, "test_coverage"),
+                                                     timings=self.timings)
+        self._coverage_stage.run()
+        return self._coverage_stage
     
     def validate_test_coverage(self, milestone_id, milestone):
         """Check test coverage for a module"""
@@ -209,254 +639,60 @@ class MilestoneValidator:
         if not student_test_file.exists():
             return False
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            
-            # Copy student code and tests
-            shutil.copytree(self.student_code_path, tmpdir / "student")
-            
-            # Run coverage
-            os.chdir(tmpdir / "student")
-            
-            # Install student dependencies if they use poetry
-            if (tmpdir / "student" / "pyproject.toml").exists():
-                subprocess.run(["poetry", "install", "--no-interaction"], 
-                             capture_output=True)
-                coverage_cmd = ["poetry", "run", "coverage", "run", "-m", "pytest", f"tests/test_{module}.py"]
-                report_cmd = ["poetry", "run", "coverage", "report", "--include", f"dominion/{module}.py"]
-            else:
-                coverage_cmd = ["python", "-m", "coverage", "run", "-m", "pytest", f"tests/test_{module}.py"]
-                report_cmd = ["python", "-m", "coverage", "report", "--include", f"dominion/{module}.py"]
-            
-            # Run coverage (suppress output)
-            subprocess.run(coverage_cmd, capture_output=True)
-            result = subprocess.run(report_cmd, capture_output=True, text=True)
-            
-            # Parse coverage percentage
-            for line in result.stdout.split('\n'):
-                if f"dominion/{module}.py" in line:
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        coverage_str = parts[-1].rstrip('%')
-                        try:
-                            coverage_percent = float(coverage_str)
-                            return coverage_percent >= threshold
-                        except ValueError:
-                            pass
-            
-            return False
+        coverage_percent = self.coverage_stage().module_percent(module)
+        return coverage_percent is not None and coverage_percent >= threshold
     
     def validate_test_coverage_overall(self, milestone_id, milestone):
         """Check overall test coverage for the entire dominion package"""
         threshold = milestone["threshold"]
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            
-            # Copy student code and tests
-            shutil.copytree(self.student_code_path, tmpdir / "student")
-            
-            # Run coverage on entire test suite
-            os.chdir(tmpdir / "student")
-            
-            # Install student dependencies if they use poetry
-            if (tmpdir / "student" / "pyproject.toml").exists():
-                subprocess.run(["poetry", "install", "--no-interaction"], 
-                             capture_output=True)
-                coverage_cmd = ["poetry", "run", "coverage", "run", "-m", "pytest"]
-                report_cmd = ["poetry", "run", "coverage", "report", "--include", "dominion/*"]
-            else:
-                coverage_cmd = ["python", "-m", "coverage", "run", "-m", "pytest"]
-                report_cmd = ["python", "-m", "coverage", "report", "--include", "dominion/*"]
-            
-            # Run all tests with coverage
-            result = subprocess.run(coverage_cmd, capture_output=True, text=True)
-            
-            # If tests fail, we still want to check coverage
-            # (some tests might fail due to incomplete implementation)
-            
-            # Get coverage report
-            result = subprocess.run(report_cmd, capture_output=True, text=True)
-            
-            # Parse overall coverage from the TOTAL line
-            for line in result.stdout.split('\n'):
-                if line.startswith('TOTAL'):
-                    parts = line.split()
-                    if len(parts) >= 4:
-                        # The coverage percentage is usually the last column
-                        coverage_str = parts[-1].rstrip('%')
-                        try:
-                            coverage_percent = float(coverage_str)
-                            return coverage_percent >= threshold
-                        except ValueError:
-                            # Try parsing from a different position
-                            for part in reversed(parts):
-                                if '%' in part:
-                                    coverage_str = part.rstrip('%')
-                                    try:
-                                        coverage_percent = float(coverage_str)
-                                        return coverage_percent >= threshold
-                                    except ValueError:
-                                        continue
-            
-            # If we couldn't find the TOTAL line, try to get it from json output
-            json_cmd = report_cmd[:-2] + ["coverage", "json", "-o", "-"]
-            result = subprocess.run(json_cmd, capture_output=True, text=True)
-            try:
-                coverage_data = json.loads(result.stdout)
-                total_coverage = coverage_data.get("totals", {}).get("percent_covered", 0)
-                return total_coverage >= threshold
-            except:
-                pass
-            
-            return False
+        # If tests fail, we still want to check coverage
+        # (some tests might fail due to incomplete implementation)
+        coverage_percent = self.coverage_stage().total_percent()
+        return coverage_percent is not None and coverage_percent >= threshold
         
     def validate_test_action_cards(self, milestone_id, milestone):
         """Check that student has written tests for at least 5 action cards (including new ones)"""
         
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            
-            # Copy student code
-            shutil.copytree(self.student_code_path, tmpdir / "student")
-            
-            # First, discover all ActionCard implementations in student code
-            os.chdir(tmpdir / "student")
-            
-            # Get list of all action cards from the student's implementation
-            discover_cmd = """
-import sys
-sys.path.insert(0, '.')
-from dominion.card import Card, ActionCard
-
-action_cards = []
-for card_type in Card.registered():
-    if issubclass(card_type, ActionCard) and hasattr(card_type, 'name'):
-        action_cards.append(card_type.name)
-
-print(';;;'.join(action_cards))
-"""
-            
-            try:
-                result = subprocess.run(
-                    ["python", "-c", discover_cmd],
-                    capture_output=True,
-                    text=True,
-                    cwd=tmpdir / "student"
-                )
-                
-                if result.returncode != 0:
-                    # Fall back to known cards if discovery fails
-                    available_action_cards = [
-                        'Market', 'Smithy', 'Cellar', 'Moat', 'Chancellor',
-                        'Harbinger', 'Merchant', 'Vassal', 'Village', 'Woodcutter',
-                        'Workshop', 'Militia', 'Moneylender', 'Poacher', 'Remodel',
-                        'Spy', 'Chapel', 'Bureaucrat', 'Feast', 'Mine', 'Library'
-                    ]
-                else:
-                    # Parse discovered cards
-                    available_action_cards = result.stdout.strip().split(';;;')
-                    available_action_cards = [c for c in available_action_cards if c]
-                    
-            except Exception:
-                # Fall back to known cards
-                available_action_cards = [
-                    'Market', 'Smithy', 'Cellar', 'Moat', 'Chancellor',
-                    'Harbinger', 'Merchant', 'Vassal', 'Village', 'Woodcutter',
-                    'Workshop', 'Militia', 'Moneylender', 'Poacher', 'Remodel',
-                    'Spy', 'Chapel', 'Bureaucrat', 'Feast', 'Mine', 'Library'
-                ]
-            
-            # Now check for tests of these action cards
-            tested_cards = set()
-            test_dir = self.student_code_path / "tests"
-            
-            if not test_dir.exists():
-                return False
-            
-            # Method 1: Static analysis of test files
-            for test_file in test_dir.glob("test_*.py"):
-                try:
-                    with open(test_file, 'r') as f:
-                        content = f.read()
-                    
-                    # Look for test functions that test action cards
-                    import re
-                    
-                    # Find all test function definitions
-                    test_funcs = re.findall(r'def\s+(test_\w+)', content)
-                    
-                    for test_func in test_funcs:
-                        # Check if this test function tests any known action card
-                        for card_name in available_action_cards:
-                            if card_name.lower() in test_func.lower():
-                                tested_cards.add(card_name)
-                            # Also check the content of the test
-                            elif card_name in content:
-                                # Look for patterns that indicate testing this card
-                                patterns = [
-                                    f'{card_name}Card',
-                                    f'Card.create("{card_name}")',
-                                    f'Card.get_type_with_name("{card_name}")',
-                                    f'"{card_name}"',
-                                    f"'{card_name}'"
-                                ]
-                                if any(pattern in content for pattern in patterns):
-                                    # Verify this is within the test function
-                                    # (This is a simple heuristic)
-                                    if test_func in content.split(card_name)[0].split('def ')[-1]:
-                                        tested_cards.add(card_name)
-                
-                except Exception:
-                    continue
-            
-            # Method 2: Actually run pytest with verbose output to see what's tested
-            try:
-                # Install dependencies if needed
-                if (tmpdir / "student" / "pyproject.toml").exists():
-                    subprocess.run(["poetry", "install", "--no-interaction"], 
-                                 capture_output=True, cwd=tmpdir / "student")
-                    test_cmd = ["poetry", "run", "pytest", "-v", "tests/"]
-                else:
-                    test_cmd = ["python", "-m", "pytest", "-v", "tests/"]
-                
-                result = subprocess.run(
-                    test_cmd,
-                    capture_output=True,
-                    text=True,
-                    cwd=tmpdir / "student"
-                )
-                
-                # Parse pytest output
-                for line in result.stdout.split('\n'):
-                    if '::test_' in line and ('PASSED' in line or 'FAILED' in line):
-                        # Check each action card
-                        for card_name in available_action_cards:
-                            if card_name.lower() in line.lower():
-                                tested_cards.add(card_name)
-                
-            except Exception:
-                # If pytest fails, rely on static analysis only
-                pass
-            
-            # Also check for generic action card test patterns
-            # (e.g., parameterized tests that test multiple cards)
-            for test_file in test_dir.glob("test_*.py"):
-                try:
-                    with open(test_file, 'r') as f:
-                        content = f.read()
-                    
-                    # Look for parameterized tests or loops over action cards
-                    if '@pytest.mark.parametrize' in content and 'ActionCard' in content:
-                        # This might be testing multiple action cards
-                        # Give credit for creative testing approaches
-                        # Count how many cards are mentioned in the parametrize
-                        for card_name in available_action_cards:
-                            if f'"{card_name}"' in content or f"'{card_name}'" in content:
-                                tested_cards.add(card_name)
-                
-                except Exception:
-                    continue
+        # First, discover all ActionCard implementations in student code
+        try:
+            registry = self.card_registry(self.milestone_limits(milestone))
+        except LimitExceeded:
+            # Importing the student's package hangs; running their tests would too
+            raise
+        except Exception:
+            registry = {"cards": None}
+            self._local.degraded = True
+        
+        if registry["cards"] is None:
+            # Fall back to known cards if discovery fails
+            available_action_cards = KNOWN_ACTION_CARDS
+        else:
+            available_action_cards = [
+                name for name, card in registry["cards"].items() if "ActionCard" in card["types"]
+            ]
+        
+        # Now check for tests of these action cards
+        test_dir = self.student_code_path / "tests"
+        
+        if not test_dir.exists():
+            return False
+        
+        # Method 1: Static analysis of test files, including parametrize arguments
+        # (each file is parsed once and the index is cached by file hash)
+        indexes = self.test_index.index_directory(test_dir)
+        tested_cards = referenced_cards(indexes.values(), available_action_cards)
+        
+        # Method 2: Cards whose play() the tests actually called, recorded by the
+        # grading plugin during the submission's shared coverage run
+        try:
+            for cards in self.coverage_stage().card_plays().values():
+                tested_cards.update(c for c in cards if c in available_action_cards)
+        except LimitExceeded:
+            raise
+        except Exception:
+            # If the suite can't run, rely on static analysis only
+            self._local.degraded = True
         
         # Return True if at least 5 action cards have tests
         # This includes both original cards and any new cards students implement
@@ -507,60 +743,19 @@ print(';;;'.join(action_cards))
     def validate_new_card(self, milestone_id, milestone):
         """Validate new card implementation"""
         card_name = milestone["card_name"]
-        
-        # Get proper path to test files
-        script_dir = Path(__file__).parent.absolute()
-        repo_root = script_dir.parent
-        test_file = repo_root / "tests" / "cards" / f"test_{card_name.lower()}.py"
+        test_file = self.hidden_test_file(milestone_id, milestone)
         
         if not test_file.exists():
             raise Exception(f"Test file {test_file} not found")
         
-        # Check if card exists in student code
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir = Path(tmpdir)
-            
-            # Copy student code
-            shutil.copytree(
-                self.student_code_path / "dominion",
-                tmpdir / "dominion"
-            )
-            
-            # First check if card is registered
-            env = os.environ.copy()
-            env['PYTHONPATH'] = str(tmpdir)
-            
-            check_cmd = f"""
-import sys
-sys.path.insert(0, '{tmpdir}')
-from dominion.card import Card
-try:
-    card_type = Card.get_type_with_name('{card_name}')
-    # Silent success - no output
-except:
-    sys.exit(1)
-"""
-            
-            result = subprocess.run(
-                ["python", "-c", check_cmd],
-                capture_output=True,
-                text=True,
-                env=env
-            )
-            
-            if result.returncode != 0:
-                return False
-            
+        # Check if card is registered in student code
+        cards = self.card_registry(self.milestone_limits(milestone))["cards"]
+        if not cards or card_name not in cards:
+            return False
+        
+        with self.sandbox_view("dominion") as view:
             # Run card-specific tests
-            result = subprocess.run(
-                ["poetry", "run", "pytest", str(test_file), "-xvs"],
-                capture_output=True,
-                text=True,
-                env=env,
-                cwd=repo_root  # Run from repo root
-            )
-            
-            return result.returncode == 0
+            return self.run_hidden_tests(test_file, view, self.milestone_limits(milestone)) == 0
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -569,6 +764,22 @@ if __name__ == "__main__":
     parser.add_argument("--sha", required=True)
     parser.add_argument("--student-code", required=True)
     parser.add_argument("--timestamp", required=False, default=None)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Number of milestones to validate concurrently (default: CPU count)")
+    parser.add_argument("--no-warm-worker", action="store_true",
+                        help="Start a fresh pytest process for every hidden test file")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directory for grading caches (default: ~/.cache/dominion-grading)")
+    parser.add_argument("--wheelhouse", default=None,
+                        help="Local wheel directory used to build student environments offline")
+    parser.add_argument("--env-cache-size", type=int, default=5120,
+                        help="Maximum size of the student environment cache in MB")
+    parser.add_argument("--no-result-cache", action="store_true",
+                        help="Always re-run milestones instead of reusing cached outcomes")
+    parser.add_argument("--result-cache-size", type=int, default=64,
+                        help="Maximum size of the milestone result cache in MB")
+    parser.add_argument("--no-impact", action="store_true",
+                        help="Don't carry forward results whose dependencies are unchanged")
     args = parser.parse_args()
     
     try:
@@ -577,20 +788,24 @@ if __name__ == "__main__":
             args.team,
             args.repo,
             args.sha,
-            args.timestamp
+            args.timestamp,
+            jobs=args.jobs,
+            warm_worker=not args.no_warm_worker,
+            env_cache=EnvironmentCache(
+                root=args.cache_dir,
+                max_bytes=args.env_cache_size * 1024 * 1024,
+                wheelhouse=args.wheelhouse
+            ),
+            result_cache=None if args.no_result_cache else ResultCache(
+                root=args.cache_dir,
+                max_bytes=args.result_cache_size * 1024 * 1024
+            ),
+            impact_store=None if args.no_impact else ImpactStore(args.repo, root=args.cache_dir),
+            test_index=CardTestIndex(root=args.cache_dir),
+            card_registries=CardRegistry(root=args.cache_dir)
         )
         validator.validate()
     except Exception as e:
         # Output error as JSON
-        error_result = {
-            "team": args.team,
-            "repository": args.repo,
-            "sha": args.sha,
-            "timestamp": args.timestamp or datetime.now().isoformat(),
-            "totalPoints": 0,
-            "passed": [],
-            "failed": [],
-            "error": str(e)
-        }
-        print(json.dumps(error_result, indent=2))
+        print(json.dumps(error_result(args.team, args.repo, args.sha, args.timestamp, e), indent=2))
         sys.exit(1)
\ No newline at end of file
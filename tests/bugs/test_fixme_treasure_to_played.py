@@ -5,47 +5,18 @@ import sys
 import os
 sys.path.insert(0, os.environ.get('PYTHONPATH', '.'))
 
-from dominion.game import DominionGame, Phase
+from dominion.game import Phase
 from dominion.card import Card, TreasureCard, Copper, Silver, Gold, ActionCard
-from dominion.controller import Controller
 
 
-class MockController(Controller):
-    """Mock controller that implements all required abstract methods"""
-    def __init__(self, game):
-        self.game = game
-        
-    @property
-    def current_player(self):
-        return self.game.current_player
-        
-    def trash(self, card):
-        self.game.trash.append(card)
-        
-    def ask_yes_no(self, prompt):
-        return False
-        
-    def pick_card_from_supply(self, maximum_cost=None):
-        return None
-        
-    def pick_action(self, cards):
-        return None
-        
-    def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-        return []
-        
-    def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-        return []
-
-
-def test_treasures_moved_to_played_when_entering_buy_phase():
+def test_treasures_moved_to_played_when_entering_buy_phase(make_game, mock_controller_class):
     """Test that treasure cards are moved to played pile when transitioning to buy phase"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Market", "Smithy", "Village", "Cellar", "Workshop",
                            "Chapel", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     player = game.current_player
     
@@ -87,14 +58,14 @@ def test_treasures_moved_to_played_when_entering_buy_phase():
     assert len(player.hand) == 2, "Should have 2 non-treasure cards left in hand"
 
 
-def test_treasures_contribute_coins_when_moved():
+def test_treasures_contribute_coins_when_moved(make_game, mock_controller_class):
     """Test that treasures add their coin value when moved to played"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Market", "Smithy", "Village", "Cellar", "Workshop",
                            "Chapel", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     player = game.current_player
     
@@ -118,14 +89,14 @@ def test_treasures_contribute_coins_when_moved():
     assert game.phase == Phase.BUY
 
 
-def test_no_treasures_in_hand():
+def test_no_treasures_in_hand(make_game, mock_controller_class):
     """Test transition when no treasures in hand"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Market", "Smithy", "Village", "Cellar", "Workshop",
                            "Chapel", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     player = game.current_player
     
@@ -152,14 +123,14 @@ def test_no_treasures_in_hand():
     assert game.phase == Phase.BUY, "Should still transition to buy phase"
 
 
-def test_treasures_not_moved_if_actions_remain():
+def test_treasures_not_moved_if_actions_remain(make_game, mock_controller_class):
     """Test that treasures are NOT moved if player still has actions"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Market", "Smithy", "Village", "Cellar", "Workshop",
                            "Chapel", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     player = game.current_player
     
@@ -184,14 +155,14 @@ def test_treasures_not_moved_if_actions_remain():
     assert len(player.hand) == 3, "All cards should still be in hand"
 
 
-def test_only_treasures_moved_not_other_cards():
+def test_only_treasures_moved_not_other_cards(make_game, mock_controller_class):
     """Test that ONLY treasure cards are moved, not victory or action cards"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Market", "Smithy", "Village", "Cellar", "Workshop",
                            "Chapel", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     player = game.current_player
     
@@ -5,53 +5,17 @@ import sys
 import os
 sys.path.insert(0, os.environ.get('PYTHONPATH', '.'))
 
-from dominion.game import DominionGame
 from dominion.card import Card, VictoryCard
-from dominion.controller import Controller
 
 
-class MockController(Controller):
-    """Mock controller that implements all required abstract methods"""
-    def __init__(self, game):
-        self.game = game
-        self.card_picked = None
-        
-    @property
-    def current_player(self):
-        return self.game.current_player
-        
-    def trash(self, card):
-        self.game.trash.append(card)
-        
-    def ask_yes_no(self, prompt):
-        return False
-        
-    def pick_card_from_supply(self, maximum_cost=None):
-        return None
-        
-    def pick_action(self, cards):
-        return None
-        
-    def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-        return []
-        
-    def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-        return []
-        
-    def pick_card_from_list(self, cards):
-        # For Bureaucrat, pick first victory card
-        self.card_picked = cards[0] if cards else None
-        return self.card_picked
-
-
-def test_bureaucrat_with_silver_available():
+def test_bureaucrat_with_silver_available(make_game, mock_controller_class):
     """Test Bureaucrat works normally when Silver is available"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Bureaucrat", "Market", "Smithy", "Village", "Cellar",
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     alice = game.current_player
     bob = game.players[1]
@@ -86,14 +50,14 @@ def test_bureaucrat_with_silver_available():
         "Bob should have one more card in deck"
 
 
-def test_bureaucrat_with_no_silver_in_supply():
+def test_bureaucrat_with_no_silver_in_supply(make_game, mock_controller_class):
     """Test Bureaucrat when Silver pile is empty"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Bureaucrat", "Market", "Smithy", "Village", "Cellar",
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     alice = game.current_player
     bob = game.players[1]
@@ -131,14 +95,14 @@ def test_bureaucrat_with_no_silver_in_supply():
         "Bob should still be affected by attack portion"
 
 
-def test_bureaucrat_with_one_silver_left():
+def test_bureaucrat_with_one_silver_left(make_game, mock_controller_class):
     """Test Bureaucrat when exactly one Silver remains"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Bureaucrat", "Market", "Smithy", "Village", "Cellar",
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     alice = game.current_player
     
@@ -163,14 +127,14 @@ def test_bureaucrat_with_one_silver_left():
         "Silver supply should now be empty"
 
 
-def test_bureaucrat_attack_still_works_without_silver():
+def test_bureaucrat_attack_still_works_without_silver(make_game, mock_controller_class):
     """Test that attack portion works even when Silver unavailable"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob", "Charlie"],
         kingdom_card_names=["Bureaucrat", "Market", "Smithy", "Village", "Cellar",
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     alice = game.current_player
     bob = game.players[1]
@@ -205,14 +169,14 @@ def test_bureaucrat_attack_still_works_without_silver():
         "Charlie should put victory card on deck"
 
 
-def test_bureaucrat_does_not_crash_on_error():
+def test_bureaucrat_does_not_crash_on_error(make_game, mock_controller_class):
     """Test Bureaucrat handles supply.draw() errors gracefully"""
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Bureaucrat", "Market", "Smithy", "Village", "Cellar",
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
-    game.controller = MockController(game)
+    game.controller = mock_controller_class(game)
     
     alice = game.current_player
     
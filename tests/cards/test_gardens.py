@@ -107,13 +107,12 @@ def test_gardens_counts_all_card_locations():
     assert len(player.all_cards()) == 12, \
         "Player should have 12 total cards"
 
-def test_gardens_in_game_scoring():
+def test_gardens_in_game_scoring(make_game):
     """Test Gardens scoring in actual game context"""
-    from dominion.game import DominionGame
     from dominion.card import Card
     
     # Create a game with Gardens
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Gardens", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
@@ -176,12 +175,11 @@ def test_multiple_gardens():
     total_gardens_score = sum(card.score(player) for card in [gardens1, gardens2, gardens3])
     assert total_gardens_score == 9, f"Three Gardens with 33 cards should give 9 VP total, but gave {total_gardens_score}"
 
-def test_gardens_not_action_card():
+def test_gardens_not_action_card(make_game):
     """Ensure Gardens cannot be played as an action"""
-    from dominion.game import DominionGame
     from dominion.card import Card, ActionCard
     
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Gardens", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
@@ -24,63 +24,18 @@ def test_laboratory_is_action_card():
     assert issubclass(card_type, ActionCard), \
         "Laboratory should be an ActionCard"
 
-def test_laboratory_effect():
+def test_laboratory_effect(make_game, mock_controller_class):
     """Test Laboratory gives +2 Cards, +1 Action"""
-    from dominion.game import DominionGame
     from dominion.card import Card
-    from dominion.controller import Controller
     
     # Create a minimal test game
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Laboratory", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    # Mock controller
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            """Some cards might access controller.current_player directly"""
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, player=None, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-            
-        def pick_card_from_hand(self, player):
-            return None
-            
-        def pick_card_from_list(self, cards):
-            return cards[0] if cards else None
-            
-        def pick_cards_from_discard_pile(self, player, maximum=1):
-            return []
-            
-        def pick_cards(self, cards, minimum=0, maximum=None):
-            return ([], cards)  # Return (selected, remaining)
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     player = game.current_player
@@ -109,63 +64,18 @@ def test_laboratory_effect():
     assert final_deck_discard_size == initial_deck_discard_size - 2, \
         "Laboratory should have drawn 2 cards from deck/discard"
 
-def test_laboratory_with_empty_deck():
+def test_laboratory_with_empty_deck(make_game, mock_controller_class):
     """Test Laboratory when deck needs reshuffling"""
-    from dominion.game import DominionGame
     from dominion.card import Card, Copper
-    from dominion.controller import Controller
     
     # Create game
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice"],
         kingdom_card_names=["Laboratory", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    # Mock controller
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            """Some cards might access controller.current_player directly"""
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, player=None, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-            
-        def pick_card_from_hand(self, player):
-            return None
-            
-        def pick_card_from_list(self, cards):
-            return cards[0] if cards else None
-            
-        def pick_cards_from_discard_pile(self, player, maximum=1):
-            return []
-            
-        def pick_cards(self, cards, minimum=0, maximum=None):
-            return ([], cards)  # Return (selected, remaining)
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     player = game.current_player
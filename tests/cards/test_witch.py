@@ -24,55 +24,18 @@ def test_witch_is_action_card():
     assert issubclass(card_type, ActionCard), \
         "Witch should be an ActionCard"
 
-def test_witch_draw_effect():
+def test_witch_draw_effect(make_game, mock_controller_class):
     """Test that Witch draws 2 cards for the player"""
-    from dominion.game import DominionGame
     from dominion.card import Card
-    from dominion.controller import Controller
     
     # Create a test game
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob", "Charlie"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    # Mock controller
-    class MockController(Controller):
-        """Mock controller that implements all required abstract methods"""
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            """Some cards might access controller.current_player directly"""
-            return self.game.current_player
-            
-        def trash(self, card):
-            """Implementation of abstract method"""
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            """Implementation of abstract method"""
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            """Implementation of abstract method"""
-            return None
-            
-        def pick_action(self, cards):
-            """Implementation of abstract method"""
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            """Implementation of abstract method"""
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            """Implementation of abstract method"""
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     player = game.current_player
@@ -97,70 +60,18 @@ def test_witch_draw_effect():
     assert final_deck_discard == initial_deck_discard - 2, \
         "Witch should have drawn 2 cards from deck/discard"
 
-def test_witch_curse_distribution():
+def test_witch_curse_distribution(make_game, mock_controller_class):
     """Test that Witch gives each other player a Curse"""
-    from dominion.game import DominionGame
     from dominion.card import Card, CurseCard
-    from dominion.controller import Controller
     
     # Create a test game with 3 players
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob", "Charlie"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    # Mock controller
-    class MockController(Controller):
-        """Mock controller that implements all required abstract methods"""
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            """Some cards might access controller.current_player directly"""
-            return self.game.current_player
-            
-        def trash(self, card):
-            """Implementation of abstract method"""
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            """Implementation of abstract method"""
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            """Implementation of abstract method"""
-            return None
-            
-        def pick_action(self, cards):
-            """Implementation of abstract method"""
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            """Implementation of abstract method"""
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            """Implementation of abstract method"""
-            return []
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, player=None, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     alice = game.current_player  # First player
@@ -197,45 +108,17 @@ def test_witch_curse_distribution():
     assert game.supply.remaining("Curse") == initial_curse_supply - 2, \
         f"Supply should have 2 fewer Curses, but went from {initial_curse_supply} to {game.supply.remaining('Curse')}"
 
-def test_witch_curse_goes_to_discard():
+def test_witch_curse_goes_to_discard(make_game, mock_controller_class):
     """Test that Curses go to other players' discard piles"""
-    from dominion.game import DominionGame
     from dominion.card import Card, CurseCard
-    from dominion.controller import Controller
     
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     alice = game.current_player
@@ -255,45 +138,17 @@ def test_witch_curse_goes_to_discard():
     assert isinstance(bob.discard_pile.cards[0], CurseCard), \
         "The card in Bob's discard pile should be a Curse"
 
-def test_witch_empty_curse_pile():
+def test_witch_empty_curse_pile(make_game, mock_controller_class):
     """Test Witch behavior when Curse pile is empty"""
-    from dominion.game import DominionGame
     from dominion.card import Card, CurseCard
-    from dominion.controller import Controller
     
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     alice = game.current_player
@@ -321,45 +176,17 @@ def test_witch_empty_curse_pile():
     assert len(alice.hand) == alice_hand_before + 2, \
         "Alice should still draw 2 cards even when Curse pile is empty"
 
-def test_witch_with_four_players():
+def test_witch_with_four_players(make_game, mock_controller_class):
     """Test Witch affects all other players in 4-player game"""
-    from dominion.game import DominionGame
     from dominion.card import Card, CurseCard
-    from dominion.controller import Controller
     
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob", "Charlie", "Diana"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     alice = game.current_player
@@ -407,45 +234,17 @@ def test_witch_play_method_signature():
     assert params[1] in ['game', 'controller'], \
         f"Second parameter should be 'game' or 'controller', not '{params[1]}'"
 
-def test_witch_partial_curse_distribution():
+def test_witch_partial_curse_distribution(make_game, mock_controller_class):
     """Test Witch with only 1 Curse left in supply for 3 players"""
-    from dominion.game import DominionGame
     from dominion.card import Card, CurseCard
-    from dominion.controller import Controller
     
-    game = DominionGame.create(
+    game = make_game(
         player_names=["Alice", "Bob", "Charlie"],
         kingdom_card_names=["Witch", "Market", "Smithy", "Village", "Cellar", 
                            "Workshop", "Militia", "Remodel", "Mine", "Moat"]
     )
     
-    class MockController(Controller):
-        def __init__(self, game):
-            self.game = game
-            
-        @property
-        def current_player(self):
-            return self.game.current_player
-            
-        def trash(self, card):
-            self.game.trash.append(card)
-            
-        def ask_yes_no(self, prompt):
-            return False
-            
-        def pick_card_from_supply(self, maximum_cost=None):
-            return None
-            
-        def pick_action(self, cards):
-            return None
-            
-        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
-            return []
-            
-        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
-            return []
-    
-    controller = MockController(game)
+    controller = mock_controller_class(game)
     game.controller = controller
     
     alice = game.current_player
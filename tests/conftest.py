@@ -0,0 +1,119 @@
+"""
+Shared fixtures for the hidden test suites.
+
+Most hidden tests start from a freshly created game and a controller
+that answers every prompt with "no". Creating a game shuffles decks and
+fills the supply, so `make_game` builds each distinct (players, kingdom)
+game once per session and gives every test its own restored copy of
+that snapshot. `mock_controller_class` is the shared controller; tests
+that need different answers subclass it.
+
+The student's package is imported inside the fixtures, never at module
+level, so a broken package still fails test by test.
+"""
+import copy
+import os
+import pickle
+import sys
+
+import pytest
+
+sys.path.insert(0, os.environ.get('PYTHONPATH', '.'))
+
+
+class GameSnapshot:
+    """A pristine game that can be restored any number of times"""
+
+    def __init__(self, game, create):
+        self.create = create
+        try:
+            self.data = pickle.dumps(game, pickle.HIGHEST_PROTOCOL)
+            self.game = None
+        except Exception:
+            # Not picklable (e.g. a lambda on the game); fall back to deepcopy
+            self.data = None
+            self.game = game
+
+    def restore(self):
+        if self.data is not None:
+            return pickle.loads(self.data)
+        if self.game is not None:
+            try:
+                return copy.deepcopy(self.game)
+            except Exception:
+                self.game = None
+        # Can't be copied at all: build a new game every time
+        return self.create()
+
+
+@pytest.fixture(scope="session")
+def game_snapshots():
+    """Snapshots by (player names, kingdom card names), shared by the whole session"""
+    return {}
+
+
+@pytest.fixture
+def make_game(game_snapshots):
+    """Factory for an isolated copy of DominionGame.create(player_names, kingdom_card_names)"""
+    from dominion.game import DominionGame
+
+    def make(player_names, kingdom_card_names):
+        key = (tuple(player_names), tuple(kingdom_card_names))
+        snapshot = game_snapshots.get(key)
+        if snapshot is None:
+            def create():
+                return DominionGame.create(player_names=list(player_names),
+                                           kingdom_card_names=list(kingdom_card_names))
+            snapshot = game_snapshots[key] = GameSnapshot(create(), create)
+        return snapshot.restore()
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def mock_controller_class():
+    """Controller implementing every abstract method without asking anyone"""
+    from dominion.controller import Controller
+
+    class MockController(Controller):
+        def __init__(self, game):
+            self.game = game
+            self.card_picked = None
+
+        @property
+        def current_player(self):
+            """Some cards might access controller.current_player directly"""
+            return self.game.current_player
+
+        def trash(self, card):
+            self.game.trash.append(card)
+
+        def ask_yes_no(self, prompt):
+            return False
+
+        def pick_card_from_supply(self, maximum_cost=None, player=None):
+            return None
+
+        def pick_action(self, cards):
+            return None
+
+        def pick_cards_from_list(self, cards, minimum=0, maximum=None):
+            return []
+
+        def pick_cards_from_hand(self, player, minimum=0, maximum=None):
+            return []
+
+        def pick_card_from_hand(self, player):
+            return None
+
+        def pick_card_from_list(self, cards):
+            self.card_picked = cards[0] if cards else None
+            return self.card_picked
+
+        def pick_cards_from_discard_pile(self, player, maximum=1):
+            return []
+
+        def pick_cards(self, cards, minimum=0, maximum=None):
+            return ([], cards)  # (selected, remaining)
+
+    return MockController
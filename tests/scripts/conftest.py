@@ -0,0 +1,10 @@
+"""
+Tests for the grading scripts themselves (not hidden tests for students).
+
+The scripts import each other as top-level modules, as they do when run
+from scripts/, so that directory goes on the path.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "scripts"))
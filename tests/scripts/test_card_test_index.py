@@ -0,0 +1,83 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from card_test_index import CardTestIndex, index_source, referenced_cards
+from validate_submission import KNOWN_ACTION_CARDS
+
+REPO_ROOT = Path(__file__).parents[2]
+
+CARDS = KNOWN_ACTION_CARDS + ["Laboratory", "Witch", "Gardens"]
+
+TEST_FILES = sorted(
+    list((REPO_ROOT / "benchmarks" / "reference" / "tests").glob("test_*.py"))
+    + list((REPO_ROOT / "tests" / "cards").glob("test_*.py"))
+    + list((REPO_ROOT / "tests" / "bugs").glob("test_*.py")),
+    key=lambda path: path.name
+)
+
+
+def regex_detector(content, card_names):
+    """The detector the index replaced, kept as the reference"""
+    tested = set()
+    for test_func in re.findall(r'def\s+(test_\w+)', content):
+        for card_name in card_names:
+            if card_name.lower() in test_func.lower():
+                tested.add(card_name)
+            elif card_name in content:
+                patterns = [f'{card_name}Card', f'Card.create("{card_name}")',
+                            f'Card.get_type_with_name("{card_name}")', f'"{card_name}"', f"'{card_name}'"]
+                if any(pattern in content for pattern in patterns):
+                    if test_func in content.split(card_name)[0].split('def ')[-1]:
+                        tested.add(card_name)
+    return tested
+
+
+@pytest.mark.parametrize("test_file", TEST_FILES, ids=lambda path: path.name)
+def test_index_finds_every_card_the_regex_detector_did(test_file):
+    content = test_file.read_text()
+    found = referenced_cards([index_source(content)], CARDS)
+    assert regex_detector(content, CARDS) <= found
+
+
+def test_existing_tests_are_credited_with_their_cards():
+    indexes = [index_source(path.read_text()) for path in TEST_FILES]
+    assert {"Laboratory", "Witch", "Gardens", "Market", "Bureaucrat"} <= referenced_cards(indexes, CARDS)
+
+
+def test_parametrized_and_shared_card_names_count():
+    source = '''
+import pytest
+
+SILVER_CARDS = ["Smithy", "Village"]
+
+@pytest.mark.parametrize("name", ["Militia", "Moat"])
+def test_attack(name):
+    assert name
+
+def test_each_card():
+    for name in SILVER_CARDS:
+        assert name
+
+class TestCards:
+    def test_chapel(self):
+        pass
+
+def helper():
+    return "Library"
+'''
+    assert referenced_cards([index_source(source)], CARDS) == {"Smithy", "Village", "Militia", "Moat", "Chapel"}
+
+
+def test_unparseable_file_refers_to_nothing():
+    assert referenced_cards([index_source("def test_market(:\n")], CARDS) == set()
+
+
+def test_index_is_cached_by_content(tmp_path):
+    test_file = tmp_path / "test_market.py"
+    test_file.write_text('def test_play():\n    assert "Market"\n')
+    index = CardTestIndex(root=tmp_path / "cache")
+    assert index.index_directory(tmp_path) == {"test_market.py": {"test_play": {
+        "strings": ["Market"], "names": []}}}
+    assert len(list((tmp_path / "cache" / "test-index").glob("*/*.json"))) == 1
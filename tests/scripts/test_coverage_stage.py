@@ -0,0 +1,33 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from benchmark import generate_checkout
+from coverage_stage import CoverageStage
+from validate_submission import load_milestones
+
+
+def coverage_stage(tmp_path, variant):
+    checkout = generate_checkout(tmp_path / variant, variant, load_milestones())
+    overlay = tmp_path / "overlay"
+    overlay.mkdir()
+    view = SimpleNamespace(root=checkout, overlay=overlay)
+    return CoverageStage(view, sys.executable, dict(os.environ))
+
+
+@pytest.mark.parametrize("module", ["player", "supply"])
+def test_module_coverage_fails_when_package_does_not_import(tmp_path, module):
+    # dominion/__init__.py imports a missing module; the earlier test files fail
+    # to collect, but the package's submodules stay importable for later ones
+    stage = coverage_stage(tmp_path, "broken_import")
+    assert "dominion" in stage.collection_errors().values()
+    assert stage.module_percent(module) is None
+
+
+@pytest.mark.parametrize("module", ["player", "supply"])
+def test_module_coverage_of_healthy_checkout(tmp_path, module):
+    stage = coverage_stage(tmp_path, "fixed")
+    assert stage.collection_errors() == {}
+    assert stage.module_percent(module) >= 80
@@ -0,0 +1,39 @@
+import json
+from unittest import mock
+
+import pytest
+
+import dashboard_publisher
+from dashboard_publisher import JOURNAL_FILE, DashboardPublisher
+
+
+def result(team):
+    return {"team": team, "timestamp": "2026-10-16T10:00:00Z", "totalPoints": 5,
+            "passed": [], "failed": [], "customMilestones": []}
+
+
+def test_flush_interrupted_after_append_does_not_count_twice(tmp_path):
+    output_dir = tmp_path / "docs"
+    publisher = DashboardPublisher(output_dir, spool=tmp_path / "spool")
+    publisher.submit(result("alpha"))
+    publisher.submit(result("beta"))
+
+    # Stop right after the first line is logged, before its spool file is removed
+    append_record = dashboard_publisher.append_record
+
+    def append_then_crash(log_path, record):
+        append_record(log_path, record)
+        raise KeyboardInterrupt
+
+    with mock.patch.object(dashboard_publisher, "append_record", append_then_crash):
+        with pytest.raises(KeyboardInterrupt):
+            publisher.flush()
+    assert len(publisher.pending()) == 2
+    assert (tmp_path / "spool" / JOURNAL_FILE).exists()
+
+    assert publisher.flush() == 1
+    lines = (output_dir / "data.log.jsonl").read_text().splitlines()
+    assert sorted(json.loads(line)["team"] for line in lines) == ["alpha", "beta"]
+    with open(output_dir / "summary.json") as f:
+        assert json.load(f)["totals"]["submissions"] == 2
+    assert list((tmp_path / "spool").iterdir()) == []
@@ -0,0 +1,53 @@
+import json
+import threading
+
+from dashboard_server import MAX_PENDING_EVENTS, DashboardFeed
+from update_dashboard import update_dashboard
+
+
+def publish_result(tmp_path, output_dir, team, points, timestamp):
+    results_file = tmp_path / f"{team}-{points}.json"
+    results_file.write_text(json.dumps({
+        "team": team,
+        "repository": f"workshop/{team}",
+        "sha": "0" * 40,
+        "timestamp": timestamp,
+        "totalPoints": points,
+        "passed": [{"id": "bug_estate_supply", "name": "Estate supply", "points": points}],
+        "failed": [],
+        "customMilestones": [],
+    }))
+    update_dashboard(str(results_file), output_dir)
+
+
+def test_full_client_is_dropped_without_blocking_the_feed(tmp_path):
+    output_dir = tmp_path / "docs"
+    output_dir.mkdir()
+    publish_result(tmp_path, output_dir, "alpha", 10, "2026-10-16T10:00:00Z")
+    feed = DashboardFeed(output_dir)
+    feed.poll()
+
+    stalled = feed.subscribe()
+    for _ in range(MAX_PENDING_EVENTS):
+        stalled.put_nowait(("keepalive", {}))
+    healthy = feed.subscribe()
+
+    publish_result(tmp_path, output_dir, "beta", 20, "2026-10-16T10:05:00Z")
+    poll = threading.Thread(target=feed.poll, daemon=True)
+    poll.start()
+    poll.join(timeout=5)
+    assert not poll.is_alive(), "poll() blocked on a client whose queue was full"
+
+    # The stalled client is told to reconnect and no longer receives events
+    assert stalled.get_nowait() is None
+    assert stalled.empty()
+    assert feed.revision == 2
+    assert healthy.get_nowait()[0] == "submission"
+
+    # The feed still serves new subscribers
+    other = feed.subscribe()
+    publish_result(tmp_path, output_dir, "alpha", 30, "2026-10-16T10:06:00Z")
+    feed.poll()
+    assert other.get_nowait()[0] == "submission"
+    assert stalled.empty()
+    assert not healthy.empty()
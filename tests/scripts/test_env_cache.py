@@ -0,0 +1,65 @@
+import fcntl
+import threading
+import time
+
+from env_cache import READY_MARKER, SIZE_MARKER, EnvironmentCache
+
+
+def test_first_submissions_share_one_build_without_waiting_for_each_other(tmp_path, monkeypatch):
+    cache = EnvironmentCache(tmp_path / "cache")
+    builds = []
+
+    def fill(venv, project_dir):
+        builds.append(venv)
+        time.sleep(0.5)
+        venv.mkdir()
+        (venv / SIZE_MARKER).write_text("1")
+        (venv / READY_MARKER).touch()
+
+    monkeypatch.setattr(cache, "_fill", fill)
+    start = time.monotonic()
+    ready_after = []
+
+    def grade():
+        with cache.environment(tmp_path):
+            ready_after.append(time.monotonic() - start)
+            # A long grading run must not hold up anyone else on the same key
+            time.sleep(2)
+
+    threads = [threading.Thread(target=grade) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len(ready_after) == 3
+    assert max(ready_after) < 1.5
+
+
+def test_build_does_not_wait_for_other_users_of_the_key(tmp_path, monkeypatch):
+    cache = EnvironmentCache(tmp_path / "cache")
+
+    def fill(venv, project_dir):
+        venv.mkdir()
+        (venv / SIZE_MARKER).write_text("1")
+        (venv / READY_MARKER).touch()
+
+    monkeypatch.setattr(cache, "_fill", fill)
+    cache.root.mkdir(parents=True)
+    key = cache.key(tmp_path)
+
+    # Another submission holds the key in use, e.g. it is just checking for the environment
+    with open(cache.root / f"{key}.lock", 'a+') as other:
+        fcntl.flock(other, fcntl.LOCK_SH)
+        ready = []
+
+        def grade():
+            with cache.environment(tmp_path) as venv:
+                ready.append((venv / READY_MARKER).exists())
+
+        thread = threading.Thread(target=grade)
+        thread.start()
+        thread.join(timeout=2)
+        assert not thread.is_alive(), "building waited for another user of the environment"
+    assert ready == [True]
@@ -0,0 +1,27 @@
+from grading_daemon import GradingDaemon
+from job_queue import JobQueue
+
+
+def test_job_that_cannot_be_graded_is_marked_failed(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite")
+    daemon = GradingDaemon(queue, tmp_path / "work", concurrency=1, max_active=1,
+                           cache_dir=tmp_path / "cache", result_cache=False, impact=False,
+                           clone_url=str(tmp_path / "missing" / "{repository}"),
+                           dashboard=tmp_path / "docs")
+    try:
+        queue.enqueue({"repository": "workshop/alpha", "team": "alpha", "sha": "0" * 40})
+        job = queue.claim(timeout=0)
+        daemon.process(job)
+
+        graded = queue.get(job["id"])
+        assert graded["status"] == "failed"
+        assert "git fetch failed" in graded["error"]
+        # The error results are still recorded and handed to the dashboard
+        assert graded["results"]["error"] == graded["error"]
+        assert graded["results"]["totalPoints"] == 0
+        assert set(graded["phases"]) == {"validation", "dashboard"}
+        assert len(daemon.publisher.pending()) == 1
+        assert queue.counts() == {"failed": 1}
+    finally:
+        daemon.stop()
+        queue.close()
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from benchmark import generate_checkout
+from impact import MODULE_SYMBOL, ImpactStore, executed_symbols, fingerprint_source
+from result_cache import ResultCache
+from validate_submission import MilestoneValidator, load_milestones
+
+# bug_prompt_formatting runs the controller's prompts; fixme_discard_validation never does
+CLAIMED = ["bug_prompt_formatting", "fixme_discard_validation"]
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    checkout = generate_checkout(tmp_path / "alpha", "fixed", load_milestones())
+    (checkout / "submissions" / "claim.json").write_text(json.dumps({"milestones": CLAIMED}))
+    return checkout
+
+
+def grade(checkout, cache_dir, sha):
+    return MilestoneValidator(checkout, "alpha", "workshop/alpha", sha,
+                              result_cache=ResultCache(cache_dir),
+                              impact_store=ImpactStore("workshop/alpha", root=cache_dir)).grade()
+
+
+def edit_prompt_function(checkout):
+    """A change to the body of the function that formats "Pick exactly" prompts"""
+    controller = checkout / "dominion" / "controller.py"
+    source = controller.read_text()
+    at = source.index('prompt = f"Pick exactly')
+    line_start = source.rindex("\n", 0, at) + 1
+    indent = source[line_start:at]
+    controller.write_text(source[:line_start] + indent + "minimum = int(minimum)\n" + source[line_start:])
+
+
+def test_cache_hits_keep_dependency_maps_for_the_next_submission(checkout, tmp_path):
+    cache_dir = tmp_path / "cache"
+    first = grade(checkout, cache_dir, "a" * 40)
+    assert sorted(m["id"] for m in first["passed"]) == CLAIMED
+
+    # The same SHA again comes entirely from the result cache
+    again = grade(checkout, cache_dir, "a" * 40)
+    assert again["cacheHits"] == 2
+    assert again["carriedForward"] == 0
+
+    # One function changes: the milestone that never ran it is carried forward
+    edit_prompt_function(checkout)
+    edited = grade(checkout, cache_dir, "b" * 40)
+    assert edited["cacheHits"] == 0
+    assert edited["carriedForward"] == 1
+    assert sorted(m["id"] for m in edited["passed"]) == CLAIMED
+
+
+SOURCE = '''
+class Player:
+    def draw(self, n):
+        return n
+
+    def discard(self, card):
+        return card
+
+
+def helper():
+    return 1
+'''
+
+
+def test_fingerprints_ignore_formatting_but_not_code():
+    before = fingerprint_source(SOURCE)
+    reformatted = SOURCE.replace("return n", "return n  # drawn cards").replace("\n\n\n", "\n\n")
+    assert fingerprint_source(reformatted) == before
+
+    edited = fingerprint_source(SOURCE.replace("return card", "return [card]"))
+    changed = {symbol for symbol in before if before[symbol] != edited[symbol]}
+    assert changed == {"Player.discard"}
+
+
+def test_executed_lines_map_to_their_functions():
+    lines = SOURCE.splitlines()
+    draw_body = lines.index("        return n") + 1
+    assert executed_symbols(SOURCE, [draw_body]) == {MODULE_SYMBOL, "Player.draw"}
+
+
+def store_with_record(tmp_path, success=True):
+    store = ImpactStore("workshop/alpha", root=tmp_path)
+    store.record("fixme_draw_limit", "key", success, {"dominion/player.py": {MODULE_SYMBOL, "Player.draw"}})
+    store.save("a" * 40, {"dominion/player.py": fingerprint_source(SOURCE)})
+    return ImpactStore("workshop/alpha", root=tmp_path)
+
+
+def test_carry_forward_while_dependencies_are_unchanged(tmp_path):
+    store = store_with_record(tmp_path)
+    # Only a function the milestone never ran changed
+    edited = fingerprint_source(SOURCE.replace("return card", "return [card]"))
+    assert store.carry_forward("fixme_draw_limit", "key", {"dominion/player.py": edited})
+    assert "fixme_draw_limit" in store.milestones
+
+
+def test_changed_symbol_invalidates_carry_forward(tmp_path):
+    store = store_with_record(tmp_path)
+    edited = fingerprint_source(SOURCE.replace("return n", "return n + 1"))
+    assert not store.carry_forward("fixme_draw_limit", "key", {"dominion/player.py": edited})
+    # A deleted file or a different milestone key (e.g. edited hidden tests) also rerun
+    assert not store.carry_forward("fixme_draw_limit", "key", {})
+    assert not store.carry_forward("fixme_draw_limit", "other key",
+                                   {"dominion/player.py": fingerprint_source(SOURCE)})
+    assert store.milestones == {}
+
+
+def test_failures_are_never_carried_forward(tmp_path):
+    store = store_with_record(tmp_path, success=False)
+    assert not store.carry_forward("fixme_draw_limit", "key", {"dominion/player.py": fingerprint_source(SOURCE)})
@@ -0,0 +1,51 @@
+import signal
+import sys
+
+import pytest
+
+from limits import LimitExceeded, ResourceLimits, exceeded_reason, run_limited
+
+
+@pytest.mark.parametrize("output", [
+    "Traceback (most recent call last):\n  File \"x.py\", line 1, in <module>\nMemoryError\n",
+    "E       MemoryError\n\ntest_alloc.py:2: MemoryError\n",
+    "FAILED tests/test_alloc.py::test_alloc - MemoryError\n",
+])
+def test_allocation_failures_are_oom(output):
+    assert exceeded_reason(1, output) == "oom"
+
+
+@pytest.mark.parametrize("output", [
+    "E       Failed: DID NOT RAISE <class 'MemoryError'>\n\ntest_a.py:3: Failed\n"
+    "FAILED test_a.py::test_raises - Failed: DID NOT RAISE <class 'MemoryError'>\n",
+    "E       AssertionError: assert 'MemoryError' == 'x'\n"
+    "FAILED test_a.py::test_assert - AssertionError: assert 'MemoryError' == 'x'\n",
+    "handled a MemoryError while shuffling\n",
+])
+def test_tests_that_mention_memory_error_are_ordinary_failures(output):
+    assert exceeded_reason(1, output) is None
+
+
+def test_signals():
+    assert exceeded_reason(-signal.SIGXCPU, "") == "timeout"
+    assert exceeded_reason(-signal.SIGKILL, "") == "oom"
+    assert exceeded_reason(0, "MemoryError\n") is None
+
+
+def write_tests(tmp_path, body):
+    (tmp_path / "test_memory.py").write_text(body)
+    return [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "test_memory.py"]
+
+
+def test_failed_raises_memory_error_is_a_test_failure(tmp_path):
+    cmd = write_tests(tmp_path, "import pytest\n\ndef test_raises():\n"
+                                "    with pytest.raises(MemoryError):\n        pass\n")
+    result = run_limited(cmd, ResourceLimits(60, 60, 1024), cwd=tmp_path)
+    assert result.returncode == 1
+
+
+def test_allocation_over_the_memory_limit_is_oom(tmp_path):
+    cmd = write_tests(tmp_path, "def test_alloc():\n    bytearray(8 * 1024 ** 3)\n")
+    with pytest.raises(LimitExceeded) as exceeded:
+        run_limited(cmd, ResourceLimits(60, 60, 1024), cwd=tmp_path)
+    assert exceeded.value.reason == "oom"
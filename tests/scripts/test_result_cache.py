@@ -0,0 +1,60 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmark import generate_checkout
+from result_cache import ResultCache
+from validate_submission import MilestoneValidator, load_milestones
+
+REPO_ROOT = Path(__file__).parents[2]
+
+MILESTONE = "fixme_discard_validation"
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    checkout = generate_checkout(tmp_path / "alpha", "fixed", load_milestones())
+    (checkout / "submissions" / "claim.json").write_text(json.dumps({"milestones": [MILESTONE]}))
+    return checkout
+
+
+def grade(checkout, cache, repo_root=None):
+    validator = MilestoneValidator(checkout, "alpha", "workshop/alpha", "a" * 40, result_cache=cache)
+    if repo_root is not None:
+        validator.repo_root = repo_root
+    return validator.grade()
+
+
+def test_key_covers_everything_that_decides_the_outcome():
+    milestones = load_milestones()
+    milestone = milestones[MILESTONE]
+    hidden = {"tests/bugs/test_fixme_discard_validation.py": "1" * 64}
+    key = ResultCache.key(MILESTONE, milestone, hidden, "2" * 64)
+
+    assert key == ResultCache.key(MILESTONE, dict(milestone), dict(hidden), "2" * 64)
+    assert key != ResultCache.key(MILESTONE, milestone, hidden, "3" * 64)
+    assert key != ResultCache.key(MILESTONE, dict(milestone, points=milestone["points"] + 1), hidden, "2" * 64)
+    assert key != ResultCache.key(MILESTONE, milestone, {**hidden, "tests/conftest.py": "4" * 64}, "2" * 64)
+    assert key != ResultCache.key("fixme_draw_limit", milestones["fixme_draw_limit"], hidden, "2" * 64)
+
+
+def test_changed_hidden_test_misses_the_cache(checkout, tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    assert grade(checkout, cache)["cacheHits"] == 0
+    assert grade(checkout, cache)["cacheHits"] == 1
+
+    # The same student code against an edited copy of the hidden tests
+    hidden_root = tmp_path / "grading"
+    shutil.copytree(REPO_ROOT / "tests", hidden_root / "tests",
+                    ignore=shutil.ignore_patterns("__pycache__", "scripts"))
+    test_file = hidden_root / "tests" / "bugs" / f"test_{MILESTONE}.py"
+    test_file.write_text(test_file.read_text() + "\n# Tightened after the workshop started\n")
+    edited = grade(checkout, cache, repo_root=hidden_root)
+    assert edited["cacheHits"] == 0
+    assert [m["id"] for m in edited["passed"]] == [MILESTONE]
+
+    # Neither entry replaced the other
+    assert grade(checkout, cache)["cacheHits"] == 1
+    assert grade(checkout, cache, repo_root=hidden_root)["cacheHits"] == 1
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import random
+
+from update_dashboard import (SUMMARY_FILE, TEAMS_DIR, VERSION_FILE, append_record, apply_record, empty_state,
+                              load_state, log_paths, publish, rebuild_aggregates,
+                              results_record, shard_name)
+
+
+def result(team, points, minute, passed=("bug_estate_supply",), custom=()):
+    return {
+        "team": team,
+        "timestamp": f"2026-10-16T10:{minute:02d}:00Z",
+        "totalPoints": points,
+        "passed": [{"id": mid, "name": mid.replace("_", " ").title(), "points": 5} for mid in passed],
+        "failed": [],
+        "customMilestones": [{"id": cid, "name": cid, "description": f"{cid} works"} for cid in custom],
+    }
+
+
+def submit(output_dir, results):
+    log_path, _ = log_paths(output_dir)
+    append_record(log_path, results_record(results))
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_publish_writes_summary_shards_and_version(tmp_path):
+    submit(tmp_path, result("alpha", 5, 0))
+    submit(tmp_path, result("team/beta", 15, 1, passed=("bug_estate_supply", "fixme_draw_limit"),
+                            custom=("fast_shuffle",)))
+    submit(tmp_path, result("alpha", 20, 2, passed=("bug_estate_supply", "fixme_draw_limit")))
+    publish(tmp_path)
+
+    summary = read_json(tmp_path / SUMMARY_FILE)
+    log_path, _ = log_paths(tmp_path)
+    assert summary["logOffset"] == log_path.stat().st_size
+    assert [(row["rank"], row["team"], row["totalPoints"]) for row in summary["leaderboard"]] == \
+        [(1, "alpha", 20), (2, "team/beta", 15)]
+    alpha = summary["leaderboard"][0]
+    assert alpha["submissionCount"] == 2
+    assert alpha["pointsDelta"] == 15
+    assert alpha["history"] == f"{TEAMS_DIR}/alpha.json"
+    assert summary["totals"] == {"points": 35, "submissions": 3, "milestonesCompleted": 2, "teams": 2,
+                                 "popularMilestone": {"id": "bug_estate_supply",
+                                                      "name": "Bug Estate Supply", "teams": 2}}
+    assert summary["milestoneStats"]["fixme_draw_limit"]["completedBy"] == ["team/beta", "alpha"]
+    assert [c["id"] for c in summary["customMilestones"]] == ["fast_shuffle"]
+    # Newest first
+    assert summary["timeline"][0]["team"] == "alpha"
+
+    # One shard per team, with a file name safe for any team name
+    shards = sorted(path.name for path in (tmp_path / TEAMS_DIR).iterdir())
+    assert shards == sorted(["alpha.json", shard_name("team/beta")])
+    assert "/" not in shard_name("team/beta")
+    history = read_json(tmp_path / TEAMS_DIR / "alpha.json")
+    assert history["team"] == "alpha"
+    assert [s["points"] for s in history["submissions"]] == [5, 20]
+
+    version = read_json(tmp_path / VERSION_FILE)
+    assert version["revision"] == 3
+    summary_text = (tmp_path / SUMMARY_FILE).read_text()
+    assert version["hash"] == hashlib.sha256(summary_text.encode()).hexdigest()[:16]
+
+
+def test_publish_rewrites_only_changed_shards(tmp_path):
+    submit(tmp_path, result("alpha", 5, 0))
+    submit(tmp_path, result("beta", 10, 1))
+    publish(tmp_path)
+    beta_shard = tmp_path / TEAMS_DIR / "beta.json"
+    beta_written = (beta_shard.stat().st_ino, beta_shard.stat().st_mtime_ns)
+    version = read_json(tmp_path / VERSION_FILE)
+
+    submit(tmp_path, result("alpha", 15, 2))
+    publish(tmp_path)
+    assert (beta_shard.stat().st_ino, beta_shard.stat().st_mtime_ns) == beta_written
+    assert len(read_json(tmp_path / TEAMS_DIR / "alpha.json")["submissions"]) == 2
+    new_version = read_json(tmp_path / VERSION_FILE)
+    assert new_version["revision"] == version["revision"] + 1
+    assert new_version["hash"] != version["hash"]
+
+
+def test_publish_with_nothing_new_leaves_the_summary_alone(tmp_path):
+    submit(tmp_path, result("alpha", 5, 0))
+    publish(tmp_path)
+    summary = (tmp_path / SUMMARY_FILE).read_text()
+    version = read_json(tmp_path / VERSION_FILE)
+    publish(tmp_path)
+    assert (tmp_path / SUMMARY_FILE).read_text() == summary
+    assert read_json(tmp_path / VERSION_FILE) == version
+
+
+def rebuilt_from_log(log_path):
+    """The state recomputed from data.log.jsonl alone, aggregates derived from scratch"""
+    state = empty_state()
+    with open(log_path, 'rb') as f:
+        for line in f:
+            apply_record(state, json.loads(line))
+    return rebuild_aggregates(state)
+
+
+def aggregates(state):
+    return {
+        "leaderboard": state["leaderboard"],
+        "totals": state["totals"],
+        "holders": {mid: stats["holders"] for mid, stats in state["milestoneStats"].items()},
+        "teams": {team: (data["totalPoints"], data["reachedAt"], data["pointsDelta"])
+                  for team, data in state["teams"].items()},
+    }
+
+
+def test_incremental_leaderboard_matches_a_full_rebuild(tmp_path):
+    rng = random.Random(22)
+    milestones = ["bug_estate_supply", "fixme_draw_limit", "card_witch", "test_coverage_player"]
+    teams = [f"team{i}" for i in range(8)]
+    for minute in range(60):
+        passed = rng.sample(milestones, rng.randint(0, len(milestones)))
+        # Few distinct scores, so ties (broken by who got there first) are common
+        submit(tmp_path, result(rng.choice(teams), 5 * len(passed), minute, passed=passed))
+        if minute % 7 == 0:
+            # Publishing compacts into the snapshot every few results
+            publish(tmp_path, compact_every=3)
+    publish(tmp_path, compact_every=3)
+
+    log_path, snapshot_path = log_paths(tmp_path)
+    state, _, _ = load_state(log_path, snapshot_path, tmp_path)
+    rebuilt = rebuilt_from_log(log_path)
+    assert aggregates(state) == aggregates(rebuilt)
+    assert len({rebuilt["teams"][team]["totalPoints"] for team in rebuilt["teams"]}) < len(rebuilt["teams"])
+
+    summary = read_json(tmp_path / SUMMARY_FILE)
+    assert [row["team"] for row in summary["leaderboard"]] == rebuilt["leaderboard"]
+    assert summary["totals"]["points"] == sum(data["totalPoints"] for data in rebuilt["teams"].values())